@@ -0,0 +1,46 @@
+"""
+Benchmark of mass bots instantiation and teardown, measures `ConstraintsMixin` overhead.
+Run from repository root: `PYTHONPATH=. python benchmarks/constraints.py [amount]`
+"""
+
+import asyncio
+import gc
+import sys
+from time import perf_counter
+
+from steam_tradeoffer_manager import ManagerBot
+from steam_tradeoffer_manager.base import ConstraintsMixin
+
+
+class Model(ConstraintsMixin):
+    constraints = ("username", ("id", "domain"))
+    dimension = "benchmark"
+
+    def __init__(self, username: str, password: str, *, id: int, domain: str = "steam.py"): ...
+
+
+def bench(name: str, amount: int, factory) -> None:
+    started = perf_counter()
+    objects = [factory(i) for i in range(amount)]
+    created = perf_counter() - started
+
+    started = perf_counter()
+    del objects
+    gc.collect()
+    released = perf_counter() - started
+
+    print(
+        f"{name:<10} {amount} instances: create {created:.3f}s ({created / amount * 1e6:.1f}us each), teardown {released:.3f}s"
+    )
+
+
+def main(amount: int = 5000) -> None:
+    asyncio.set_event_loop(asyncio.new_event_loop())  # steam.Client needs loop
+
+    bench("model", amount, lambda i: Model(f"user{i}", "password", id=i, domain="steam.py"))
+    bench("model", amount, lambda i: Model(f"user{i}", "password", id=i, domain="steam.py"))  # hashes must be released
+    bench("ManagerBot", amount, lambda i: ManagerBot(f"user{i}", "password", "shared", "identity", id=i))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -3,6 +3,15 @@ from . import _monkey_patch as _
 from .bot import *
 from .manager import *
 from .offer import *
+from .sending import *
+from .outgoing import *
+from .selection import *
+from .partners import *
+from .loader import *
+from .sharding import *
+from .sync import *
+from .control import *
+from .metrics import *
 from .base import ONCE_EVERY, BotState as _BotState
 
 ManagerBotState = _BotState
@@ -1,6 +1,9 @@
 """
 Patch `steam.util.call_once` decorator func for handling many clients.
 Patch `steam.http.get_api_key` to pass custom domain.
+Patch `steam.TradeOffer.confirm` to confirm offers in batches.
+Patch `steam.http.HTTPClient.clear` to apply client options (trace configs, shared connector) to http session.
+Patch `steam.http.HTTPClient.close` to not log out of web session that is saved to resume it later.
 """
 
 import asyncio
@@ -8,11 +11,17 @@ import functools
 import logging
 import re
 
-from steam import state, http, models
+import aiohttp
+from steam import state, http, models, trade
 
 _log = logging.getLogger(__name__)
 
 
+def _count_poll(self: state.ConnectionState) -> None:
+    if (metrics := getattr(self.client, "metrics", None)) is not None:  # only pool bots have metrics
+        metrics.polls.inc(self.client.id)
+
+
 # Patched call_once for many clients
 def call_once_patched(func):
     called: set[int] = set()
@@ -36,10 +45,12 @@ def call_once_patched(func):
 
 @call_once_patched
 async def poll_trades_patched(self: state.ConnectionState) -> None:
+    _count_poll(self)
     await self.fill_trades()
 
     while self._trades_to_watch:
         await asyncio.sleep(5)
+        _count_poll(self)
         await self.fill_trades()
 
 
@@ -71,4 +82,44 @@ async def get_api_key_patched(self: http.HTTPClient) -> str | None:
 
 http.HTTPClient.get_api_key = get_api_key_patched
 
+
+def clear_patched(self: http.HTTPClient) -> None:
+    get_options = getattr(self._client, "http_session_options", None)  # only pool bots have session options
+    self._session = aiohttp.ClientSession(
+        cookies={"Steam_Language": "english"},  # make sure the language is set to english
+        **{"connector": self.connector, **(get_options() if get_options else {})},
+    )
+
+
+http.HTTPClient.clear = clear_patched
+
+
+async def close_patched(self: http.HTTPClient) -> None:
+    if getattr(self._client, "session_storage", None) is None:  # only pool bots can save sessions
+        await self.logout()
+    else:  # logout without invalidating session cookies
+        self.logged_in = False
+        self.user = None
+        self._client.dispatch("logout")
+    await self._session.close()
+
+
+http.HTTPClient.close = close_patched
+
+_confirm = trade.TradeOffer.confirm
+
+
+async def confirm_patched(self: trade.TradeOffer) -> None:
+    batcher = getattr(self._state.client, "confirmations", None)  # only manager bots have batcher
+    if batcher is None:
+        return await _confirm(self)
+
+    self._check_active()
+    if self.is_gift():
+        return  # no point trying to confirm it
+    await batcher.confirm(self)
+
+
+trade.TradeOffer.confirm = confirm_patched
+
 _log.debug("Monkey patch imported")
@@ -1,5 +1,14 @@
 from .enums import *
 from .exceptions import *
+from .errors import *
 from .bot import *
 from .pool import *
 from .mixins import *
+from .ratelimit import *
+from .connectors import *
+from .proxies import *
+from .sessions import *
+from .supervisor import *
+from .loops import *
+from .metrics import *
+from .tracing import *
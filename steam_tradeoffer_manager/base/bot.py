@@ -1,18 +1,28 @@
 import asyncio
 import logging
-from typing import Any, TypeVar, Callable, Coroutine
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Any, TypeVar, Callable, Coroutine, Awaitable
 
 import steam
-from aiohttp import BasicAuth, BaseConnector
+from aiohttp import BasicAuth, BaseConnector, TraceConfig
+from steam.models import URL
+from yarl import URL as _URL
 
 from .enums import BotState
 from .mixins import PoolBotMixin
+from .connectors import ConnectorPool
+from .sessions import SessionData, SessionStorage
+from .loops import LoopThread, run_in_loop
+from .metrics import PoolMetrics
+from .errors import ErrorLog
 
 __all__ = ("SteamBot",)
 
 _log = logging.getLogger(__name__)
 _P = TypeVar("_P", bound="pool.SteamBotPool")
 _I = TypeVar("_I", bound=int)
+_T = TypeVar("_T")
 
 
 class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
@@ -23,6 +33,7 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
 
     constraints = ("username",)
     dimension = "steam"
+    error_log_size: int = 100  # last errors kept by bot, all errors are counted
 
     def __init__(
         self,
@@ -42,6 +53,8 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
         **options: Any,
     ) -> None:
         self._id = id
+        self._own_proxy = proxy is not None
+        self._loop_thread: LoopThread | None = None  # loop group thread assigned by pool
 
         super().__init__(proxy=proxy, proxy_auth=proxy_auth, connector=connector, **options)
 
@@ -57,14 +70,20 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
         self._running_task: asyncio.Task | None = None
         self._refresh_task: asyncio.Task | None = None
 
-        self._errors: list[Exception] = []
+        self._errors = ErrorLog(self.error_log_size)
         self._state: BotState = BotState.Stopped
+        self._state_since = datetime.now(timezone.utc)
+        self._state_started = monotonic()
+        self._state_durations: dict[BotState, float] = {}  # seconds spent in previous states
         self._randomizer = randomizer
         self._whitelist = whitelist
         self._domain = domain
+        self._session_storage: SessionStorage | None = None
 
     @property
     def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop_thread is not None:
+            return self._loop_thread.loop
         return getattr(self.pool, "loop", self._loop)
 
     # setter for steam.Client.__init__
@@ -72,10 +91,70 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
     def loop(self, _):
         self._loop = asyncio.get_event_loop_policy().get_event_loop()
 
+    def _set_loop_thread(self, thread: LoopThread | None) -> None:
+        self._loop_thread = thread
+        self._connection.loop = self.loop  # steam client state binds loop on creation
+
+    def call_threadsafe(self, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+        """
+        Run coroutine on bot loop, result can be awaited from any loop.
+        Bots outside of loop groups share pool loop, so coroutine is returned as is.
+        """
+        if self._loop_thread is None:
+            return coro
+        return run_in_loop(self.loop, coro)
+
+    def _threadsafe(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run callback on bot loop, right away if it is called from bot loop or bot has no loop thread"""
+        if self._loop_thread is not None and not self._loop_thread.is_current():
+            self.loop.call_soon_threadsafe(callback, *args)
+        else:
+            callback(*args)
+
+    def _call_in_pool(self, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+        """Run coroutine on pool loop, for pool helpers that keep their futures and timers there"""
+        if self._loop_thread is None:
+            return coro
+        return run_in_loop(self.pool.loop, coro)
+
     @property
     def state(self) -> BotState:
         return self._state
 
+    @property
+    def state_since(self) -> datetime:
+        """UTC time of last state change"""
+        return self._state_since
+
+    @property
+    def uptime(self) -> float:
+        """Seconds since bot became active, `0` if bot is not active"""
+        return monotonic() - self._state_started if self._state is BotState.Active else 0.0
+
+    def state_time(self, state: BotState) -> float:
+        """Total seconds spent by bot in state"""
+        total = self._state_durations.get(state, 0.0)
+        return total + (monotonic() - self._state_started if self._state is state else 0.0)
+
+    def _set_state(self, state: BotState) -> None:
+        """Single point of state transitions. Updates pool state indexes and dispatch `bot_state_change` event"""
+        if self._loop_thread is not None and not self._loop_thread.is_current():
+            self.loop.call_soon_threadsafe(self._set_state, state)  # e.g. quarantined by pool supervisor
+            return
+
+        old, self._state = self._state, state
+        if old is state:
+            return
+
+        now = monotonic()
+        self._state_durations[old] = self._state_durations.get(old, 0.0) + now - self._state_started
+        self._state_started = now
+        self._state_since = datetime.now(timezone.utc)
+
+        if self.pool:
+            self.pool._threadsafe(self.pool._on_bot_state_change, self, old, state)
+        self.dispatch("bot_state_change", old, state)
+
     @property
     def domain(self) -> str:
         try:
@@ -98,29 +177,154 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
     def whitelist(self, value: set[int]):
         self._whitelist = value
 
+    @property
+    def session_storage(self) -> SessionStorage | None:
+        try:
+            return self._session_storage or self.pool.session_storage
+        except AttributeError:  # if bot don't bound to pool and self session storage is None
+            return None
+
+    @session_storage.setter
+    def session_storage(self, value: SessionStorage | None):
+        self._session_storage = value
+
     @property
     def api_key(self) -> str | None:
         return self.http.api_key
 
+    @property
+    def proxy_key(self) -> str:
+        """Egress identity of bot requests, used to share rate limits between bots"""
+        return self.http.proxy or "direct"
+
+    @property
+    def metrics(self) -> PoolMetrics | None:
+        """Metrics of pool, `None` if pool doesn't collect them"""
+        return getattr(self.pool, "metrics", None)
+
+    def _observe(self, histogram: str, started: float) -> None:
+        """Observe time passed since `started` in pool metrics histogram"""
+        if (metrics := self.metrics) is not None:
+            getattr(metrics, histogram).observe(monotonic() - started)
+
+    def _assign_proxy(self) -> None:
+        """Take proxy from pool proxies if bot don't have own one"""
+        if not self._own_proxy and (proxies := getattr(self.pool, "proxies", None)) is not None:
+            self.http.proxy = proxies.assign(self.id)
+
+    def _shared_connectors(self) -> ConnectorPool | None:
+        # bot with own connector don't use shared ones, shared connectors are bound to pool loop
+        if self.http.connector is None and self._loop_thread is None:
+            return getattr(self.pool, "connectors", None)
+
+    def http_trace_configs(self) -> list[TraceConfig]:
+        """Trace configs applied to http session created on login"""
+        configs = []
+        if (rate_limits := getattr(self.pool, "rate_limits", None)) is not None:
+            configs.append(rate_limits.trace_config(self.proxy_key))
+        if (connectors := self._shared_connectors()) is not None:
+            configs.append(connectors.trace_config(self.proxy_key))
+        if (proxies := getattr(self.pool, "proxies", None)) is not None and self.http.proxy in proxies:
+            configs.append(proxies.trace_config(self.http.proxy))  # after rate limits to not count waiting
+        if (tracer := getattr(self.pool, "tracer", None)) is not None:
+            configs.append(tracer.trace_config(self.id, self.proxy_key))
+        return configs
+
+    def http_session_options(self) -> dict[str, Any]:
+        """Options of `aiohttp.ClientSession` created on login"""
+        options: dict[str, Any] = {"trace_configs": self.http_trace_configs()}
+        if (connectors := self._shared_connectors()) is not None:
+            options |= {"connector": connectors.get(self.proxy_key), "connector_owner": False}
+        return options
+
+    def _session_data(self) -> SessionData:
+        cookies: dict[str, dict[str, str]] = {}
+        for morsel in self.http._session.cookie_jar:
+            cookies.setdefault(morsel["domain"], {})[morsel.key] = morsel.value
+        return SessionData(steam_id=self.http.user.id64, cookies=cookies, api_key=self.http.api_key)
+
+    def _restore_session(self, data: SessionData) -> None:
+        jar = self.http._session.cookie_jar
+        for domain, cookies in data.cookies.items():
+            jar.update_cookies(cookies, _URL(f"https://{domain}/"))
+        self.http.api_key = data.api_key
+
+    def _save_session(self) -> None:
+        if (storage := self.session_storage) is not None and self.http.logged_in:
+            storage.save(self.username, self._session_data())
+
+    async def _resume_session(self) -> bool:
+        """Restore saved web session and check that it is still valid"""
+        if (storage := self.session_storage) is None or (data := storage.load(self.username)) is None:
+            return False
+        if data.api_key is None:  # accounts without api key need patches made by full login
+            return False
+
+        http = self.http
+        http.username, http.password, http.shared_secret = self.username, self.password, self.shared_secret
+        http.clear()
+        try:
+            self._restore_session(data)
+            resp = await http.get(URL.COMMUNITY / "chat/clientjstoken")
+            if not isinstance(resp, dict) or not resp.get("logged_in"):
+                raise steam.LoginError("Session expired")
+
+            user_data = await http.get_user(data.steam_id)  # also checks api key
+        except Exception as e:
+            _log.info(f"Can't resume session of {self.username}: {e!r}")
+            # keep session on network errors and steam outages, it could be resumed later
+            if isinstance(e, steam.LoginError) or (isinstance(e, steam.HTTPException) and e.status in (401, 403)):
+                storage.remove(self.username)
+            await http._session.close()
+            return False
+
+        state = self._connection
+        http.user = steam.ClientUser(state=state, data=user_data)
+        state._users[http.user.id64] = http.user
+        http.logged_in = True
+        self.dispatch("login")
+
+        _log.debug(f"Session of {self.username} resumed")
+        return True
+
+    async def login(self, username: str, password: str, *, shared_secret: str | None = None) -> None:
+        """Resume saved session if there is valid one, perform full login otherwise"""
+        if await self._resume_session():
+            self._closed = False  # as in steam.Client.login
+            self.loop.create_task(self._connection.__ainit__())
+            return
+
+        try:
+            await super().login(username, password, shared_secret=shared_secret)
+        except steam.InvalidCredentials:
+            if (storage := self.session_storage) is not None:
+                storage.remove(username)
+            raise
+
+        self._save_session()
+
     async def _start(self) -> None:
         _log.debug(f"Attempting to start bot {self.id}")
         try:
-            self._state = BotState.Waiting
+            self._set_state(BotState.Waiting)
+            self._assign_proxy()
+            started = monotonic()
             await self.login(self.username, self.password, shared_secret=self.shared_secret)
+            self._observe("login_seconds", started)
             await self.connect()
 
         except steam.InvalidCredentials as e:
-            self._errors.append(e)
-            self._state = BotState.InvalidCredentials
+            self._errors.record(e, "start")
+            self._set_state(BotState.InvalidCredentials)
             _log.error(f"Invalid credentials for {self.id}")
 
         except (steam.NoCMsFound, steam.LoginError, Exception) as e:
-            self._errors.append(e)
-            self._state = BotState.UnknownError
             _log.exception(f"Error while starting bot {self.id}", stack_info=True, exc_info=e)
+            self._errors.record(e, "start")  # drops traceback
+            self._set_state(BotState.UnknownError)
 
         else:
-            self._state = BotState.Stopped
+            self._set_state(BotState.Stopped)
             _log.info(f"Bot {self} is stopped")
 
         # finally:  # ensure that bot has to be closed/stopped
@@ -166,26 +370,30 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
         self._randomizer = value
 
     async def on_ready(self) -> None:
-        self._state = BotState.Active
+        self._set_state(BotState.Active)
         if not self.id:
             setattr(self, "_id", self.user.id64)  # id will be automatically set when client is ready
 
         _log.info(f"Bot {self.user} is ready")
 
     async def on_error(self, event: str, error: Exception, *args, **kwargs):
-        self._errors.append(error)
         _log.error(f"Bot {self.user} ignore exception in {event}", exc_info=error)
+        self._errors.record(error, event)
 
     @property
-    def errors(self) -> list[Exception]:
-        # there may be logic in future
+    def errors(self) -> ErrorLog:
+        """Last errors of bot and counters of all its errors"""
         return self._errors
 
     def stop(self):
-        """Stop serving"""
+        """Stop serving. Web session is saved to session storage, if there is one, and stays valid"""
         # if not self.is_closed():  # fix for accounts that doesn't have api key
         #     self.user.flags = []
 
+        if self.pool and self.pool._supervisor is not None:
+            self.pool._threadsafe(self.pool._supervisor.cancel, self)  # stopped by user
+        if not self.is_closed():
+            self._save_session()  # cookies might be renewed since login
         return super().close()
 
     def close(self) -> Coroutine[Any, Any, None]:
@@ -205,7 +413,7 @@ class SteamBot(steam.Client, PoolBotMixin[_I, _P]):
             # maybe asyncio.call_exception_handler needed
         if self.pool:
             del self.pool[self.id]
-        super().__del__()
+        # constraints are released by finalizer
 
     def __str__(self) -> str:
         return self.user.name if self.user else (str(self.id) or self.username)
@@ -0,0 +1,79 @@
+import asyncio
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Hashable, Any
+
+from aiohttp import TCPConnector, TraceConfig, ClientSession
+
+__all__ = ("ConnectorPool", "ConnectorStats")
+
+
+@dataclass
+class ConnectorStats:
+    acquired: int = 0  # times connector was given to new http session, closed sessions are counted too
+    created: int = 0  # new connections (tcp + tls handshakes)
+    reused: int = 0  # requests served by keep-alive connections
+
+    @property
+    def reuse_rate(self) -> float:
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+
+
+class ConnectorPool:
+    """
+    Shared `aiohttp.TCPConnector`s grouped by proxy or other egress identity.
+    Sessions using shared connector must not own it, pool closes connectors itself.
+    :param limit: total connections limit of one connector
+    :param limit_per_host: connections limit to one host of one connector
+    :param connector_options: other `aiohttp.TCPConnector` options
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 0, **connector_options: Any):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.connector_options = connector_options
+        self.stats: dict[Hashable, ConnectorStats] = {}
+
+        self._connectors: dict[Hashable, TCPConnector] = {}
+
+    def get(self, key: Hashable) -> TCPConnector:
+        """Get or create connector for key"""
+        connector = self._connectors.get(key)
+        if connector is None or connector.closed:
+            connector = self._connectors[key] = TCPConnector(
+                limit=self.limit, limit_per_host=self.limit_per_host, **self.connector_options
+            )
+            self.stats.setdefault(key, ConnectorStats())
+        self.stats[key].acquired += 1
+        return connector
+
+    def trace_config(self, key: Hashable) -> TraceConfig:
+        """`aiohttp.TraceConfig` that counts created and reused connections"""
+        stats = self.stats.setdefault(key, ConnectorStats())
+
+        async def on_connection_create_end(_: ClientSession, __: SimpleNamespace, ___: Any):
+            stats.created += 1
+
+        async def on_connection_reuseconn(_: ClientSession, __: SimpleNamespace, ___: Any):
+            stats.reused += 1
+
+        config = TraceConfig()
+        config.on_connection_create_end.append(on_connection_create_end)
+        config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return config
+
+    async def close(self) -> None:
+        """Close all connectors"""
+        connectors, self._connectors = self._connectors, {}
+        if connectors:
+            await asyncio.gather(*(connector.close() for connector in connectors.values()))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._connectors
+
+    def __len__(self) -> int:
+        return len(self._connectors)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} limit={self.limit} len={len(self)}>"
@@ -11,6 +11,8 @@ class BotState(enum.Enum):
     InvalidCredentials = "invalid credentials"
     UnknownError = "unknown exception"  # stopped by error
     Stopped = "stopped"  # just stopped
+    Quarantined = "quarantined"  # failing too often, waits long time before restart
+    Hibernated = "hibernated"  # stopped while idle, will be started on demand
 
 
 class Timings:
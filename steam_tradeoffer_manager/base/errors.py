@@ -0,0 +1,100 @@
+import threading
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, NamedTuple
+
+__all__ = ("ErrorLog", "ErrorRecord", "ErrorStats")
+
+
+class ErrorRecord(NamedTuple):
+    error: Exception  # without traceback
+    event: str
+    at: datetime
+    traceback: str  # formatted traceback of error
+
+
+@dataclass
+class ErrorStats:
+    """Aggregated errors of one exception type raised in one event"""
+
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    last_message: str
+
+    def _merge(self, other: "ErrorStats") -> None:
+        self.count += other.count
+        self.first_seen = min(self.first_seen, other.first_seen)
+        if other.last_seen >= self.last_seen:
+            self.last_seen, self.last_message = other.last_seen, other.last_message
+
+
+class ErrorLog:
+    """
+    Last errors in ring buffer and counters of all errors by exception type and event.
+    Iteration, `in` and `len` work on buffered exceptions.
+    Traceback of recorded exception is formatted and dropped, so buffer doesn't keep frames and their locals alive.
+    Errors can be recorded from bot loop threads.
+    :param maxlen: max amount of buffered errors, older ones are dropped, but stay counted
+    """
+
+    __slots__ = ("records", "stats", "total", "_lock")
+
+    def __init__(self, maxlen: int = 100):
+        self.records: deque[ErrorRecord] = deque(maxlen=maxlen)
+        self.stats: dict[tuple[str, str], ErrorStats] = {}  # by (exception type name, event)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def record(self, error: Exception, event: str) -> None:
+        """Record error, its traceback is dropped, so log error before recording it"""
+        now = datetime.now(timezone.utc)
+        formatted = "".join(traceback.format_exception(error))
+        message = str(error)
+        error = error.with_traceback(None)
+
+        key = (type(error).__qualname__, event)
+        with self._lock:
+            self.records.append(ErrorRecord(error, event, now, formatted))
+            self.total += 1
+            if (stats := self.stats.get(key)) is None:
+                self.stats[key] = ErrorStats(1, now, now, message)
+            else:
+                stats.count += 1
+                stats.last_seen, stats.last_message = now, message
+
+    @property
+    def last(self) -> ErrorRecord | None:
+        return self.records[-1] if self.records else None
+
+    @staticmethod
+    def summary(logs: Iterable["ErrorLog"]) -> dict[tuple[str, str], ErrorStats]:
+        """Counters of many logs merged by exception type and event"""
+        merged: dict[tuple[str, str], ErrorStats] = {}
+        for log in logs:
+            with log._lock:
+                items = [(key, ErrorStats(**vars(stats))) for key, stats in log.stats.items()]
+            for key, stats in items:
+                if (total := merged.get(key)) is None:
+                    merged[key] = ErrorStats(stats.count, stats.first_seen, stats.last_seen, stats.last_message)
+                else:
+                    total._merge(stats)
+        return merged
+
+    def clear(self) -> None:
+        """Drop buffered errors, counters are kept"""
+        self.records.clear()
+
+    def __iter__(self) -> Iterator[Exception]:
+        return (record.error for record in self.records)
+
+    def __contains__(self, error: Exception) -> bool:
+        return any(record.error is error for record in self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} total={self.total} len={len(self)}>"
@@ -4,3 +4,7 @@ class ConstraintException(Exception):
 
 class ReadyRequired(Exception):
     pass
+
+
+class OffersLimitExceeded(Exception):
+    pass
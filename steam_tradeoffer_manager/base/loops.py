@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, TypeVar
+
+__all__ = ("LoopThread", "run_in_loop", "running_loop")
+
+_log = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+
+def running_loop() -> asyncio.AbstractEventLoop | None:
+    """Event loop running in current thread, `None` if there is no one"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def run_in_loop(loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+    """
+    Run coroutine on `loop`, result can be awaited from the running loop.
+    Coroutine is returned as is if it is already on `loop`, cancelling awaiter cancels it in `loop` otherwise.
+    """
+    if running_loop() is loop:
+        return coro
+    return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+class LoopThread:
+    """
+    Event loop running forever in daemon thread.
+    :param name: thread name
+    """
+
+    __slots__ = ("name", "loop", "_thread", "_started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._started = threading.Event()
+
+    def start(self) -> None:
+        """Start thread and wait until loop is running"""
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(asyncio.sleep(0))  # let cancelled tasks finish
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def is_current(self) -> bool:
+        """Called from this loop thread"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, _T]) -> "Future[_T]":
+        """Schedule coroutine from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        self.loop.call_soon_threadsafe(callback, *args)
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Stop loop, cancel its tasks and wait for thread exit"""
+        if self.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r} running={self.is_running()}>"
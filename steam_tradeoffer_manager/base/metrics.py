@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import threading
+from bisect import bisect_left
+from typing import Generic, Iterable, Iterator, NamedTuple, TypeVar
+
+from aiohttp import web
+
+from .enums import BotState
+from .loops import running_loop
+
+__all__ = ("Counter", "Histogram", "MetricFamily", "PoolMetrics")
+
+_log = logging.getLogger(__name__)
+_P = TypeVar("_P", bound="_pool.SteamBotPool")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class MetricFamily(NamedTuple):
+    """Collected metric with samples `(name suffix, labels, value)`"""
+
+    name: str
+    type: str
+    help: str
+    samples: list[tuple[str, dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """Prometheus text exposition format of metric families"""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for suffix, labels, value in family.samples:
+            if labels:
+                formatted = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+                lines.append(f"{family.name}{suffix}{{{formatted}}} {_format_value(value)}")
+            else:
+                lines.append(f"{family.name}{suffix} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels, increments are safe from bot loop threads.
+    :param name: metric name
+    :param help: metric description
+    :param labels: label names, values are passed to `inc` in the same order
+    """
+
+    __slots__ = ("name", "help", "labels", "_values", "_lock")
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def collect(self) -> MetricFamily:
+        samples = [
+            ("_total", dict(zip(self.labels, map(str, key))), value) for key, value in self._values.copy().items()
+        ]
+        return MetricFamily(self.name, "counter", self.help, samples)
+
+
+class Histogram:
+    """
+    Latency histogram without labels.
+    :param name: metric name
+    :param help: metric description
+    :param buckets: sorted upper bounds of buckets in seconds, `+Inf` bucket is added
+    """
+
+    __slots__ = ("name", "help", "buckets", "_counts", "_sum", "_lock")
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def merge(self, other: "Histogram") -> None:
+        """Add observations of histogram with same buckets"""
+        with self._lock:
+            self._counts = [a + b for a, b in zip(self._counts, other._counts)]
+            self._sum += other._sum
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            counts, total = self._counts.copy(), self._sum
+
+        samples = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, float("inf")), counts):
+            cumulative += count
+            samples.append(("_bucket", {"le": _format_value(bound)}, cumulative))
+        samples += [("_sum", {}, total), ("_count", {}, cumulative)]
+        return MetricFamily(self.name, "histogram", self.help, samples)
+
+
+class PoolMetrics(Generic[_P]):
+    """
+    Metrics of pool bots in Prometheus text format.
+    Counters and histograms are updated by bots, gauges are read from pool on collection,
+    so collecting costs nothing until `render` is called.
+    :param pool: pool of bots
+    """
+
+    def __init__(self, pool: _P):
+        self.pool = pool
+        self.polls = Counter("steam_trade_polls", "Trade offers polls", ("bot",))
+        self.login_seconds = Histogram("steam_login_seconds", "Bot login duration")
+        self._pending_tasks: dict[str, int] = {}  # loop name to tasks count reported by loop itself
+
+    def counters(self) -> Iterator[Counter | Histogram]:
+        """Counters and histograms updated by bots"""
+        yield self.polls
+        yield self.login_seconds
+
+    def gauges(self) -> Iterator[MetricFamily]:
+        """Metrics read from pool state on collection"""
+        states = self.pool.state_counts()
+        yield MetricFamily(
+            "steam_bots", "gauge", "Bots per state", [("", {"state": state.name}, states[state]) for state in BotState]
+        )
+        yield MetricFamily(
+            "steam_bot_errors",
+            "counter",
+            "Errors of bot",
+            [("_total", {"bot": str(b.id)}, b.errors.total) for b in self.pool],
+        )
+
+        loops = {"pool": self.pool.loop} | {str(group): t.loop for group, t in self.pool._loop_threads.items()}
+        for name, loop in loops.items():
+            self._request_pending_tasks(name, loop)
+        yield MetricFamily(
+            "steam_loop_pending_tasks",
+            "gauge",
+            "Pending tasks (handlers of dispatched events, pollers, etc.) of event loop, "
+            "loops of other threads report on previous collection",
+            [("", {"loop": name}, count) for name, count in self._pending_tasks.copy().items() if name in loops],
+        )
+
+    def _request_pending_tasks(self, name: str, loop: asyncio.AbstractEventLoop) -> None:
+        # tasks of loop can be listed only from its own thread
+        if loop.is_closed():
+            self._pending_tasks.pop(name, None)
+        elif running_loop() is loop:
+            self._count_pending_tasks(name, loop)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._count_pending_tasks, name, loop)
+            except RuntimeError:  # closed meanwhile
+                self._pending_tasks.pop(name, None)
+
+    def _count_pending_tasks(self, name: str, loop: asyncio.AbstractEventLoop) -> None:
+        self._pending_tasks[name] = len(asyncio.all_tasks(loop))
+
+    def collect(self) -> list[MetricFamily]:
+        families = [*self.gauges(), *(metric.collect() for metric in self.counters())]
+        if (tracer := self.pool.tracer) is not None:
+            families += tracer.collect()
+        return families
+
+    def render(self) -> str:
+        """Current metrics in Prometheus text format"""
+        return render(self.collect())
+
+    async def handler(self, _: web.Request) -> web.Response:
+        """aiohttp handler of `/metrics` endpoint"""
+        return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE})
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9100) -> web.AppRunner:
+        """
+        Serve metrics on `http://host:port/metrics` from pool loop.
+        :return: runner, `await runner.cleanup()` to stop serving
+        """
+        app = web.Application()
+        app.router.add_get("/metrics", self.handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        _log.info(f"Metrics are served on {host}:{port}")
+        return runner
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} pool={self.pool!r}>"
+
+
+from . import pool as _pool
@@ -1,6 +1,7 @@
 import inspect
 import logging
-from typing import TypeVar, Generic, Hashable, Sequence, Final
+import weakref
+from typing import TypeVar, Generic, Hashable, Sequence, Final, Callable, Any
 
 from .abc import AbstractBasePool
 from .exceptions import ConstraintException
@@ -18,7 +19,8 @@ class ConstraintsMixin:
     Mixin preventing create new object that violates unique constraint fields.
     Constraint fields not necessary need to be attributes on model,
     but always must be passed like arguments to `__init__` and be `hashable`.
-    Implement `__del__` method to clean up hashes in storage while garbage collecting,
+    Hashes are cleaned up from storage by `weakref.finalize` when object is garbage collected
+    or explicitly by `_release_constraints`.
     """
 
     __storage__: Final[dict[str, set[int]]] = {}
@@ -26,6 +28,8 @@ class ConstraintsMixin:
     constraints: Sequence[str | Sequence[str]] = ()
     dimension: str
 
+    _constraints_binder: Callable[[tuple, dict[str, Any]], tuple[int, ...]]
+
     def __init_subclass__(cls, dimension: str = None, **kwargs):
         super().__init_subclass__(**kwargs)
         subclass_dimension = getattr(cls, "dimension", None)
@@ -36,7 +40,7 @@ class ConstraintsMixin:
             warnings.warn(
                 "Subclass overrides `dimension` and `dimension` arg has been passed to subclass init. "
                 f"Used [{subclass_dimension}] by default.",
-                stacklevel=len(inspect.stack()) + 1,
+                stacklevel=2,  # class definition
             )
 
         if subclass_dimension:
@@ -46,7 +50,34 @@ class ConstraintsMixin:
         else:
             cls.dimension = cls.__name__
 
-        cls.__storage__.update({cls.dimension: set()})  # init storage
+        cls.__storage__.setdefault(cls.dimension, set())  # init storage
+        cls._constraints_binder = cls._compile_binder()
+
+    @classmethod
+    def _compile_binder(cls) -> Callable[[tuple, dict[str, Any]], tuple[int, ...]]:
+        """Build function that collects constraints hashes from `__init__` args without binding whole signature"""
+        positions: dict[str, int] = {}
+        for i, param in enumerate(tuple(inspect.signature(cls.__init__).parameters.values())[1:]):
+            if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                break
+            positions[param.name] = i
+
+        def getter(name: str) -> Callable[[tuple, dict[str, Any]], Hashable]:
+            if (pos := positions.get(name)) is None:
+                return lambda args, kwargs: kwargs[name]
+            return lambda args, kwargs: args[pos] if pos < len(args) else kwargs[name]
+
+        hashers = []
+        for const in cls.constraints:
+            if isinstance(const, str):
+                get = getter(const)
+                hashers.append(lambda args, kwargs, get=get: hash(get(args, kwargs)))
+            else:
+                getters = tuple(getter(const1) for const1 in const)
+                hashers.append(lambda args, kwargs, gs=getters: hash(tuple(hash(g(args, kwargs)) for g in gs)))
+
+        hashers = tuple(hashers)
+        return lambda args, kwargs: tuple(hasher(args, kwargs) for hasher in hashers)
 
     def __new__(cls, *args, **kwargs):
         # ensure that all args will be transferred to super().__new__ method of parent if he needs them
@@ -55,39 +86,27 @@ class ConstraintsMixin:
         except TypeError:
             __instance = super().__new__(cls, *args, **kwargs)
 
-        __init_args = tuple(inspect.signature(cls.__init__).parameters)[1:]  # getting init arguments
-        __merged_args: dict[str, Hashable] = {**{t[0]: t[1] for t in zip(__init_args, args)}, **kwargs}
-        __instance._hashes = cls._collect_hashes(__merged_args)
+        __instance._hashes = cls._constraints_binder(args, kwargs)
 
         __instance._check_constraints()
         return __instance
 
-    @classmethod
-    def _collect_hashes(cls, merged_args: dict[str, Hashable]) -> tuple[int]:
-        hashes = []
-        for const in cls.constraints:
-            if isinstance(const, str):
-                h = hash(merged_args[const])
-            else:
-                h = []
-                for const1 in const:
-                    h.append(hash(merged_args[const1]))
-                h = hash(tuple(h))
-            hashes.append(h)
-
-        return tuple(hashes)
-
     def _check_constraints(self):
+        storage = self.__storage__[self.dimension]
         for h in self._hashes:
-            if h in self.__storage__[self.dimension]:
+            if h in storage:
                 f = join_multiple_in_string(self.constraints)
                 # would be great if I write violated constraints here
                 raise ConstraintException(f"Instance with unique values({f}) already created.")
 
-        self.__storage__[self.dimension].update(self._hashes)
+        storage.update(self._hashes)
+        # finalizer don't reference instance, so it works for objects in reference cycles
+        self._constraints_finalizer = weakref.finalize(self, storage.difference_update, self._hashes)
+        self._constraints_finalizer.atexit = False
 
-    def __del__(self) -> None:
-        self.__storage__[self.dimension].difference_update(self._hashes)  # clean up hashes while garbage collecting
+    def _release_constraints(self) -> None:
+        """Clean up hashes in storage, so equal object can be created. Safe to call many times"""
+        self._constraints_finalizer()
 
 
 class _MappingPoolBotMixin(ConstraintsMixin, Generic[_I, _P]):  # pragma: no cover
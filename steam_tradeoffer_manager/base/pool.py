@@ -1,11 +1,22 @@
 import asyncio
 import logging
-from typing import Callable, TypeVar, Generic, Iterator
+from types import MappingProxyType
+from typing import Any, Callable, Coroutine, TypeVar, Generic, Iterator, ValuesView, Hashable, Mapping
 
 from .abc import AbstractBasePool
 from .exceptions import ConstraintException
 from .mixins import PoolBotMixin
 from .enums import ONCE_EVERY
+from .ratelimit import RateLimitRegistry
+from .connectors import ConnectorPool
+from .proxies import ProxyPool
+from .sessions import SessionStorage
+from .supervisor import BotSupervisor
+from .enums import BotState
+from .errors import ErrorLog, ErrorStats
+from .loops import LoopThread, running_loop
+from .metrics import PoolMetrics
+from .tracing import RequestTracer
 
 __all__ = ("SteamBotPool",)
 
@@ -22,22 +33,139 @@ class SteamBotPool(Generic[_I, _B], AbstractBasePool):
     randomizer: Callable[[...], int] | None = ONCE_EVERY.FOUR_HOURS
     whitelist: set[int] | None = None  # whitelist with steam id's of admins/owners/etc
     domain: str = "steam.py"  # domain to register new api key
+    # max http requests per second through one proxy (or direct connection) shared by all pool bots, `None` - unlimited
+    proxy_rate: float | None = None
+    proxy_burst: float | None = None
+    # share http connectors between bots with same proxy, bots with own connector are not affected.
+    # All bots behind one proxy (or direct connection) are limited to `connector_limit` connections at once
+    share_connectors: bool = False
+    connector_limit: int = 100
+    connector_limit_per_host: int = 0
+    proxies: ProxyPool | None = None  # proxies assigned to bots that don't have own proxy
+    session_storage: SessionStorage | None = None  # saved web sessions to resume instead of full login on start
+    # restart bots failed to start with exponential backoff, options are passed to `BotSupervisor`
+    supervise: bool = False
+    supervisor_options: Mapping[str, Any] = MappingProxyType({})
+    # run bots in that many groups with own event loops in worker threads, `0` - all bots run on pool loop.
+    # Bots are spread by id or put in group passed to `add`, grouped bots don't use shared connectors
+    loop_groups: int = 0
+    # count polls, logins and other bot operations, export them with pool state in Prometheus format
+    collect_metrics: bool = False
+    metrics_class: Callable[["SteamBotPool"], PoolMetrics] = PoolMetrics
+    # trace http requests of bots per endpoint, `trace_sample_rate` of requests are traced
+    trace_requests: bool = False
+    trace_sample_rate: float = 1.0
 
     def __init__(self):
         self.loop = asyncio.get_event_loop_policy().get_event_loop()
         self._store: dict[_I, _B] = {}
+        self._rate_limits: RateLimitRegistry | None = None
+        self._connectors: ConnectorPool | None = None
+        self._supervisor: BotSupervisor | None = None
+        self._metrics: PoolMetrics | None = None
+        self._tracer: RequestTracer | None = None
+        self._states: dict[BotState, dict[_I, _B]] = {state: {} for state in BotState}  # state indexes
+        self._loop_threads: dict[Hashable, LoopThread] = {}
+        self._groups: dict[_I, Hashable] = {}  # explicitly assigned loop groups
+
+    @property
+    def connectors(self) -> ConnectorPool | None:
+        """Shared http connectors grouped by proxy, created on first access if `share_connectors` is set"""
+        if self._connectors is None and self.share_connectors:
+            self._connectors = ConnectorPool(self.connector_limit, self.connector_limit_per_host)
+        return self._connectors
+
+    @property
+    def rate_limits(self) -> RateLimitRegistry | None:
+        """Adaptive per proxy rate limits, created on first access if `proxy_rate` is set"""
+        if self._rate_limits is None and self.proxy_rate:
+            self._rate_limits = RateLimitRegistry(self.proxy_rate, self.proxy_burst)
+        return self._rate_limits
+
+    @property
+    def supervisor(self) -> BotSupervisor | None:
+        """Supervisor of failed bots, created on first access if `supervise` is set"""
+        if self._supervisor is None and self.supervise:
+            self._supervisor = BotSupervisor(self, **self.supervisor_options)
+        return self._supervisor
+
+    @property
+    def metrics(self) -> PoolMetrics | None:
+        """Pool metrics, created on first access if `collect_metrics` is set"""
+        if self._metrics is None and self.collect_metrics:
+            self._metrics = self.metrics_class(self)
+        return self._metrics
+
+    @property
+    def tracer(self) -> RequestTracer | None:
+        """Http requests tracer of bots, created on first access if `trace_requests` is set"""
+        if self._tracer is None and self.trace_requests:
+            self._tracer = RequestTracer(self.trace_sample_rate)
+        return self._tracer
+
+    def by_state(self, state: BotState) -> ValuesView[_B]:
+        """Live view of pool bots in `state`"""
+        return self._states[state].values()
+
+    def state_counts(self) -> dict[BotState, int]:
+        """Amount of pool bots in every state"""
+        return {state: len(bots) for state, bots in self._states.items()}
+
+    def error_summary(self) -> dict[tuple[str, str], ErrorStats]:
+        """Errors of all pool bots counted by `(exception type name, event)`"""
+        return ErrorLog.summary(bot.errors for bot in self)
+
+    def loop_thread(self, group: Hashable) -> LoopThread:
+        """Thread running loop of bots group, started on first access"""
+        if (thread := self._loop_threads.get(group)) is None or not thread.is_running():
+            thread = self._loop_threads[group] = LoopThread(f"{self.__class__.__name__} loop group {group}")
+            thread.start()
+        return thread
+
+    def _group_of(self, bot: _B) -> Hashable | None:
+        if (group := self._groups.get(bot.id)) is not None:
+            return group
+        return hash(bot.id) % self.loop_groups if self.loop_groups else None
+
+    def _assign_loop(self, bot: _B) -> None:
+        if (group := self._group_of(bot)) is not None:
+            bot._set_loop_thread(self.loop_thread(group))
+
+    def _threadsafe(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run callback on pool loop, right away if it is called from pool loop or pool has no loop groups"""
+        if self._loop_threads and running_loop() not in (None, self.loop):
+            self.loop.call_soon_threadsafe(callback, *args)
+        else:
+            callback(*args)
+
+    def _bot_task(self, bot: _B, coro: Coroutine, name: str) -> asyncio.Future:
+        """Run bot coroutine on bot loop, returned future belongs to pool loop"""
+        if bot._loop_thread is None:
+            return self.loop.create_task(coro, name=f"{bot.id} {name} task")
+        return asyncio.wrap_future(bot._loop_thread.submit(coro), loop=self.loop)
+
+    def _on_bot_state_change(self, bot: _B, old: BotState, new: BotState) -> None:
+        self._states[old].pop(bot.id, None)
+        self._states[new][bot.id] = bot
+
+        if (supervisor := self.supervisor) is not None:
+            supervisor.on_state_change(bot, old, new)
 
     def startup(self):
         """Starting all bots"""
-        tasks = [self.loop.create_task(bot.start(), name=f"{bot.id} start task") for bot in self]
+        for bot in self:
+            if bot._loop_thread is not None and not bot._loop_thread.is_running():  # groups stopped by shutdown
+                self._assign_loop(bot)
+        tasks = [self._bot_task(bot, bot.start(), "start") for bot in self]
 
         return asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
 
-    def add(self, bot: _B, raise_=True) -> None:
+    def add(self, bot: _B, raise_=True, *, group: Hashable | None = None) -> None:
         """
         Add bot instance to pool
         :param bot: bot instance
         :param raise_: raise `ConstraintException` if bot in this pool or bounded to other pool. Default - `True`
+        :param group: run bot in loop group with this name instead of pool loop, bot must not be started yet
         :return `None`
         :raises ConstraintException
         """
@@ -51,6 +179,8 @@ class SteamBotPool(Generic[_I, _B], AbstractBasePool):
                 raise ConstraintException(msg)
             warnings.warn(msg, stacklevel=len(inspect.stack()) + 1)
 
+        if group is not None:
+            self._groups[bot.id] = group
         self._bind(bot)
 
     def remove(self, bot: _B) -> None:
@@ -67,18 +197,39 @@ class SteamBotPool(Generic[_I, _B], AbstractBasePool):
         return bot
 
     async def shutdown(self) -> None:
-        if tasks := [self.loop.create_task(bot.stop(), name=f"{bot.id} stop task") for bot in self]:
+        if self._supervisor is not None:
+            self._supervisor.close()
+
+        running = [bot for bot in self if bot._loop_thread is None or bot._loop_thread.is_running()]
+        if tasks := [self._bot_task(bot, bot.stop(), "stop") for bot in running]:
             await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
 
+        for thread in self._loop_threads.values():
+            await self.loop.run_in_executor(None, thread.stop, 10)
+        self._loop_threads.clear()
+
+        if self._connectors is not None:
+            await self._connectors.close()  # bots sessions don't own shared connectors
+
     def _unbind(self, bot: _B) -> None:
+        if self.proxies is not None:
+            self.proxies.release(bot.id)
+        if self._supervisor is not None:
+            self._supervisor.cancel(bot)
+        self._states[bot.state].pop(bot.id, None)
+        self._groups.pop(bot.id, None)
         bot._pool = None
         del self._store[bot.id]
+        if bot._loop_thread is not None:
+            bot._set_loop_thread(None)
 
     def _bind(self, bot: _B) -> None:
         if not bot.id:
             raise ValueError(f"Bot id is {bot.id}")
         setattr(bot, "_pool", self)
         self._store[bot.id] = bot
+        self._states[bot.state][bot.id] = bot
+        self._assign_loop(bot)
 
     # container methods https://docs.python.org/3/reference/datamodel.html#emulating-container-types
 
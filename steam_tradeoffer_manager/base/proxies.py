@@ -0,0 +1,146 @@
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from types import SimpleNamespace
+from typing import Iterable, Hashable, Any
+
+from aiohttp import TraceConfig, ClientSession, TraceRequestEndParams
+
+__all__ = ("ProxyPool", "ProxyHealth")
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class ProxyHealth:
+    """Exponentially weighted health stats of proxy, decaying towards healthy while there are no requests"""
+
+    latency: float = 0.0  # seconds
+    error_rate: float = 0.0  # 0..1
+    requests: int = 0
+    errors: int = 0
+    bots: int = 0  # assigned bots
+    updated: float = field(default_factory=monotonic)  # time of last decay
+
+    @property
+    def score(self) -> float:
+        """Health score from 0 to 1, higher is better"""
+        return (1 - self.error_rate) / (1 + self.latency)
+
+    def _decay(self, half_life: float | None) -> None:
+        now = monotonic()
+        if half_life:
+            factor = 0.5 ** ((now - self.updated) / half_life)
+            self.latency *= factor
+            self.error_rate *= factor
+        self.updated = now
+
+    def _record(self, latency: float | None, error: bool, alpha: float, half_life: float | None = None) -> None:
+        self._decay(half_life)
+        self.requests += 1
+        self.errors += error
+        if latency is not None:
+            self.latency += alpha * (latency - self.latency)
+        self.error_rate += alpha * (error - self.error_rate)
+
+
+class ProxyPool:
+    """
+    Pool of proxies which assigns bots to healthy proxies.
+    Health is measured from latency and errors of bots requests.
+    Bot keeps assigned proxy while it is healthy and moves to other one on next start otherwise.
+    Unhealthy proxy gets no traffic, so its stats decay towards healthy and it is tried again after a while.
+    :param proxies: proxy urls
+    :param min_score: proxies with lower score are considered unhealthy
+    :param alpha: smoothing factor of health stats, higher - faster reaction
+    :param half_life: seconds in which latency and error rate halve, `None` - stats don't decay
+    """
+
+    def __init__(
+        self, proxies: Iterable[str], *, min_score: float = 0.3, alpha: float = 0.1, half_life: float | None = 300.0
+    ):
+        self.min_score = min_score
+        self.alpha = alpha
+        self.half_life = half_life
+        self.health: dict[str, ProxyHealth] = {proxy: ProxyHealth() for proxy in proxies}
+
+        self._assigned: dict[Hashable, str] = {}  # bot id to proxy
+
+        if not self.health:
+            raise ValueError("Proxy pool can't be empty")
+
+    def is_healthy(self, proxy: str) -> bool:
+        health = self.health[proxy]
+        health._decay(self.half_life)
+        return health.score >= self.min_score
+
+    def get(self, bot_id: Hashable) -> str | None:
+        """Get proxy assigned to bot"""
+        return self._assigned.get(bot_id)
+
+    def assign(self, bot_id: Hashable) -> str:
+        """
+        Get proxy for bot. Keeps current proxy if it is healthy,
+        otherwise assigns the least loaded healthy proxy (or the healthiest one if all proxies are unhealthy).
+        """
+        current = self._assigned.get(bot_id)
+        if current is not None and current in self.health and self.is_healthy(current):
+            return current
+
+        self.release(bot_id)
+        healthy = [proxy for proxy in self.health if self.is_healthy(proxy)]
+        if healthy:
+            proxy = min(healthy, key=lambda p: (self.health[p].bots, -self.health[p].score))
+        else:
+            proxy = max(self.health, key=lambda p: self.health[p].score)
+
+        if current is not None and proxy != current:
+            _log.info(f"Bot {bot_id} moved from unhealthy proxy {current} to {proxy}")
+
+        self._assigned[bot_id] = proxy
+        self.health[proxy].bots += 1
+        return proxy
+
+    def release(self, bot_id: Hashable) -> None:
+        """Remove bot assignment"""
+        if (proxy := self._assigned.pop(bot_id, None)) is not None and proxy in self.health:
+            self.health[proxy].bots -= 1
+
+    def add(self, proxy: str) -> None:
+        self.health.setdefault(proxy, ProxyHealth())
+
+    def remove(self, proxy: str) -> None:
+        """Remove proxy, bots will be reassigned on next start"""
+        del self.health[proxy]
+
+    def trace_config(self, proxy: str) -> TraceConfig:
+        """`aiohttp.TraceConfig` that measures proxy latency and errors"""
+
+        def record(latency: float | None, error: bool) -> None:
+            if (health := self.health.get(proxy)) is not None:  # proxy might be removed
+                health._record(latency, error, self.alpha, self.half_life)
+
+        async def on_request_start(_: ClientSession, ctx: SimpleNamespace, __: Any):
+            ctx.proxy_started = monotonic()
+
+        async def on_request_end(_: ClientSession, ctx: SimpleNamespace, params: TraceRequestEndParams):
+            status = params.response.status
+            record(monotonic() - ctx.proxy_started, status == 429 or status >= 500)
+
+        async def on_request_exception(_: ClientSession, __: SimpleNamespace, ___: Any):
+            record(None, True)
+
+        config = TraceConfig()
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        config.on_request_exception.append(on_request_exception)
+        return config
+
+    def __contains__(self, proxy: str) -> bool:
+        return proxy in self.health
+
+    def __len__(self) -> int:
+        return len(self.health)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)}>"
@@ -0,0 +1,183 @@
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+from types import SimpleNamespace
+from typing import Hashable
+
+from aiohttp import TraceConfig, TraceRequestStartParams, TraceRequestEndParams, ClientSession
+
+__all__ = ("TokenBucket", "AdaptiveTokenBucket", "RateLimitRegistry", "RateLimitStats")
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    Tokens are reserved in call order, so waiters are served FIFO without locks or extra tasks.
+    :param rate: amount of tokens refilled per second
+    :param capacity: max amount of tokens (burst size). Defaults to `rate`
+    """
+
+    __slots__ = ("rate", "capacity", "_tokens", "_updated")
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Available tokens at this moment. Negative if tokens already reserved by waiters."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available right now"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def delay(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` will be available"""
+        self._refill()
+        return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Reserve tokens and wait until they are refilled"""
+        self._refill()
+        self._tokens -= tokens
+        if self._tokens < 0:
+            try:
+                await asyncio.sleep(-self._tokens / self.rate)
+            except asyncio.CancelledError:
+                self._tokens += tokens  # give back reservation
+                raise
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} rate={self.rate} capacity={self.capacity}>"
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket which rate shrinks when server throttles requests and recovers gradually on successes.
+    :param rate: max amount of tokens refilled per second
+    :param capacity: max amount of tokens (burst size). Defaults to `rate`
+    :param min_rate: rate will not shrink lower than this value. Defaults to 1/20 of `rate`
+    :param decrease: multiplier applied to rate on throttling
+    :param increase: amount added to rate on success. Defaults to 1/50 of `rate`
+    :param cooldown: seconds after penalty during which next penalties are ignored,
+        so burst of throttled responses counts once
+    """
+
+    __slots__ = ("max_rate", "min_rate", "decrease", "increase", "cooldown", "_penalized")
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        *,
+        min_rate: float | None = None,
+        decrease: float = 0.5,
+        increase: float | None = None,
+        cooldown: float = 1.0,
+    ):
+        super().__init__(rate, capacity)
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.decrease = decrease
+        self.increase = increase if increase is not None else rate / 50
+        self.cooldown = cooldown
+        self._penalized = 0.0
+
+    def penalize(self) -> None:
+        """Shrink rate and drop accumulated burst"""
+        now = monotonic()
+        if now - self._penalized < self.cooldown:
+            return
+
+        self._penalized = now
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self._tokens = min(self._tokens, 0.0)
+
+    def reward(self) -> None:
+        """Grow rate back to max rate"""
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+@dataclass
+class RateLimitStats:
+    requests: int = 0
+    throttled: int = 0  # responses with 429/503 statuses
+    wait_time: float = 0.0  # total seconds requests spent waiting for tokens
+
+
+class RateLimitRegistry:
+    """
+    Registry of adaptive rate limits keyed by proxy or other egress identity.
+    Every http session that uses same key shares one `AdaptiveTokenBucket`.
+    :param rate: max requests per second for one key
+    :param capacity: burst size
+    :param bucket_options: other `AdaptiveTokenBucket` options
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, **bucket_options):
+        self.rate = rate
+        self.capacity = capacity
+        self.bucket_options = bucket_options
+        self.stats: dict[Hashable, RateLimitStats] = {}
+
+        self._buckets: dict[Hashable, AdaptiveTokenBucket] = {}
+
+    def get(self, key: Hashable) -> AdaptiveTokenBucket:
+        """Get or create bucket for key"""
+        if (bucket := self._buckets.get(key)) is None:
+            bucket = self._buckets[key] = AdaptiveTokenBucket(self.rate, self.capacity, **self.bucket_options)
+            self.stats[key] = RateLimitStats()
+        return bucket
+
+    def trace_config(self, key: Hashable) -> TraceConfig:
+        """`aiohttp.TraceConfig` that limits requests of session and adapts limit by response statuses"""
+        bucket = self.get(key)
+        stats = self.stats[key]
+
+        async def on_request_start(_: ClientSession, __: SimpleNamespace, ___: TraceRequestStartParams):
+            stats.requests += 1
+            started = monotonic()
+            await bucket.acquire()
+            stats.wait_time += monotonic() - started
+
+        async def on_request_end(_: ClientSession, __: SimpleNamespace, params: TraceRequestEndParams):
+            if params.response.status in THROTTLE_STATUSES:
+                stats.throttled += 1
+                bucket.penalize()
+            elif params.response.status < 400:
+                bucket.reward()
+
+        config = TraceConfig()
+        config.on_request_start.append(on_request_start)
+        config.on_request_end.append(on_request_end)
+        return config
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._buckets
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} rate={self.rate} len={len(self)}>"
@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+from hashlib import sha256
+from pathlib import Path
+from time import time
+
+from cryptography.fernet import Fernet, InvalidToken
+
+__all__ = ("SessionData", "SessionStorage")
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionData:
+    """Web session of bot that is enough to skip full login"""
+
+    steam_id: int
+    cookies: dict[str, dict[str, str]]  # domain to cookie name to value
+    api_key: str | None = None
+    trade_url_token: str | None = None
+    saved: float = field(default_factory=time)  # unix timestamp
+
+
+class SessionStorage:
+    """
+    Encrypted on-disk storage of bots web sessions keyed by account username.
+    Every account is stored in separate file encrypted with `Fernet` (AES-128-CBC + HMAC),
+    file names are hashes of usernames.
+    :param path: directory of sessions files, created if missing
+    :param key: `Fernet` key, see `SessionStorage.generate_key`
+    :param ttl: max age of session, older sessions are dropped on load
+    """
+
+    def __init__(self, path: str | os.PathLike, key: bytes | str, *, ttl: timedelta = timedelta(days=1)):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._fernet = Fernet(key)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def generate_key() -> bytes:
+        return Fernet.generate_key()
+
+    def _file(self, username: str) -> Path:
+        return self.path / f"{sha256(username.encode()).hexdigest()}.session"
+
+    def load(self, username: str) -> SessionData | None:
+        """
+        Load session of account
+        :return: `SessionData` or `None` if there is no session, it is expired or can't be decrypted
+        """
+        try:
+            token = self._file(username).read_bytes()
+        except FileNotFoundError:
+            return
+
+        try:
+            data = json.loads(self._fernet.decrypt(token, ttl=int(self.ttl.total_seconds())))
+            return SessionData(**data)
+        except (InvalidToken, ValueError, TypeError):  # expired, encrypted with other key or corrupted
+            _log.debug(f"Drop invalid or expired session of {username}")
+            self.remove(username)
+
+    def save(self, username: str, data: SessionData) -> None:
+        file = self._file(username)
+        tmp = file.with_suffix(".tmp")
+        tmp.write_bytes(self._fernet.encrypt(json.dumps(asdict(data)).encode()))
+        os.replace(tmp, file)  # atomic, so concurrent load never reads partially written file
+
+    def remove(self, username: str) -> None:
+        self._file(username).unlink(missing_ok=True)
+
+    def __contains__(self, username: str) -> bool:
+        return self._file(username).exists()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={str(self.path)!r}>"
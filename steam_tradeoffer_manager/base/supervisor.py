@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import timedelta
+from functools import partial
+from random import random
+from time import monotonic
+from typing import Generic, TypeVar, Hashable
+
+from .enums import BotState
+
+__all__ = ("BotSupervisor",)
+
+_log = logging.getLogger(__name__)
+_B = TypeVar("_B", bound="bot.SteamBot")
+_P = TypeVar("_P", bound="pool.SteamBotPool")
+
+
+class BotSupervisor(Generic[_P, _B]):
+    """
+    Restarts pool bots that failed to start with exponential backoff and jitter.
+    Bots that fail `flap_threshold` times within `flap_window` are quarantined,
+    bots with invalid credentials are never retried.
+    Every bot has at most one scheduled retry, so failures don't pile up tasks.
+    :param pool: supervised pool
+    :param base_delay: seconds before first retry, doubles with every next failure
+    :param max_delay: max seconds between retries
+    :param flap_threshold: amount of failures within `flap_window` to quarantine bot
+    :param flap_window: time window of counted failures
+    :param quarantine: time before quarantined bot is retried
+    """
+
+    def __init__(
+        self,
+        pool: _P,
+        *,
+        base_delay: float = 10.0,
+        max_delay: float = 900.0,
+        flap_threshold: int = 5,
+        flap_window: timedelta = timedelta(hours=1),
+        quarantine: timedelta = timedelta(hours=6),
+    ):
+        self.pool = pool
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.flap_threshold = flap_threshold
+        self.flap_window = flap_window
+        self.quarantine = quarantine
+
+        self._attempts: dict[Hashable, int] = {}  # consecutive failures
+        self._failures: dict[Hashable, deque[float]] = {}  # monotonic time of failures within flap window
+        self._retries: dict[Hashable, asyncio.TimerHandle] = {}
+        self._restarts: dict[Hashable, asyncio.Future] = {}  # running restarts, cancelled on close
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry, half of it is random (equal jitter) to spread restarts of many bots"""
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return delay / 2 + random() * delay / 2
+
+    def is_scheduled(self, bot: _B) -> bool:
+        return bot.id in self._retries
+
+    def on_state_change(self, bot: _B, old: BotState, new: BotState) -> None:
+        if new is BotState.Active:
+            self._attempts.pop(bot.id, None)  # recovered, next failure starts backoff from the beginning
+        elif new is BotState.UnknownError:
+            self._schedule(bot)
+        elif new is BotState.InvalidCredentials:
+            self.cancel(bot)
+            _log.warning(f"Bot {bot.id} won't be restarted because of invalid credentials")
+
+    def _schedule(self, bot: _B) -> None:
+        if bot.id in self._retries:
+            return
+
+        now = monotonic()
+        failures = self._failures.setdefault(bot.id, deque())
+        failures.append(now)
+        while failures[0] < now - self.flap_window.total_seconds():
+            failures.popleft()
+
+        attempt = self._attempts.get(bot.id, 0)
+        self._attempts[bot.id] = attempt + 1
+        if len(failures) >= self.flap_threshold:
+            failures.clear()
+            delay = self.quarantine.total_seconds()
+            # after current transition is dispatched, so handlers and state indexes see transitions in order
+            self.pool.loop.call_soon(bot._set_state, BotState.Quarantined)
+            _log.warning(f"Bot {bot.id} is flapping, quarantined for {self.quarantine}")
+        else:
+            delay = self.delay(attempt)
+            _log.info(f"Bot {bot.id} will be restarted in {delay:.1f} seconds")
+
+        self._retries[bot.id] = self.pool.loop.call_later(delay, self._retry, bot)
+
+    def _retry(self, bot: _B) -> None:
+        del self._retries[bot.id]
+        if (previous := self._restarts.pop(bot.id, None)) is not None:
+            previous.cancel()  # failed restart still waits for ready
+        if bot.pool is self.pool and bot.state in (BotState.UnknownError, BotState.Quarantined):
+            restart = self._restarts[bot.id] = self.pool._bot_task(bot, bot.start(), "supervisor restart")
+            restart.add_done_callback(partial(self._forget_restart, bot.id))
+
+    def _forget_restart(self, bot_id: Hashable, restart: asyncio.Future) -> None:
+        if self._restarts.get(bot_id) is restart:
+            del self._restarts[bot_id]
+
+    def cancel(self, bot: _B) -> None:
+        """Cancel scheduled retry and forget failures of bot"""
+        if (handle := self._retries.pop(bot.id, None)) is not None:
+            handle.cancel()
+        if (restart := self._restarts.pop(bot.id, None)) is not None:
+            restart.cancel()
+        self._attempts.pop(bot.id, None)
+        self._failures.pop(bot.id, None)
+
+    def close(self) -> None:
+        for handle in (*self._retries.values(), *self._restarts.values()):
+            handle.cancel()
+        self._retries.clear()
+        self._restarts.clear()
+
+    def __len__(self) -> int:
+        return len(self._retries)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} scheduled={len(self)}>"
+
+
+from . import bot, pool
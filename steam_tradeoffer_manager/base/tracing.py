@@ -0,0 +1,157 @@
+import re
+from collections import Counter as _StatusCounter
+from dataclasses import dataclass, field
+from random import random
+from time import monotonic
+from types import SimpleNamespace
+from typing import Hashable
+
+from aiohttp import (
+    ClientSession,
+    TraceConfig,
+    TraceRequestStartParams,
+    TraceRequestEndParams,
+    TraceRequestChunkSentParams,
+    TraceResponseChunkReceivedParams,
+)
+from yarl import URL
+
+from .metrics import Histogram, MetricFamily
+
+__all__ = ("RequestTracer", "EndpointStats")
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_of(url: URL) -> str:
+    """Host and path of url with numeric segments (steam ids, app ids, offer ids) collapsed to `{id}`"""
+    return f"{url.host}{_ID_SEGMENT.sub('/{id}', url.path)}"
+
+
+@dataclass
+class EndpointStats:
+    """Stats of sampled requests to one endpoint made by one bot through one proxy"""
+
+    requests: int = 0
+    errors: int = 0  # requests failed without response
+    rate_limited: int = 0  # 429 responses
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    statuses: _StatusCounter = field(default_factory=_StatusCounter)
+    latency: Histogram = field(default_factory=lambda: Histogram("steam_http_request_seconds", ""), repr=False)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency.sum / count if (count := self.latency.count) else 0.0
+
+
+class RequestTracer:
+    """
+    Per endpoint stats of bots http requests, collected by `aiohttp.TraceConfig` of bots sessions.
+    Stats are grouped by bot, proxy, method and endpoint, latency is measured until response headers
+    and doesn't include waiting for rate limits.
+    :param sample_rate: share of requests to trace, counts in `stats` are of sampled requests,
+        collected counters are scaled to estimate all requests
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        if not 0 < sample_rate <= 1:
+            raise ValueError("Sample rate must be in (0, 1]")
+
+        self.sample_rate = sample_rate
+        # every bot updates only own stats on its loop
+        self.stats: dict[tuple[Hashable, str, str, str], EndpointStats] = {}
+
+    def trace_config(self, bot_id: Hashable, proxy: str) -> TraceConfig:
+        """`aiohttp.TraceConfig` that traces requests of bot session"""
+        sample_rate = self.sample_rate
+
+        async def on_request_start(_: ClientSession, ctx: SimpleNamespace, params: TraceRequestStartParams):
+            if sample_rate < 1 and random() >= sample_rate:
+                ctx.traced = None
+                return
+            key = (bot_id, proxy, params.method, endpoint_of(params.url))
+            if (stats := self.stats.get(key)) is None:
+                stats = self.stats[key] = EndpointStats()
+            stats.requests += 1
+            ctx.traced = stats
+            ctx.trace_started = monotonic()
+
+        async def on_request_chunk_sent(_: ClientSession, ctx: SimpleNamespace, params: TraceRequestChunkSentParams):
+            if (stats := ctx.traced) is not None:
+                stats.bytes_sent += len(params.chunk)
+
+        async def on_response_chunk_received(
+            _: ClientSession, ctx: SimpleNamespace, params: TraceResponseChunkReceivedParams
+        ):
+            if (stats := ctx.traced) is not None:
+                stats.bytes_received += len(params.chunk)
+
+        async def on_request_end(_: ClientSession, ctx: SimpleNamespace, params: TraceRequestEndParams):
+            if (stats := ctx.traced) is not None:
+                stats.latency.observe(monotonic() - ctx.trace_started)
+                status = params.response.status
+                stats.statuses[status] += 1
+                if status == 429:
+                    stats.rate_limited += 1
+
+        async def on_request_exception(_: ClientSession, ctx: SimpleNamespace, __):
+            if (stats := ctx.traced) is not None:
+                stats.errors += 1
+
+        config = TraceConfig()
+        config.on_request_start.append(on_request_start)
+        config.on_request_chunk_sent.append(on_request_chunk_sent)
+        config.on_response_chunk_received.append(on_response_chunk_received)
+        config.on_request_end.append(on_request_end)
+        config.on_request_exception.append(on_request_exception)
+        return config
+
+    def by_endpoint(self) -> dict[tuple[str, str], EndpointStats]:
+        """Stats of all bots and proxies summed per `(method, endpoint)`"""
+        totals: dict[tuple[str, str], EndpointStats] = {}
+        for (_, _, method, endpoint), stats in self.stats.copy().items():
+            total = totals.setdefault((method, endpoint), EndpointStats())
+            total.requests += stats.requests
+            total.errors += stats.errors
+            total.rate_limited += stats.rate_limited
+            total.bytes_sent += stats.bytes_sent
+            total.bytes_received += stats.bytes_received
+            total.statuses.update(stats.statuses)
+            total.latency.merge(stats.latency)
+        return totals
+
+    def collect(self) -> list[MetricFamily]:
+        """
+        Stats as metric families of `PoolMetrics`.
+        Counters are divided by `sample_rate` to estimate all requests, latency histogram is of sampled requests
+        """
+        scale = 1 / self.sample_rate
+        requests, errors, limited, sent, received, latency = [], [], [], [], [], []
+        for (bot_id, proxy, method, endpoint), stats in self.stats.copy().items():
+            labels = {"bot": str(bot_id), "proxy": proxy, "method": method, "endpoint": endpoint}
+            for status, count in stats.statuses.copy().items():
+                requests.append(("_total", labels | {"status": str(status)}, count * scale))
+            errors.append(("_total", labels, stats.errors * scale))
+            limited.append(("_total", labels, stats.rate_limited * scale))
+            sent.append(("_total", labels, stats.bytes_sent * scale))
+            received.append(("_total", labels, stats.bytes_received * scale))
+            latency += [(suffix, labels | extra, value) for suffix, extra, value in stats.latency.collect().samples]
+
+        return [
+            MetricFamily("steam_http_responses", "counter", "Estimated http responses by status", requests),
+            MetricFamily("steam_http_errors", "counter", "Estimated http requests failed without response", errors),
+            MetricFamily("steam_http_rate_limited", "counter", "Estimated 429 http responses", limited),
+            MetricFamily("steam_http_sent_bytes", "counter", "Estimated http request body bytes", sent),
+            MetricFamily("steam_http_received_bytes", "counter", "Estimated http response body bytes", received),
+            MetricFamily("steam_http_request_seconds", "histogram", "Sampled http latency to response", latency),
+            MetricFamily(
+                "steam_http_trace_sample_rate", "gauge", "Share of traced http requests", [("", {}, self.sample_rate)]
+            ),
+        ]
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} sample_rate={self.sample_rate} len={len(self)}>"
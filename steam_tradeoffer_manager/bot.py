@@ -1,16 +1,21 @@
+import asyncio
 import logging
+from functools import partial
+from time import monotonic
 from typing import TypeVar, Callable, Any, TypeAlias, overload
 from datetime import timedelta
 
 import steam
 from aiohttp import BasicAuth, BaseConnector
 
-from .base import SteamBot
+from .base import SteamBot, BotState, OffersLimitExceeded, ReadyRequired, SessionData
 from .item import BotItem
 from .offer import ManagerTradeOffer
 from .inventory import GamesInventory
 from .trades import ManagerBotTrades
-from .utils import parse_trade_url, ready_required, copy_user
+from .confirmations import ConfirmationBatcher
+from .partners import BotPartnerViews
+from .utils import parse_trade_url, ready_required, available_required
 
 __all__ = ("ManagerBot",)
 
@@ -75,8 +80,7 @@ class ManagerBot(SteamBot[_I, _M]):
         ui_mode: steam.UIMode | None = ...,
         flags: steam.PersonaStateFlag | None = ...,
         force_kick: bool = ...,
-    ):
-        ...
+    ): ...
 
     def __init__(
         self,
@@ -94,9 +98,19 @@ class ManagerBot(SteamBot[_I, _M]):
         self._offer_cancel_delay = offer_cancel_delay
         self._trade_url_token: str | None = None
         self._prefetch_games = prefetch_games
+        self._max_active_offers: int | None = None
+        self._max_partner_offers: int | None = None
+        self._warm_restart: bool | None = None
+        self._restarting_warm = False
+        self._hibernating = False
+        self._activation: asyncio.Task | None = None
+        self._last_used = monotonic()
+        self._paused_offers: list[ManagerTradeOffer] = []
 
         self.inventory: GamesInventory["ManagerBot"] = GamesInventory(self)
         self.manager_trades: ManagerBotTrades["ManagerBot"] = ManagerBotTrades(self)
+        self.confirmations: ConfirmationBatcher["ManagerBot"] = ConfirmationBatcher(self)
+        self.partner_views: BotPartnerViews["ManagerBot"] = BotPartnerViews(self)
 
     @property
     def manager(self) -> _M | None:
@@ -125,6 +139,64 @@ class ManagerBot(SteamBot[_I, _M]):
     def offer_cancel_delay(self, value: timedelta | None):
         self._offer_cancel_delay = value
 
+    @property
+    def warm_restart(self) -> bool:
+        """Keep caches on restart and revalidate them with cheap checks instead of fetching again"""
+        if self._warm_restart is not None:
+            return self._warm_restart
+        try:
+            return self.manager.warm_restart
+        except AttributeError:  # if bot don't bound to manager
+            return False
+
+    @warm_restart.setter
+    def warm_restart(self, value: bool | None):
+        self._warm_restart = value
+
+    @property
+    def max_active_offers(self) -> int | None:
+        """Max amount of active sent offers, `None` - unlimited"""
+        if self._max_active_offers is not None:
+            return self._max_active_offers
+        try:
+            return self.manager.max_active_offers
+        except AttributeError:  # if bot don't bound to manager
+            return None
+
+    @max_active_offers.setter
+    def max_active_offers(self, value: int | None):
+        self._max_active_offers = value
+
+    @property
+    def max_partner_offers(self) -> int | None:
+        """Max amount of active sent offers to one partner, `None` - unlimited"""
+        if self._max_partner_offers is not None:
+            return self._max_partner_offers
+        try:
+            return self.manager.max_partner_offers
+        except AttributeError:  # if bot don't bound to manager
+            return None
+
+    @max_partner_offers.setter
+    def max_partner_offers(self, value: int | None):
+        self._max_partner_offers = value
+
+    def has_offer_headroom(self, partner_id64: int | None = None) -> bool:
+        """
+        Check if bot can send one more offer (to partner) without exceeding active offers limits.
+        Offers that are being sent are counted too
+        """
+        trades = self.manager_trades
+        if self.max_active_offers is not None and len(trades) + trades.reserved() >= self.max_active_offers:
+            return False
+        if (
+            partner_id64 is not None
+            and self.max_partner_offers is not None
+            and trades.partner_offers(partner_id64) + trades.reserved(partner_id64) >= self.max_partner_offers
+        ):
+            return False
+        return True
+
     @property
     def trade_url(self) -> str | None:
         if self._trade_url_token:
@@ -143,7 +215,7 @@ class ManagerBot(SteamBot[_I, _M]):
         """Similar to `.inventory.items`"""
         return self.inventory.items
 
-    @ready_required
+    @available_required
     def create_offer(
         self,
         partner: steam.User,
@@ -161,15 +233,16 @@ class ManagerBot(SteamBot[_I, _M]):
         :param receive_items: list of items/assets to receive from `partner`
         :return: `ManagerTradeOffer` model
         """
+        self._touch()
         return ManagerTradeOffer(
             _steam_offer=steam.TradeOffer(
                 message=message, token=token, items_to_send=send_items, items_to_receive=receive_items
             ),
             owner=self,
-            partner=copy_user(self, partner) if partner.id64 not in self._connection._users else partner,
+            partner=self._connection.get_user(partner.id64) or self.partner_views.bind(partner),
         )
 
-    @ready_required
+    @available_required
     async def create_offer_from_trade_url(
         self,
         trade_url: str,
@@ -187,7 +260,10 @@ class ManagerBot(SteamBot[_I, _M]):
         :return: `ManagerTradeOffer` model
         """
         partner_id32, token = parse_trade_url(trade_url)
-        partner = self.get_user(partner_id32) or await self.fetch_user(partner_id32)
+        if self.manager:
+            partner = await self._call_in_pool(self.manager.partners.fetch(partner_id32, self))
+        else:
+            partner = self.get_user(partner_id32) or await self.fetch_user(partner_id32)
 
         return self.create_offer(partner, token, message, send_items, receive_items)
 
@@ -213,9 +289,31 @@ class ManagerBot(SteamBot[_I, _M]):
 
     @ready_required
     async def send_offer(self, offer: ManagerTradeOffer) -> None:
+        """
+        Send offer created by this bot.
+        :raises ValueError if offer created by other bot
+                OffersLimitExceeded - if bot has reached active offers limits
+        """
+        if self._loop_thread is not None and not self._loop_thread.is_current():
+            return await self.call_threadsafe(self.send_offer(offer))  # offers and storage belong to bot loop
+
         if offer.owner is self:
-            await offer.partner.send(trade=offer._steam_offer)
-            self.manager_trades.add(offer)
+            partner_id64 = offer.partner.id64
+            if not self.has_offer_headroom(partner_id64):
+                raise OffersLimitExceeded(f"Bot {self} has reached active offers limit")
+            self._touch()
+
+            self.manager_trades.reserve(partner_id64)  # concurrent sends see this offer in limits
+            try:
+                started = monotonic()
+                await offer.partner.send(trade=offer._steam_offer)
+                self._observe("send_seconds", started)
+                if (metrics := self.metrics) is not None:
+                    metrics.offers_sent.inc(self.id)
+                self.manager_trades.add(offer)
+            finally:
+                self.manager_trades.release(partner_id64)
+            self._update_load()
             if offer.cancel_delay is not None:
                 offer._set_cancel_timeout()
 
@@ -238,15 +336,81 @@ class ManagerBot(SteamBot[_I, _M]):
                     await self.inventory.fetch_game_inventory(item.game)
                     fetched.add(item.game.name or item.game.id)
 
+    @property
+    def lazy(self) -> bool:
+        """Bot is started on demand and hibernated when idle"""
+        try:
+            return self.manager.lazy
+        except AttributeError:  # if bot don't bound to manager
+            return False
+
+    @property
+    def idle_time(self) -> float:
+        """Seconds since bot was used last time"""
+        return monotonic() - self._last_used
+
+    def _touch(self) -> None:
+        self._last_used = monotonic()
+
+    def is_available(self) -> bool:
+        """Bot is ready or can be activated on demand"""
+        return self.is_ready() or (
+            self.lazy and self.state in (BotState.Stopped, BotState.Hibernated, BotState.Waiting)
+        )
+
+    def wake(self) -> asyncio.Task | None:
+        """Schedule start of lazy bot if it is not running. Concurrent calls share one start"""
+        self._touch()
+        if self.is_ready() or not self.lazy:
+            return None
+        if self._activation is None and self.state is not BotState.Waiting:
+            if self.state is BotState.Hibernated:
+                self._restarting_warm = True  # revalidate kept caches instead of fetching them
+            self._activation = self.loop.create_task(self.start(), name=f"{self.id} activation task")
+            self._activation.add_done_callback(lambda _: setattr(self, "_activation", None))
+        return self._activation
+
+    async def activate(self, timeout: float = 60) -> None:
+        """
+        Start lazy bot and wait until it is ready.
+        :raises ReadyRequired if bot is not lazy and not ready or bot hasn't become ready within `timeout`
+        """
+        self.wake()
+        if not self.is_available() and self.state is not BotState.Waiting:
+            raise ReadyRequired(f"Bot {self.id} is not ready and can't be activated")
+        try:
+            await asyncio.wait_for(self.wait_until_ready(), timeout)
+        except asyncio.TimeoutError:
+            raise ReadyRequired(f"Bot {self.id} hasn't become ready") from None
+
+    async def hibernate(self) -> None:
+        """Stop idle bot keeping its caches, lazy bot will be started again on demand"""
+        if self._hibernating or not self.is_ready():  # already hibernating or stopped
+            return
+        if self._refresh_task:
+            self._refresh_task.cancel()
+        self._hibernating = True
+        await self.stop()
+        _log.info(f"Bot {self.id} hibernated")
+
+    def _set_state(self, state: BotState) -> None:
+        if state is BotState.Stopped and self._hibernating:
+            self._hibernating = False
+            state = BotState.Hibernated
+        super()._set_state(state)
+
     def _close_trade_offer(self, trade: steam.TradeOffer):
         if trade.is_our_offer():  # there safe to call is_our_offer
             if trade.id in self.manager_trades:
                 manager_trade_offer = self.manager_trades.pop(trade.id)  # remove manager trade offer from trades
+                self._update_load()
                 manager_trade_offer._steam_offer = trade  # ensure that offer instance is updated
                 if manager_trade_offer._cancel_delay_timer:
                     manager_trade_offer._cancel_delay_timer.cancel()
 
-                # manager_trade_offer.state_event.set()
+                manager_trade_offer._set_closed()
+                if (metrics := self.metrics) is not None:
+                    metrics.offers_closed.inc(self.id, trade.state.name)
 
                 self.dispatch_to_manager("close_trade_offer", manager_trade_offer)
             else:
@@ -265,15 +429,59 @@ class ManagerBot(SteamBot[_I, _M]):
     async def on_trade_expire(self, trade: steam.TradeOffer):
         self._close_trade_offer(trade)
 
+    async def restart(self, *, warm: bool | None = None) -> None:
+        """
+        Stop and then start bot.
+        :param warm: keep inventories and revalidate them after start instead of fetching. Defaults to `warm_restart`
+        """
+        self._restarting_warm = self.warm_restart if warm is None else warm
+        await super().restart()
+
+    def stop(self):
+        # cancel deadlines are kept while bot is offline and timers are resumed on ready
+        for offer in self.manager_trades:
+            if offer._cancel_delay_timer and not offer._cancel_delay_timer.done():
+                offer._pause_cancel_timeout()
+                self._paused_offers.append(offer)
+
+        return super().stop()
+
     async def on_ready(self) -> None:
         await super().on_ready()
 
+        warm, self._restarting_warm = self._restarting_warm, False
         if not self._trade_url_token:
             trade_url = await super().trade_url()
             _, self._trade_url_token = parse_trade_url(trade_url)
+            self._save_session()
 
-        for game in self.prefetch_games:
-            await self.inventory.fetch_game_inventory(game)  # fetch inventories
+        paused, self._paused_offers = self._paused_offers, []
+        for offer in paused:
+            if offer.is_active:  # offers closed while bot was offline are dispatched by trades polling
+                offer._set_cancel_timeout()
+
+        if warm:
+            games = {inv.game.id: inv.game for inv in self.inventory.game_inventories}
+            games |= {game.id: game for game in self.prefetch_games}
+            for game in games.values():
+                await self.inventory.revalidate(game)
+        else:
+            for game in self.prefetch_games:
+                await self.inventory.fetch_game_inventory(game)  # fetch inventories
+
+    def _session_data(self) -> SessionData:
+        data = super()._session_data()
+        data.trade_url_token = self._trade_url_token
+        return data
+
+    def _restore_session(self, data: SessionData) -> None:
+        super()._restore_session(data)
+        self._trade_url_token = self._trade_url_token or data.trade_url_token
+
+    def _update_load(self) -> None:
+        """Report load change (active offers, inventory size) to manager bot selector"""
+        if self.manager:
+            self.manager._threadsafe(self.manager.selector.update, self)
 
     def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
         super().dispatch(event, *args, **kwargs)
@@ -283,7 +491,7 @@ class ManagerBot(SteamBot[_I, _M]):
         """Dispatch event to manager."""
         if self.manager:
             try:
-                self.manager.dispatch(self, event, *args, **kwargs)
+                self.manager._threadsafe(partial(self.manager.dispatch, self, event, *args, **kwargs))
             except AttributeError:
                 pass
 
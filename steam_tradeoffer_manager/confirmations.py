@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Generic, TypeVar
+
+from steam import TradeOffer, ConfirmationError
+from steam.guard import Confirmation
+from steam.models import URL
+
+__all__ = ("ConfirmationBatcher",)
+
+_log = logging.getLogger(__name__)
+_B = TypeVar("_B", bound="bot.ManagerBot")
+
+
+class ConfirmationBatcher(Generic[_B]):
+    """
+    Collects trade offers waiting for mobile confirmation, fetches confirmations list once
+    and confirms all of them with one request. Every caller gets own result.
+    If bulk confirmation fails, offers confirmed one by one.
+    Idle batcher confirms offers right away, offers that come while batch is being confirmed
+    are collected and confirmed together when it is done, so concurrent sends share requests
+    and single sends don't wait.
+    :param owner: bot
+    :param window: extra seconds to collect offers before confirming when batcher is idle
+    :param max_size: max offers in one batch
+    """
+
+    def __init__(self, owner: _B, window: float = 0.0, max_size: int = 50):
+        self.owner = owner
+        self.window = window
+        self.max_size = max_size
+
+        self.batches = 0  # amount of confirmation list fetches
+        self.confirmed = 0
+        self.largest = 0  # most offers in one batch
+
+        self._pending: dict[int, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | asyncio.Handle | None = None
+        self._in_flight = 0
+
+    def confirm(self, trade: TradeOffer) -> "asyncio.Future[None]":
+        """
+        Add sent trade offer to current batch.
+        :return: future resolved when offer is confirmed
+        :raises ConfirmationError through future if confirmation can't be found or confirmed
+        """
+        if (future := self._pending.get(trade.id)) is not None:
+            return future
+
+        loop: asyncio.AbstractEventLoop = self.owner.loop
+        future = self._pending[trade.id] = loop.create_future()
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._timer is None and not self._in_flight:
+            # offers confirmed in the same loop iteration still join this batch
+            self._timer = loop.call_later(self.window, self.flush) if self.window else loop.call_soon(self.flush)
+
+        return future
+
+    def flush(self) -> None:
+        """Start confirming collected offers without waiting"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if batch:
+            self._in_flight += 1
+            self.owner.loop.create_task(self._run_batch(batch), name=f"{self.owner} confirmations task")
+
+    async def _run_batch(self, batch: dict[int, asyncio.Future]) -> None:
+        try:
+            await self._confirm_batch(batch)
+        finally:
+            self._in_flight -= 1
+            if self._pending and not self._in_flight:  # offers collected meanwhile
+                self.flush()
+
+    async def _confirm_batch(self, batch: dict[int, asyncio.Future]) -> None:
+        if not self.owner.identity_secret:
+            return self._fail(batch, ConfirmationError("Bot has no identity secret"))
+
+        state = self.owner._connection
+        self.batches += 1
+        self.largest = max(self.largest, len(batch))
+        started = monotonic()
+        try:
+            confirmations = await state._fetch_confirmations()
+        except Exception as e:
+            return self._fail(batch, e)
+
+        found: dict[int, Confirmation] = {}
+        for trade_id, future in batch.items():
+            if (confirmation := confirmations.get(trade_id)) is None:
+                self._fail({trade_id: future}, ConfirmationError("No matching confirmation could be found"))
+            else:
+                found[trade_id] = confirmation
+
+        if not found:
+            return
+
+        try:
+            await self._multi_confirm(list(found.values()))
+            self.owner._observe("confirm_seconds", started)
+        except Exception as e:
+            _log.debug(f"Bulk confirmation of {len(found)} offers failed for {self.owner}: {e!r}")
+            for trade_id, confirmation in found.items():
+                try:
+                    await confirmation.confirm()
+                except Exception as e:
+                    self._fail({trade_id: batch[trade_id]}, e)
+                else:
+                    self._resolve(trade_id, batch[trade_id])
+        else:
+            for trade_id in found:
+                self._resolve(trade_id, batch[trade_id])
+
+    async def _multi_confirm(self, confirmations: list[Confirmation]) -> None:
+        params = confirmations[0]._confirm_params("allow")
+        data = [("op", "allow"), *((k, str(v)) for k, v in params.items())]
+        data += [("cid[]", str(c.data_conf_id)) for c in confirmations]
+        data += [("ck[]", str(c.data_key)) for c in confirmations]
+
+        resp = await self.owner._connection.http.post(URL.COMMUNITY / "mobileconf/multiajaxop", data=data)
+        if not isinstance(resp, dict) or not resp.get("success", False):
+            raise ConfirmationError("Bulk confirmation failed")
+
+    def _resolve(self, trade_id: int, future: asyncio.Future) -> None:
+        self.owner._connection._confirmations.pop(trade_id, None)
+        self.confirmed += 1
+        if not future.done():
+            future.set_result(None)
+
+    @staticmethod
+    def _fail(batch: dict[int, asyncio.Future], error: Exception) -> None:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} owner={self.owner!r} pending={len(self)}>"
+
+
+from . import bot
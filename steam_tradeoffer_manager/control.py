@@ -0,0 +1,377 @@
+import asyncio
+import hmac
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Generic, TypeVar, Iterable, Mapping
+
+from aiohttp import web
+from steam import TradeOfferState
+
+from .bot import ManagerBot
+from .item import BotItem
+from .manager import TradeOfferManager
+from .offer import ManagerTradeOffer
+from .outgoing import OfferPriority
+from .sending import SendResult
+from .sharding import ItemRef, OfferInfo, _to_wire
+from .utils import parse_trade_url
+
+__all__ = ("ControlServer",)
+
+_log = logging.getLogger(__name__)
+_M = TypeVar("_M", bound=TradeOfferManager)
+_B = TypeVar("_B", bound=ManagerBot)
+
+
+def _jsonable(value: Any) -> Any:
+    value = _to_wire(value)
+    if isinstance(value, OfferInfo):
+        return asdict(value)
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, tuple):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {k.name if isinstance(k, Enum) else str(k): _jsonable(v) for k, v in value.items()}
+    return value
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=json.dumps({"error": message}), content_type="application/json")
+
+
+def _int(value: Any, name: str) -> int:
+    """Integer from json number or string, 64-bit ids are often sent as strings"""
+    if not isinstance(value, bool) and isinstance(value, (int, str)):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    raise _bad_request(f"{name} must be an integer")
+
+
+def _ids(query: Mapping[str, str], name: str) -> list[int]:
+    """Comma separated ids of query parameter"""
+    return [_int(part, name) for part in query.get(name, "").split(",") if part]
+
+
+def _list(data: Mapping[str, Any], name: str) -> list:
+    if not isinstance(value := data.get(name, []), list):
+        raise _bad_request(f"{name} must be a list")
+    return value
+
+
+def _item(item: BotItem) -> dict[str, Any]:
+    return {
+        "asset_id": item.asset_id,
+        "bot_id": item.owner.id,
+        "app_id": item.game.id,
+        "context_id": item.game.context_id,
+        "class_id": item.class_id,
+        "instance_id": item.instance_id,
+        "amount": item.amount,
+        "name": item.name,
+    }
+
+
+def _result(result: SendResult | BaseException) -> dict[str, Any]:
+    if isinstance(result, BaseException):
+        return {"ok": False, "error": repr(result)}
+    return {
+        "ok": result.ok,
+        "error": repr(result.error) if result.error is not None else None,
+        "attempts": result.attempts,
+        "offer": _jsonable(result.offer),
+    }
+
+
+class ControlServer(Generic[_M, _B]):
+    """
+    Local HTTP/JSON control API of manager, runs on manager loop.
+    Every request is one batch operation of manager, e.g. offers of `POST /offers`
+    share partner lookups and are sent through manager queue within its rate limits.
+
+    - `GET /bots` - health of bots and state counts
+    - `POST /offers` - create and queue offers: `{"offers": [{"trade_url", "message", "send_items": [asset id],
+      "receive_items": [{"app_id", "asset_id", "context_id", "amount"}]}], "priority": "Normal",
+      "deadline": seconds, "wait": true}`. Without `wait` response is returned when offers are queued
+    - `GET /trades?partner=id64,...&state=Active,...&bot=id,...` - manager offers
+    - `GET /inventory?asset_id=id,...` or `?bot=id` - bots items
+    - `GET /events?events=ready,...` - server-sent events stream of manager events
+    - `GET /metrics` - manager metrics in Prometheus text format, if manager collects them
+
+    Malformed requests get 400 with json error. Offers of batch that can't be created
+    (unknown items, invalid trade url, etc.) are failed results of `POST /offers`.
+
+    :param manager: served manager
+    :param host: interface to listen, default is local only
+    :param port: port to listen
+    :param token: bearer token required in `Authorization` header, `None` - no auth
+    :param queue_size: max buffered events per stream, oldest events are dropped for slow clients
+    """
+
+    def __init__(
+        self,
+        manager: _M,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        *,
+        token: str | None = None,
+        queue_size: int = 1000,
+    ):
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self.token = token
+        self.queue_size = queue_size
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes(
+            [
+                web.get("/bots", self.bots),
+                web.post("/offers", self.offers),
+                web.get("/trades", self.trades),
+                web.get("/inventory", self.inventory),
+                web.get("/events", self.events),
+                web.get("/metrics", self.metrics),
+            ]
+        )
+
+        self._runner: web.AppRunner | None = None
+        self._streams: set[asyncio.Queue] = set()
+        self._hooked = False
+        self._dispatch = None  # manager own dispatch attribute replaced by hook
+        self._publisher = None
+
+    async def start(self) -> None:
+        self._hook()
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        _log.info(f"Control server is listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        self._unhook()
+        for queue in self._streams:
+            if queue.full():
+                queue.get_nowait()  # make room for close message
+            queue.put_nowait(None)  # closes stream
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _hook(self) -> None:
+        """Copy manager events to event streams"""
+        if self._hooked:
+            return
+        self._hooked = True
+        self._dispatch = self.manager.__dict__.get("dispatch")
+        dispatch = self.manager.dispatch
+
+        def publish(bot: _B, event: str, *args, **kwargs) -> None:
+            dispatch(bot, event, *args, **kwargs)
+            if self._hooked and self._streams:
+                self._publish(bot, event, args)
+
+        self.manager.dispatch = self._publisher = publish
+
+    def _unhook(self) -> None:
+        """Restore manager dispatch, hook only passes events through if dispatch was wrapped by others since"""
+        if not self._hooked:
+            return
+        self._hooked = False
+        if self.manager.__dict__.get("dispatch") is self._publisher:
+            if self._dispatch is None:
+                del self.manager.dispatch
+            else:
+                self.manager.dispatch = self._dispatch
+        self._dispatch = self._publisher = None
+
+    def _bot(self, bot_id: int) -> _B:
+        try:
+            return self.manager[bot_id]
+        except KeyError:
+            raise web.HTTPNotFound(
+                text=json.dumps({"error": f"Unknown bot {bot_id}"}), content_type="application/json"
+            ) from None
+
+    def _publish(self, bot: _B, event: str, args: tuple) -> None:
+        message = (event, json.dumps({"bot_id": bot.id, "args": _jsonable(args)}))
+        for queue in self._streams:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        if self.token is not None:
+            if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {self.token}"):
+                return web.json_response({"error": "Unauthorized"}, status=401)
+        return await handler(request)  # handlers validate input, other errors are server errors
+
+    async def bots(self, _: web.Request) -> web.Response:
+        bots = [
+            {
+                "id": bot.id,
+                "state": bot.state.name,
+                "state_since": bot.state_since.isoformat(),
+                "uptime": bot.uptime,
+                "ready": bot.is_ready(),
+                "offers": len(bot.manager_trades),
+                "queued": self.manager.queue.pending(bot),
+                "errors": bot.errors.total,
+            }
+            for bot in self.manager
+        ]
+        return web.json_response({"bots": bots, "states": _jsonable(self.manager.state_counts())})
+
+    async def offers(self, request: web.Request) -> web.Response:
+        try:
+            body = await request.json()
+        except ValueError:
+            raise _bad_request("Body must be json") from None
+        if not isinstance(body, dict) or not isinstance(body.get("offers"), list):
+            raise _bad_request("offers list is required")
+        if (priority := body.get("priority", "Normal")) not in OfferPriority.__members__:
+            raise _bad_request(f"priority must be one of {', '.join(OfferPriority.__members__)}")
+        priority = OfferPriority[priority]
+        if (deadline := body.get("deadline")) is not None:
+            if isinstance(deadline, bool) or not isinstance(deadline, (int, float)) or deadline < 0:
+                raise _bad_request("deadline must be non negative amount of seconds")
+            deadline = timedelta(seconds=deadline)
+        if not isinstance(wait := body.get("wait", True), bool):
+            raise _bad_request("wait must be a boolean")
+
+        parsed = [self._parse_offer(data) for data in body["offers"]]
+        created = await asyncio.gather(*(self._create_offer(*args) for args in parsed), return_exceptions=True)
+        futures = [
+            offer if isinstance(offer, BaseException) else self.manager.queue.put(offer, priority, deadline)
+            for offer in created
+        ]
+        if not wait:  # nobody awaits results, so they are logged
+            for future in futures:
+                if isinstance(future, asyncio.Future):
+                    future.add_done_callback(self._log_queued)
+            queued = [_jsonable(offer) if isinstance(offer, ManagerTradeOffer) else repr(offer) for offer in created]
+            return web.json_response({"queued": queued}, status=202)
+
+        results = await asyncio.gather(
+            *(self._wrap(future) for future in futures), return_exceptions=True  # creation errors are passed through
+        )
+        return web.json_response({"results": [_result(result) for result in results]})
+
+    @staticmethod
+    def _log_queued(future: "asyncio.Future[SendResult]") -> None:
+        if future.cancelled():
+            return
+        if (error := future.exception()) is not None:
+            _log.error("Queued offer has failed", exc_info=error)
+        elif not (result := future.result()).ok:
+            _log.warning(f"Queued offer {result.offer} has failed: {result.error!r}")
+
+    @staticmethod
+    def _parse_offer(data: Any) -> tuple[str, str | None, list[int], list[ItemRef]]:
+        """Validate offer of request body, lookups of items and partner are left to offer creation"""
+        if not isinstance(data, dict) or not isinstance(trade_url := data.get("trade_url"), str):
+            raise _bad_request("Every offer must be an object with trade_url")
+        if not isinstance(message := data.get("message"), (str, type(None))):
+            raise _bad_request("message must be a string")
+
+        send_items = [_int(asset_id, "send_items") for asset_id in _list(data, "send_items")]
+        receive_items = []
+        for ref in _list(data, "receive_items"):
+            if not isinstance(ref, dict) or not {"app_id", "asset_id"} <= ref.keys() <= set(ItemRef._fields):
+                raise _bad_request(f"receive_items must be objects with fields {', '.join(ItemRef._fields)}")
+            receive_items.append(ItemRef(**{name: _int(value, name) for name, value in ref.items()}))
+        return trade_url, message, send_items, receive_items
+
+    @staticmethod
+    async def _wrap(value: asyncio.Future | BaseException) -> SendResult:
+        if isinstance(value, BaseException):
+            raise value
+        return await value
+
+    async def _create_offer(
+        self, trade_url: str, message: str | None, send_items: list[int], receive_items: list[ItemRef]
+    ) -> ManagerTradeOffer[_B]:
+        items = []
+        for asset_id in send_items:
+            if (item := self.manager.items.get(asset_id)) is None:
+                raise ValueError(f"Unknown asset {asset_id}")
+            items.append(item)
+        bot = self.manager._get_owner(items)
+        try:
+            partner_id32, token = parse_trade_url(trade_url)
+        except (KeyError, ValueError):
+            raise ValueError(f"Invalid trade url {trade_url!r}, partner and token are required") from None
+        partner = await self.manager.partners.fetch(partner_id32, bot)  # lookups of batch are fetched together
+
+        receive = [ref.to_asset(partner) for ref in receive_items]
+        return self.manager._create_offer(bot, partner, token, message, items or None, receive or None)
+
+    async def trades(self, request: web.Request) -> web.Response:
+        partners = set(_ids(request.query, "partner"))
+        bots = set(_ids(request.query, "bot"))
+        states = set()
+        for name in filter(None, request.query.get("state", "").split(",")):
+            if name not in TradeOfferState.__members__:
+                raise _bad_request(f"Unknown offer state {name}")
+            states.add(TradeOfferState[name])
+
+        offers = self._filter_offers(self.manager.trades, partners, bots, states)
+        return web.json_response({"trades": [_jsonable(offer) for offer in offers]})
+
+    @staticmethod
+    def _filter_offers(
+        offers: Iterable[ManagerTradeOffer[_B]], partners: set[int], bots: set[int], states: set[TradeOfferState]
+    ) -> Iterable[ManagerTradeOffer[_B]]:
+        for offer in offers:
+            if partners and (offer.partner is None or offer.partner.id64 not in partners):
+                continue
+            if (bots and offer.owner.id not in bots) or (states and offer.state not in states):
+                continue
+            yield offer
+
+    async def inventory(self, request: web.Request) -> web.Response:
+        if asset_ids := _ids(request.query, "asset_id"):
+            items = [item for asset_id in asset_ids if (item := self.manager.items.get(asset_id)) is not None]
+        elif bot_ids := _ids(request.query, "bot"):
+            items = [item for bot_id in bot_ids for item in self._bot(bot_id).inventory.items]
+        else:
+            raise _bad_request("asset_id or bot query parameter is required")
+
+        return web.json_response({"items": [_item(item) for item in items]})
+
+    async def events(self, request: web.Request) -> web.StreamResponse:
+        names = set(request.query.get("events", "").split(",")) - {""}
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(self.queue_size)
+        self._streams.add(queue)
+        try:
+            while (message := await queue.get()) is not None:
+                event, data = message
+                if not names or event in names:
+                    await response.write(f"event: {event}\ndata: {data}\n\n".encode())
+        finally:
+            self._streams.discard(queue)
+
+        return response
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        if (metrics := self.manager.metrics) is None:
+            return web.json_response({"error": "Metrics are not collected"}, status=404)
+        return await metrics.handler(request)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.host}:{self.port} streams={len(self._streams)}>"
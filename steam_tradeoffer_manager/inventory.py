@@ -1,7 +1,11 @@
+import asyncio
+from time import monotonic
 from typing import Iterator, TypeVar, Generic, TypeAlias
 from collections.abc import MutableMapping
 from weakref import WeakValueDictionary
 
+from steam.http import INVENTORY_LOCKS
+from steam.models import URL
 from steam.trade import Game, StatefulGame, BaseInventory
 
 from .item import BotItem
@@ -28,11 +32,44 @@ class GamesInventory(MutableMapping[AssetId, BotItem[_B]], Generic[_B]):
     async def update_all(self) -> None:
         """Update all saved inventories"""
         for inv in self._inventories_storage.values():
-            await inv.update()
-            inv.items = tuple(map(lambda i: BotItem(i, self.owner), inv.items))
-            self._items_storage.update({bot_item.asset_id: bot_item for bot_item in inv.items})
+            await self._update_inventory(inv)
 
-            self.owner.dispatch_to_manager("inventory_update", inv)
+    async def _update_inventory(self, inv: BotInventory) -> None:
+        started = monotonic()
+        await inv.update()
+        self.owner._observe("inventory_fetch_seconds", started)
+        inv.items = tuple(map(lambda i: BotItem(i, self.owner), inv.items))
+        self._items_storage.update({bot_item.asset_id: bot_item for bot_item in inv.items})
+
+        self.owner._update_load()
+        self.owner.dispatch_to_manager("inventory_update", inv)
+
+    async def _fetch_head(self, game: SteamGame) -> tuple[int, int | None]:
+        """Total items count and newest asset id of game inventory, requested with one item page"""
+        id64 = self.owner.user.id64
+        lock = INVENTORY_LOCKS.setdefault(id64, asyncio.Lock())  # the endpoint requires per user lock
+        async with lock:
+            data = await self.owner.http.get(
+                URL.COMMUNITY / f"inventory/{id64}/{game.id}/{game.context_id}", params={"count": 1}
+            )
+        assets = data.get("assets") or ()
+        return data.get("total_inventory_count", 0), int(assets[0]["assetid"]) if assets else None
+
+    async def revalidate(self, game: SteamGame) -> bool:
+        """
+        Check that cached inventory is up-to-date by its size and newest item (steam lists newest items first),
+        fetch it only if it has changed or not cached.
+        :return: `True` if inventory was fetched
+        """
+        if (inv := self.get_game_inventory(game)) is None:
+            await self.fetch_game_inventory(game)
+            return True
+
+        if await self._fetch_head(game) == (len(inv.items), inv.items[0].asset_id if inv.items else None):
+            return False
+
+        await self._update_inventory(inv)
+        return True
 
     @property
     def items(self) -> list[BotItem[_B]]:
@@ -60,11 +97,14 @@ class GamesInventory(MutableMapping[AssetId, BotItem[_B]], Generic[_B]):
 
     async def fetch_game_inventory(self, game: SteamGame) -> BotInventory:
         """Fetch inventory from steam servers and cache it."""
+        started = monotonic()
         inv: BaseInventory = await self.owner.user.inventory(game)  # again type hinting :(
+        self.owner._observe("inventory_fetch_seconds", started)
         inv.items = tuple(map(lambda i: BotItem(i, self.owner), inv.items))
         self._inventories_storage[game.id] = inv
         self._items_storage.update({bot_item.asset_id: bot_item for bot_item in inv.items})
 
+        self.owner._update_load()
         self.owner.dispatch_to_manager("inventory_update", inv)
 
         return inv
@@ -29,7 +29,7 @@ class ManagerItems(MutableMapping[AssetId, BotItem[_B]], Generic[_M, _B]):
         return self._storage.get(k, _default)
 
     def __setitem__(self, k: AssetId, v: BotItem) -> None:
-        if k == v.asset_id:
+        if k != v.asset_id:
             raise ValueError("Key and asset id must be the same")
         self._storage[k] = v
 
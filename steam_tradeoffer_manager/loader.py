@@ -0,0 +1,233 @@
+import asyncio
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Generic, TypeVar, Iterator, Iterable, Literal, TypeAlias
+
+from steam import Game, Type
+from steam.utils import make_id64
+
+from .base import ConstraintsMixin
+from .bot import ManagerBot
+
+__all__ = ("BotLoader", "LoadReport", "AccountError")
+
+_log = logging.getLogger(__name__)
+_B = TypeVar("_B", bound=ManagerBot)
+_M = TypeVar("_M", bound="manager.TradeOfferManager")
+Format: TypeAlias = Literal["jsonl", "csv", "toml"]
+Record: TypeAlias = "dict[str, Any]"
+
+REQUIRED_FIELDS = ("username", "password", "shared_secret", "identity_secret", "id")  # bot is recreated on change
+
+
+class AccountError(ValueError):
+    """Invalid account record"""
+
+
+@dataclass
+class LoadReport:
+    added: list[int] = field(default_factory=list)  # bot ids
+    updated: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    unchanged: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)  # record number and message
+
+
+def _parse_games(value: Any) -> tuple[Game, ...]:
+    """Games from `[730, [440, 2]]` list or `"730;440:2"` string, context id defaults to 2"""
+    if value in (None, ""):
+        return ()
+    if isinstance(value, str):
+        value = [[int(part) for part in game.split(":")] for game in value.split(";") if game]
+
+    games = []
+    for game in value:
+        app_id, context_id = (game, 2) if isinstance(game, int) else (int(game[0]), int(game[1]) if game[1:] else 2)
+        games.append(Game(id=app_id, context_id=context_id))
+    return tuple(games)
+
+
+class BotLoader(Generic[_M, _B]):
+    """
+    Loads manager bots from account files: JSON Lines, CSV (with header) or TOML (`[[accounts]]` tables).
+    JSON Lines and CSV files are streamed record by record, TOML files are parsed whole.
+    Required fields are `username`, `password`, `shared_secret`, `identity_secret` and `id` (steam id64).
+    Optional per account overrides: `proxy`, `prefetch_games`, `offer_cancel_delay` (seconds), `domain`, `user_agent`.
+    Invalid and duplicated records are skipped and reported.
+    :param manager: manager to add bots to
+    :param bot_class: class of created bots
+    """
+
+    def __init__(self, manager: _M, bot_class: type[_B] = ManagerBot):
+        self.manager = manager
+        self.bot_class = bot_class
+
+        self._loaded: dict[str, tuple[Record, _B]] = {}  # username to (account record, bot)
+
+    @staticmethod
+    def read(path: str | Path, format: Format | None = None) -> Iterator[Record]:
+        """Iterate over raw account records of file, format is detected by extension if not passed"""
+        path = Path(path)
+        format = format or {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".toml": "toml"}.get(path.suffix)
+        if format == "jsonl":
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        elif format == "csv":
+            with path.open(encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    yield {k: v for k, v in row.items() if v != ""}
+        elif format == "toml":
+            try:
+                import tomllib
+            except ImportError:  # python < 3.11
+                import tomli as tomllib
+
+            with path.open("rb") as f:
+                yield from tomllib.load(f).get("accounts", ())
+        else:
+            raise ValueError(f"Unknown accounts file format of {path}")
+
+    @staticmethod
+    def validate(record: Record) -> Record:
+        """
+        Check and normalize account record to bot init kwargs
+        :raises AccountError
+        """
+        if missing := [name for name in REQUIRED_FIELDS if not record.get(name)]:
+            raise AccountError(f"Missing fields: {', '.join(missing)}")
+
+        kwargs = {name: str(record[name]) for name in REQUIRED_FIELDS if name != "id"}
+        try:
+            kwargs["id"] = make_id64(int(record["id"]), type=Type.Individual)
+            if games := _parse_games(record.get("prefetch_games")):
+                kwargs["prefetch_games"] = games
+            if (delay := record.get("offer_cancel_delay")) not in (None, ""):
+                kwargs["offer_cancel_delay"] = timedelta(seconds=float(delay))
+        except (ValueError, TypeError, IndexError) as e:
+            raise AccountError(str(e)) from None
+
+        for name in ("proxy", "domain", "user_agent"):
+            if record.get(name):
+                kwargs[name] = str(record[name])
+
+        return kwargs
+
+    def _is_taken(self, kwargs: Record) -> bool:
+        """Check that account violates constraints of already created bots without creating new one"""
+        storage = ConstraintsMixin.__storage__.get(self.bot_class.dimension, ())
+        return any(h in storage for h in self.bot_class._constraints_binder((), kwargs))
+
+    def _records(self, records: Iterable[Record], report: LoadReport) -> Iterator[tuple[int, Record]]:
+        seen: set[str] = set()
+        for number, record in enumerate(records, 1):
+            try:
+                kwargs = self.validate(record)
+            except AccountError as e:
+                report.errors.append((number, str(e)))
+                continue
+
+            if kwargs["username"] in seen:
+                report.errors.append((number, f"Duplicated account {kwargs['username']}"))
+                continue
+            seen.add(kwargs["username"])
+            yield number, kwargs
+
+    def load(self, path: str | Path, format: Format | None = None) -> LoadReport:
+        """Add bots of accounts file to manager"""
+        report = LoadReport()
+        for number, kwargs in self._records(self.read(path, format), report):
+            if kwargs["username"] in self._loaded:
+                report.unchanged += 1
+            elif (bot := self._add(number, kwargs, report)) is not None:
+                report.added.append(bot.id)
+        return report
+
+    async def reload(self, path: str | Path, format: Format | None = None, *, start: bool = False) -> LoadReport:
+        """
+        Sync manager bots with accounts file: add new accounts, remove missing and update changed ones.
+        Changed overrides are applied in place (proxy is used from next login),
+        bots with changed credentials are recreated.
+        :param start: start added and recreated bots
+        """
+        report = LoadReport()
+        present: set[str] = set()
+        new: list[_B] = []
+        for number, kwargs in self._records(self.read(path, format), report):
+            username = kwargs["username"]
+            present.add(username)
+            if (entry := self._loaded.get(username)) is None:
+                if (bot := self._add(number, kwargs, report)) is not None:
+                    new.append(bot)
+                    report.added.append(bot.id)
+                continue
+
+            old, bot = entry
+            if old == kwargs:
+                report.unchanged += 1
+            elif all(old[name] == kwargs[name] for name in REQUIRED_FIELDS):
+                self._apply_overrides(bot, kwargs)
+                self._loaded[username] = (kwargs, bot)
+                report.updated.append(bot.id)
+            else:
+                await self._remove(username)
+                if (bot := self._add(number, kwargs, report)) is not None:
+                    new.append(bot)
+                    report.updated.append(bot.id)
+
+        for username in self._loaded.keys() - present:
+            report.removed.append(await self._remove(username))
+
+        if start and new:
+            await self._start(new)
+        return report
+
+    def _add(self, number: int, kwargs: Record, report: LoadReport) -> _B | None:
+        if kwargs["id"] in self.manager or self._is_taken(kwargs):
+            report.errors.append((number, f"Bot for account {kwargs['username']} already exists"))
+            return None
+
+        bot = self.bot_class(**kwargs)
+        self.manager.add(bot)
+        self._loaded[kwargs["username"]] = (kwargs, bot)
+        return bot
+
+    async def _remove(self, username: str) -> int:
+        _, bot = self._loaded.pop(username)
+        if not bot.is_closed():
+            await bot.call_threadsafe(bot.stop())
+        if bot.pool is self.manager:
+            self.manager.remove(bot)
+        bot._release_constraints()
+        return bot.id
+
+    @staticmethod
+    def _apply_overrides(bot: _B, kwargs: Record) -> None:
+        bot.prefetch_games = kwargs.get("prefetch_games", ())
+        bot.offer_cancel_delay = kwargs.get("offer_cancel_delay")
+        bot.domain = kwargs.get("domain")
+        if (user_agent := kwargs.get("user_agent")) is not None:
+            bot.http.user_agent = user_agent
+        bot.http.proxy = kwargs.get("proxy")
+        bot._own_proxy = bot.http.proxy is not None
+
+    async def _start(self, bots: list[_B]) -> None:
+        tasks = [self.manager._bot_task(bot, bot.start(), "start") for bot in bots]
+        await asyncio.wait(tasks)
+
+    def __len__(self) -> int:
+        return len(self._loaded)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._loaded
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} loaded={len(self)}>"
+
+
+from . import manager
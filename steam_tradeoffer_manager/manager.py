@@ -1,16 +1,23 @@
+import asyncio
 import logging
-from typing import TypeVar
+import random
+from typing import TypeVar, Iterable, Callable
 from datetime import timedelta
 
 from steam import Item, User, Game
 
-from .base import SteamBotPool, ONCE_EVERY
+from .base import SteamBotPool, ONCE_EVERY, TokenBucket, ReadyRequired, BotState, ErrorLog, ErrorStats
 from .mixins import ManagerDispatchMixin
 from .offer import ManagerTradeOffer
 from .trades import ManagerTrades
 from .inventory import BotInventory
 from .item import BotItem
 from .items import ManagerItems
+from .sending import SendResult, SendStats, is_transient_error
+from .outgoing import OfferQueue
+from .selection import BotSelector, LeastActiveOffers
+from .partners import PartnerCache
+from .metrics import ManagerMetrics
 from .utils import parse_trade_url, join_multiple_in_string
 
 __all__ = ("TradeOfferManager",)
@@ -26,11 +33,53 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
     randomizer = ONCE_EVERY.SIX_HOURS
     offer_cancel_delay: timedelta | None = timedelta(minutes=5)
     prefetch_games: tuple[Game] = ()
+    # keep bots inventories on restart and revalidate them instead of downloading again
+    warm_restart: bool = False
+
+    # `send_offers` rate limits: offers per second and burst size, `None` rate means unlimited
+    bot_send_rate: float | None = 0.5
+    bot_send_burst: int = 5
+    send_rate: float | None = None
+    send_burst: int = 20
+    send_retries: int = 3
+    send_retry_delay: float = 1.0
+    # offers of one bot sent at once, their mobile confirmations are batched
+    bot_send_concurrency: int = 4
+
+    # steam limits of active sent offers per account and per partner, `None` - unlimited
+    max_active_offers: int | None = 30
+    max_partner_offers: int | None = 5
+
+    partner_cache_ttl: timedelta = timedelta(minutes=30)
+    partner_cache_size: int = 10000
+
+    # factory of strategy that selects bot for offers without items to send
+    bot_selector: Callable[[], BotSelector] = LeastActiveOffers
+
+    # don't start bots on startup, but when they are needed, and stop bots without active offers after idle period
+    lazy: bool = False
+    hibernate_after: timedelta | None = timedelta(minutes=30)
+
+    metrics_class: Callable[["TradeOfferManager"], ManagerMetrics] = ManagerMetrics
 
     def __init__(self):
         super().__init__()
         self.trades: ManagerTrades["TradeOfferManager"] = ManagerTrades(self)
         self.items: ManagerItems["TradeOfferManager", _B] = ManagerItems(self)
+        self.send_stats = SendStats()
+        self.queue: OfferQueue["TradeOfferManager", _B] = OfferQueue(self)
+        self.selector: BotSelector[_B] = self.bot_selector()
+        self.partners: PartnerCache["TradeOfferManager", _B] = PartnerCache(
+            self, self.partner_cache_ttl, self.partner_cache_size
+        )
+
+        self._send_buckets: dict[_I, TokenBucket] = {}
+        self._send_bucket: TokenBucket | None = None
+        self._hibernator: asyncio.Task | None = None
+
+    def error_summary(self) -> dict[tuple[str, str], ErrorStats]:
+        """Errors of all bots and manager event handlers counted by `(exception type name, event)`"""
+        return ErrorLog.summary([self.errors, *(bot.errors for bot in self)])
 
     def get_offer(self, id: int) -> ManagerTradeOffer[_B] | None:
         """
@@ -39,6 +88,77 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
         """
         return self.trades.get(id)
 
+    def set_selector(self, selector: BotSelector[_B]) -> None:
+        """Replace bot selection strategy and index all bots in it"""
+        for bot in self:
+            selector.update(bot)
+        self.selector = selector
+
+    def select_bot(self) -> _B:
+        """
+        Select ready bot with `selector` strategy.
+        Used for offers that don't send items, like deposits.
+        :raises ReadyRequired if there is no ready bot
+        """
+        if (bot := self.selector.select()) is None and self.lazy:
+            bot = self.selector.select(lambda b: b.is_available())  # will be activated on send
+        if bot is None:
+            raise ReadyRequired("There is no ready bot in manager")
+        return bot
+
+    def reroute_offer(self, offer: ManagerTradeOffer[_B]) -> ManagerTradeOffer[_B] | None:
+        """
+        Move not sent offer to other ready bot that has active offers headroom.
+        Offer object stays the same, so its waiters and queue futures are kept.
+        Only offers without items to send can be rerouted.
+        :return: passed offer owned by new bot or `None` if offer can't be rerouted
+        """
+        if offer.items_to_send:
+            return None
+
+        partner_id64 = offer.partner.id64
+        bot = self.selector.select(lambda b: b.is_ready() and b.has_offer_headroom(partner_id64))
+        if bot is None:
+            return None
+
+        moved = bot.create_offer(
+            partner=offer.partner, token=offer.token, message=offer.message, receive_items=offer.items_to_receive
+        )
+        _log.debug(f"Offer rerouted from {offer.owner} to {bot}")
+        offer._steam_offer, offer.owner, offer.partner = moved._steam_offer, bot, moved.partner
+
+        return offer
+
+    def _route(self, offer: ManagerTradeOffer[_B]) -> None:
+        if not offer.owner.has_offer_headroom(offer.partner.id64):
+            self.reroute_offer(offer)  # owner will refuse to send it if offer can't be rerouted
+
+    async def send_offer(self, offer: ManagerTradeOffer[_B]) -> ManagerTradeOffer[_B]:
+        """
+        Send offer. If offer owner has reached active offers limits and offer can be rerouted,
+        it will be sent by other bot.
+        :return: sent `ManagerTradeOffer`, its owner may differ from one it was created by
+        :raises OffersLimitExceeded if offer can't be sent because of active offers limits
+        """
+        if offer.owner not in self:
+            raise ValueError(f"Bot {offer.owner} not bounded to this manager")
+
+        self._route(offer)
+        bot = offer.owner
+        if self.lazy:
+            await bot.call_threadsafe(bot.activate())
+        await bot.call_threadsafe(bot.send_offer(offer))
+
+        return offer
+
+    def _get_owner(self, send_items: list[BotItem] | None) -> _B:
+        owner = {item.owner for item in send_items or ()}
+        if len(owner) > 1:
+            f = join_multiple_in_string(tuple(owner))
+            raise ValueError(f"Items to send owns by few or more manager bots {f}")
+
+        return owner.pop() if owner else self.select_bot()
+
     def _create_offer(
         self,
         bot: _B,
@@ -76,7 +196,7 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
                     partner=partner,
                     token=token,
                     message=message if (not message_flag or msg_in_all_offers) else None,
-                    send_items=[item for item in send_items if item.owner is bot],
+                    send_items=[item for item in send_items or () if item.owner is bot],
                     receive_items=receive_items if not receive_items_flag else None,
                 )
             )
@@ -95,6 +215,7 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
     ) -> ManagerTradeOffer[_B]:
         """
         Create `ManagerTradeOffer`. Consider that items must be owned by one bot.
+        If there is no items to send, bot will be selected by `selector`.
         :param partner: `steam.User` to whom trade offers will be sent
         :param token: trade token of user if user not in friends list
         :param message: text that be applied to trade offer
@@ -103,14 +224,10 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
         :return: `ManagerTradeOffer`
         :raises ValueError if items belong to two or more manager bots.
                 ValueError - if bot not bounded to this manager
+                ReadyRequired - if there is no items to send and no ready bot to select
         """
-        owner = {item.owner for item in send_items}
-        f = join_multiple_in_string(tuple(owner))
-        if len(owner) > 1:
-            raise ValueError(f"Items to send owns by few or more manager bots {f}")
-
         return self._create_offer(
-            bot=owner.pop(),
+            bot=self._get_owner(send_items),
             partner=partner,
             token=token,
             message=message,
@@ -128,21 +245,18 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
         """
         Create `ManagerTradeOffer` from trade url. Requires fetching user model.
         Consider that items must be owned by one bot.
+        If there is no items to send, bot will be selected by `selector`.
         :param trade_url: trade url of user
         :param message: text that be applied to trade offer
         :param send_items: items that will be sent within trade offer
         :param receive_items: items that will be received within trade offer
         :return: `ManagerTradeOffer`
         :raises ValueError if items belong to two or more manager bots
+                ReadyRequired - if there is no items to send and no ready bot to select
         """
-        owner = {item.owner for item in send_items}
-        f = join_multiple_in_string(tuple(owner))
-        if len(owner) > 1:
-            raise ValueError(f"Items to send owns by few or more manager bots {f}")
-
-        bot: _B = owner.pop()
+        bot = self._get_owner(send_items)
         partner_id32, token = parse_trade_url(trade_url)
-        partner = bot.get_user(partner_id32) or await bot.fetch_user(partner_id32)
+        partner = await self.partners.fetch(partner_id32, bot)
 
         return self._create_offer(
             bot=bot, partner=partner, token=token, message=message, send_items=send_items, receive_items=receive_items
@@ -170,7 +284,7 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
         :param msg_in_all_offers: if `True` send message duplicates in all offers
         :return: list[`ManagerTradeOffer`]
         """
-        owners: set[_B] = {item.owner for item in send_items}
+        owners: set[_B] = {item.owner for item in send_items or ()} or {self.select_bot()}
 
         return self._create_offers(
             owners=owners,
@@ -205,10 +319,8 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
         """
         partner_id32, token = parse_trade_url(trade_url)
 
-        owners: set[_B] = {item.owner for item in send_items}
-        bot = owners.pop()
-        partner = bot.get_user(partner_id32) or await bot.fetch_user(partner_id32)
-        owners.add(bot)
+        owners: set[_B] = {item.owner for item in send_items or ()} or {self.select_bot()}
+        partner = await self.partners.fetch(partner_id32, next(iter(owners)))
 
         return self._create_offers(
             owners=owners,
@@ -220,6 +332,131 @@ class TradeOfferManager(SteamBotPool[_I, _B], ManagerDispatchMixin):
             msg_in_all_offers=msg_in_all_offers,
         )
 
+    async def send_offers(
+        self,
+        offers: Iterable[ManagerTradeOffer[_B]],
+        *,
+        retries: int | None = None,
+        retry_delay: float | None = None,
+    ) -> list[SendResult[_B]]:
+        """
+        Send many offers concurrently across bots, respecting per bot and global rate limits.
+        Offers of one bot are started in given order, up to `bot_send_concurrency` at once.
+        :param offers: prepared offers
+        :param retries: how many times retry sending on transient errors (rate limit, failed connection).
+            Defaults - `send_retries`
+        :param retry_delay: base delay before retry in seconds, grows exponentially and jittered.
+            Defaults - `send_retry_delay`
+        :return: list[`SendResult`] in order of passed offers. Exceptions are stored in results instead of raising
+        """
+        retries = self.send_retries if retries is None else retries
+        retry_delay = self.send_retry_delay if retry_delay is None else retry_delay
+
+        results = [SendResult(offer) for offer in offers]
+        by_bot: dict[_B, list[SendResult[_B]]] = {}
+        for result in results:
+            by_bot.setdefault(result.offer.owner, []).append(result)
+
+        self.send_stats._enter()
+        try:
+            await asyncio.gather(
+                *(self._send_bot_offers(bot, bot_results, retries, retry_delay) for bot, bot_results in by_bot.items())
+            )
+        finally:
+            self.send_stats._exit()
+
+        return results
+
+    def _get_send_buckets(self, bot: _B) -> tuple[TokenBucket, ...]:
+        buckets = []
+        if self.bot_send_rate:
+            if (bucket := self._send_buckets.get(bot.id)) is None:
+                bucket = self._send_buckets[bot.id] = TokenBucket(self.bot_send_rate, self.bot_send_burst)
+            buckets.append(bucket)
+        if self.send_rate:
+            if self._send_bucket is None:
+                self._send_bucket = TokenBucket(self.send_rate, self.send_burst)
+            buckets.append(self._send_bucket)
+
+        return tuple(buckets)
+
+    async def _send_bot_offers(self, bot: _B, results: list[SendResult[_B]], retries: int, retry_delay: float):
+        slots = asyncio.Semaphore(self.bot_send_concurrency)
+
+        async def send(result: SendResult[_B]) -> None:
+            async with slots:  # semaphore is fair, so offers are started in order
+                await self._send_offer(bot, result, retries, retry_delay)
+
+        await asyncio.gather(*(send(result) for result in results))
+
+    async def _send_offer(self, bot: _B, result: SendResult[_B], retries: int, retry_delay: float) -> None:
+        if bot not in self:
+            result.error = ValueError(f"Bot {bot} not bounded to this manager")
+            self.send_stats.failed += 1
+            return
+
+        self._route(result.offer)
+        bot = result.offer.owner
+
+        while True:
+            for bucket in self._get_send_buckets(bot):
+                await bucket.acquire()
+
+            result.attempts += 1
+            try:
+                if self.lazy:
+                    await bot.call_threadsafe(bot.activate())
+                await bot.call_threadsafe(bot.send_offer(result.offer))
+            except Exception as e:
+                if result.attempts <= retries and is_transient_error(e):
+                    self.send_stats.retries += 1
+                    _log.debug(f"Retry sending offer from {bot} after {e!r}")
+                    await asyncio.sleep(random.uniform(0, retry_delay * 2 ** (result.attempts - 1)))
+                    continue
+
+                result.error = e
+                self.send_stats.failed += 1
+            else:
+                self.send_stats.sent += 1
+            return
+
+    def _bind(self, bot: _B) -> None:
+        super()._bind(bot)
+        self.selector.update(bot)
+
+    def _unbind(self, bot: _B) -> None:
+        self.selector.remove(bot)
+        super()._unbind(bot)
+
+    def _on_bot_state_change(self, bot: _B, old: BotState, new: BotState) -> None:
+        super()._on_bot_state_change(bot, old, new)
+        if bot in self:
+            self.selector.update(bot)  # returns parked bot to selection when it becomes ready
+
+    def startup(self):
+        """Start all bots, in `lazy` mode bots are started on demand instead"""
+        if not self.lazy:
+            return super().startup()
+
+        if self.hibernate_after is not None and self._hibernator is None:
+            self._hibernator = self.loop.create_task(self._hibernate_idle(), name="manager hibernator task")
+        return asyncio.sleep(0)
+
+    async def _hibernate_idle(self) -> None:
+        idle = self.hibernate_after.total_seconds()
+        while True:
+            await asyncio.sleep(idle / 4)
+            for bot in list(self.by_state(BotState.Active)):
+                if not bot.manager_trades and bot.idle_time >= idle and not bot._hibernating:
+                    self._bot_task(bot, bot.hibernate(), "hibernate")
+
+    async def shutdown(self) -> None:
+        if self._hibernator is not None:
+            self._hibernator.cancel()
+            self._hibernator = None
+        self.queue.close()
+        await super().shutdown()
+
     async def on_inventory_update(self, bot: _B, inventory: BotInventory) -> None:
         for item in inventory:
             self.items.add(item)
@@ -0,0 +1,78 @@
+import logging
+from typing import Iterator, TypeVar
+
+from .base import Counter, Histogram, MetricFamily, PoolMetrics
+
+__all__ = ("ManagerMetrics",)
+
+_log = logging.getLogger(__name__)
+_M = TypeVar("_M", bound="manager.TradeOfferManager")
+
+
+class ManagerMetrics(PoolMetrics[_M]):
+    """
+    Pool metrics with offers, inventories and queues of manager.
+    Enabled by `TradeOfferManager.collect_metrics`,
+    `manager.metrics.render()` returns text for Prometheus or `await manager.metrics.serve()` exposes it
+    """
+
+    def __init__(self, manager: _M):
+        super().__init__(manager)
+        self.offers_sent = Counter("steam_offers_sent", "Sent manager offers", ("bot",))
+        # final state of offer: Accepted, Declined, Expired, Canceled, etc.
+        self.offers_closed = Counter("steam_offers_closed", "Closed manager offers by state", ("bot", "state"))
+        self.send_seconds = Histogram("steam_offer_send_seconds", "Offer send request duration")
+        self.confirm_seconds = Histogram("steam_confirm_seconds", "Mobile confirmation of offers batch duration")
+        self.inventory_fetch_seconds = Histogram("steam_inventory_fetch_seconds", "Game inventory fetch duration")
+
+    def counters(self) -> Iterator[Counter | Histogram]:
+        yield from super().counters()
+        yield self.offers_sent
+        yield self.offers_closed
+        yield self.send_seconds
+        yield self.confirm_seconds
+        yield self.inventory_fetch_seconds
+
+    def gauges(self) -> Iterator[MetricFamily]:
+        yield from super().gauges()
+        manager = self.pool
+        bots = list(manager)
+        yield MetricFamily(
+            "steam_bot_active_offers",
+            "gauge",
+            "Active manager offers of bot",
+            [("", {"bot": str(bot.id)}, len(bot.manager_trades)) for bot in bots],
+        )
+        yield MetricFamily(
+            "steam_bot_inventory_items",
+            "gauge",
+            "Cached inventory items of bot per game",
+            [
+                ("", {"bot": str(bot.id), "app_id": str(inv.game.id)}, len(inv.items))
+                for bot in bots
+                for inv in bot.inventory.game_inventories
+            ],
+        )
+        yield MetricFamily(
+            "steam_offer_queue_depth",
+            "gauge",
+            "Offers waiting in manager queue per bot",
+            [("", {"bot": str(bot.id)}, manager.queue.pending(bot)) for bot in bots],
+        )
+        yield MetricFamily(
+            "steam_confirmations_pending",
+            "gauge",
+            "Offers waiting for batched mobile confirmation per bot",
+            [("", {"bot": str(bot.id)}, len(bot.confirmations)) for bot in bots],
+        )
+
+        stats = manager.send_stats
+        yield MetricFamily(
+            "steam_send_failed", "counter", "Offers failed to send by manager", [("_total", {}, stats.failed)]
+        )
+        yield MetricFamily(
+            "steam_send_retries", "counter", "Retried offer sends of manager", [("_total", {}, stats.retries)]
+        )
+
+
+from . import manager
@@ -6,6 +6,8 @@ from typing import TypeAlias, Coroutine, Any, Callable, TYPE_CHECKING
 import steam
 from steam.gateway import Msg, MsgProto
 
+from .base import ErrorLog
+
 __all__ = ("ManagerDispatchMixin",)
 
 _log = logging.getLogger(__name__)
@@ -14,17 +16,18 @@ EventType: TypeAlias = "Callable[..., Coroutine[Any, Any, Any]]"
 
 class ManagerDispatchMixin:
     loop: asyncio.AbstractEventLoop
+    error_log_size: int = 100  # last errors kept by manager, all errors are counted
 
     @property
-    def errors(self) -> list[Exception]:
-        return getattr(self, "_errors", [])
+    def errors(self) -> ErrorLog:
+        """Last errors of manager event handlers and counters of all of them"""
+        if (errors := getattr(self, "_errors", None)) is None:
+            errors = self._errors = ErrorLog(self.error_log_size)
+        return errors
 
     # TODO: i sure i forgot smth there
     async def on_error(self, event: str, error: Exception, *args, **kwargs):
-        if errors := getattr(self, "_errors", None):
-            errors.append(error)
-        else:
-            setattr(self, "_errors", [error])
+        self.errors.record(error, event)
         _log.error(f"Ignoring manager exception in {event}")
 
     def _schedule_event(self, coro: EventType, event_name: str, *args, **kwargs) -> asyncio.Task:
@@ -56,6 +59,7 @@ class ManagerDispatchMixin:
     if TYPE_CHECKING:  # pragma: no cover
         from .offer import ManagerTradeOffer
         from .inventory import BotInventory
+        from .base import BotState
 
         # manager events
         async def on_close_trade_offer(self, bot, trade: ManagerTradeOffer) -> None:
@@ -83,6 +87,15 @@ class ManagerDispatchMixin:
             :return: None
             """
 
+        async def on_bot_state_change(self, bot, old: BotState, new: BotState) -> None:
+            """
+            Calls when bot state changes.
+            :param bot: bot instance who's sent signal
+            :param old: previous state
+            :param new: current state
+            :return: None
+            """
+
         # steamio events
         async def on_connect(self, bot) -> None:
             ...
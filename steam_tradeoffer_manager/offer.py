@@ -1,14 +1,17 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Coroutine, Any, Generic, TypeVar, TypeAlias
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar, TypeAlias, Callable
 from datetime import timedelta
 
 from steam import TradeOffer, User, TradeOfferState
 
+from .base import run_in_loop, running_loop
+
 __all__ = ("ManagerTradeOffer",)
 
 _B = TypeVar("_B", bound="bot.ManagerBot")
 TradeOfferAlias: TypeAlias = "ManagerTradeOffer | TradeOffer"  # specially for __eq__
+DoneCallback: TypeAlias = "Callable[[ManagerTradeOffer], Any]"
 
 
 @dataclass(eq=False)
@@ -23,8 +26,14 @@ class ManagerTradeOffer(Generic[_B]):
 
     _cancel_delay: timedelta | None = None
     _cancel_delay_timer: asyncio.Task | None = None
+    _cancel_deadline: float | None = None  # owner loop time, kept while timer is paused
+
+    _closed_future: asyncio.Future = field(init=False, repr=False)
 
-    # _state_event: asyncio.Event = field(default_factory=asyncio.Event)  # maybe useless
+    def __post_init__(self):
+        # created up front, bot loop (maybe of loop group) closes it while waiters are on manager loop
+        loop: asyncio.AbstractEventLoop = getattr(self.owner.manager, "loop", None) or self.owner.loop
+        self._closed_future = loop.create_future()
 
     @property
     def id(self) -> int | None:
@@ -86,32 +95,85 @@ class ManagerTradeOffer(Generic[_B]):
     def cancel_delay(self, value: timedelta | None):
         self._cancel_delay = value
 
-    def send(self) -> Coroutine[Any, Any, None]:
+    @property
+    def is_closed(self) -> bool:
+        """`True` if owner bot has closed this offer (accepted/declined/cancelled/expired)."""
+        return self._closed_future.done()
+
+    def _set_closed(self) -> None:
+        fut = self._closed_future
+        if running_loop() is fut.get_loop():
+            self._resolve_closed()
+        else:
+            fut.get_loop().call_soon_threadsafe(self._resolve_closed)
+
+    def _resolve_closed(self) -> None:
+        if not self._closed_future.done():
+            self._closed_future.set_result(self)
+
+    async def wait_closed(self, timeout: float | None = None) -> "ManagerTradeOffer[_B]":
+        """
+        Wait until offer will be closed by owner bot. Can be awaited from any loop.
+        :param timeout: amount of seconds to wait, `None` - wait forever
+        :return: this `ManagerTradeOffer`
+        :raises asyncio.TimeoutError if timeout has been reached
+        """
+        fut = self._closed_future
+        if asyncio.get_running_loop() is not fut.get_loop():
+            return await run_in_loop(fut.get_loop(), self.wait_closed(timeout))
+        # shield prevents cancelling shared future by one of the waiters
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+
+    def add_done_callback(self, callback: DoneCallback) -> None:
+        """
+        Add callback that will be called on manager loop with this offer when it will be closed.
+        Called soon if offer already closed.
+        """
+        self._closed_future.add_done_callback(lambda _: callback(self))
+
+    async def send(self) -> None:
         """
         Send this prepared offer to partner.
         """
-        return self.owner.send_offer(self)
+        await self.owner.send_offer(self)
 
     def _set_cancel_timeout(self):
+        loop: asyncio.AbstractEventLoop = self.owner.loop  # type hinting won't work :(
+        if self._cancel_deadline is None:
+            self._cancel_deadline = loop.time() + self.cancel_delay.total_seconds()
+
         async def _cancel_timeout():
-            await asyncio.sleep(self.cancel_delay.total_seconds())
+            await asyncio.sleep(max(0.0, self._cancel_deadline - loop.time()))
             if self.is_active:
                 await self.cancel()
 
-        loop: asyncio.AbstractEventLoop = self.owner.loop  # type hinting won't work :(
         self._cancel_delay_timer = loop.create_task(_cancel_timeout())
 
+    def _pause_cancel_timeout(self) -> None:
+        """Stop cancel timer keeping its deadline, `_set_cancel_timeout` will resume it"""
+        if self._cancel_delay_timer and not self._cancel_delay_timer.done():
+            self._cancel_delay_timer.cancel()
+
     async def confirm(self):
         """Confirms the trade offer.
-        This rarely needs to be called as the client handles most of these."""
+        This rarely needs to be called as the client handles most of these.
+        Confirmations are batched by owner bot `confirmations`."""
+        await self.owner.call_threadsafe(self._confirm())
+
+    async def _confirm(self):
         await self._steam_offer.confirm()
-        self._cancel_delay_timer.cancel()
+        if self._cancel_delay_timer:
+            self._cancel_delay_timer.cancel()
 
     async def cancel(self):
+        await self.owner.call_threadsafe(self._cancel())
+
+    async def _cancel(self):
         try:
             await self._steam_offer.cancel()
         finally:
-            self._cancel_delay_timer.cancel()
+            if self._cancel_delay_timer:
+                self._cancel_delay_timer.cancel()
 
     # def check(self, pre=False) -> bool:
     #     """Check offer state and return `True` if state valid
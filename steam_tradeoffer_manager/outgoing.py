@@ -0,0 +1,229 @@
+import asyncio
+import enum
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import monotonic
+from typing import Generic, TypeVar
+
+from .base import BotState
+from .offer import ManagerTradeOffer
+from .sending import SendResult
+
+__all__ = ("OfferPriority", "OfferQueue", "QueueWaitStats")
+
+_log = logging.getLogger(__name__)
+_B = TypeVar("_B", bound="bot.ManagerBot")
+_M = TypeVar("_M", bound="manager.TradeOfferManager")
+
+
+class OfferPriority(enum.IntEnum):
+    """Priority classes of outgoing offers, lower value sends first"""
+
+    High = 0  # withdrawals and other user facing offers
+    Normal = 1
+    Low = 2  # bulk rebalancing between bots, etc.
+
+
+@dataclass
+class QueueWaitStats:
+    """Time offers spent in queue before sending attempt"""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def _add(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+
+@dataclass(order=True)
+class _QueueEntry(Generic[_B]):
+    priority: OfferPriority
+    seq: int
+    offer: ManagerTradeOffer[_B] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    deadline: float | None = field(compare=False)
+
+    def expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+
+class OfferQueue(Generic[_M, _B]):
+    """
+    Outgoing offers queue of `TradeOfferManager`.
+    Every bot has own priority heap drained by scheduler task within manager send rate limits.
+    Scheduler task lives only while bot has queued offers.
+    Up to `bot_send_concurrency` offers of bot are sent at once in priority order,
+    so their mobile confirmations are batched.
+    Offers of bots that are not ready (restarting, etc.) are held until bot becomes ready or deadline passes.
+    """
+
+    hold_interval: float = 1.0  # seconds between checks of not ready bot and deadlines of its offers
+
+    def __init__(self, owner: _M):
+        self.owner = owner
+        self.wait_stats: dict[OfferPriority, QueueWaitStats] = {p: QueueWaitStats() for p in OfferPriority}
+        self.expired = 0
+
+        self._heaps: dict[_B, list[_QueueEntry[_B]]] = {}
+        self._workers: dict[_B, asyncio.Task] = {}
+        self._slots: dict[_B, asyncio.Semaphore] = {}  # concurrent sends of bot
+        self._sending: set[asyncio.Task] = set()
+        self._counter = itertools.count()
+
+    def put(
+        self,
+        offer: ManagerTradeOffer[_B],
+        priority: OfferPriority = OfferPriority.Normal,
+        deadline: timedelta | None = None,
+    ) -> "asyncio.Future[SendResult[_B]]":
+        """
+        Put offer in queue of owner bot.
+        :param offer: prepared offer
+        :param priority: offer priority class
+        :param deadline: max time that offer can wait in queue, `None` - wait forever
+        :return: future with `SendResult`. Result error is `asyncio.TimeoutError` if deadline has passed
+        """
+        bot: _B = offer.owner
+        now = monotonic()
+        future = self.owner.loop.create_future()
+        entry = _QueueEntry(
+            priority=OfferPriority(priority),
+            seq=next(self._counter),
+            offer=offer,
+            future=future,
+            enqueued_at=now,
+            deadline=now + deadline.total_seconds() if deadline is not None else None,
+        )
+        heapq.heappush(self._heaps.setdefault(bot, []), entry)
+
+        if bot not in self._workers:
+            self._workers[bot] = self.owner.loop.create_task(self._drain(bot), name=f"{bot} offers queue task")
+
+        return future
+
+    def pending(self, bot: _B) -> int:
+        """Amount of queued offers of bot"""
+        return len(self._heaps.get(bot, ()))
+
+    def close(self) -> None:
+        """Stop scheduling and cancel futures of queued offers"""
+        for worker in (*self._workers.values(), *self._sending):
+            worker.cancel()
+        for heap in self._heaps.values():
+            for entry in heap:
+                entry.future.cancel()
+        self._workers.clear()
+        self._heaps.clear()
+
+    def _expire(self, heap: list[_QueueEntry[_B]]) -> None:
+        now = monotonic()
+        alive = []
+        for entry in heap:
+            if entry.expired(now):
+                self._resolve(entry, asyncio.TimeoutError("Offer queue deadline has passed"))
+            else:
+                alive.append(entry)
+
+        if len(alive) != len(heap):
+            heap[:] = alive
+            heapq.heapify(heap)
+
+    def _resolve(self, entry: _QueueEntry[_B], error: Exception | None = None, result: SendResult | None = None):
+        if error is not None:
+            self.expired += isinstance(error, asyncio.TimeoutError)
+            result = SendResult(entry.offer, error=error)
+        if not entry.future.done():
+            entry.future.set_result(result)
+
+    def _next_deadline(self, heap: list[_QueueEntry[_B]]) -> float | None:
+        deadlines = [entry.deadline for entry in heap if entry.deadline is not None]
+        return max(0.0, min(deadlines) - monotonic()) if deadlines else None
+
+    @staticmethod
+    async def _wake(bot: _B) -> None:
+        bot.wake()  # lazy bot is started on demand
+        await bot.wait_until_ready()
+
+    def _bot_failure(self, bot: _B) -> Exception | None:
+        """Error for queued offers of bot that won't become ready by itself"""
+        if bot.state is BotState.InvalidCredentials:
+            return ValueError(f"Bot {bot} has invalid credentials")
+        if bot.state is BotState.UnknownError and self.owner.supervisor is None:  # nothing will restart it
+            return RuntimeError(f"Bot {bot} has stopped by error")
+        return None
+
+    async def _hold(self, bot: _B, heap: list[_QueueEntry[_B]]) -> None:
+        """Wait until bot is ready, failing expired offers and offers of failed bot meanwhile"""
+        while heap and not bot.is_ready():
+            if (error := self._bot_failure(bot)) is not None:
+                for entry in heap:
+                    self._resolve(entry, error)
+                heap.clear()
+                return
+
+            # wait in slices, so bot failures and deadlines of offers put meanwhile are checked in time
+            deadline = self._next_deadline(heap)
+            timeout = self.hold_interval if deadline is None else min(deadline, self.hold_interval)
+            try:
+                await asyncio.wait_for(bot.call_threadsafe(self._wake(bot)), timeout)
+            except asyncio.TimeoutError:
+                self._expire(heap)
+
+    async def _drain(self, bot: _B) -> None:
+        heap = self._heaps[bot]
+        if (slots := self._slots.get(bot)) is None:
+            slots = self._slots[bot] = asyncio.Semaphore(self.owner.bot_send_concurrency)
+        try:
+            while heap:
+                await self._hold(bot, heap)
+                self._expire(heap)
+                if not heap:
+                    break
+
+                await slots.acquire()
+                if not heap:
+                    slots.release()
+                    break
+
+                entry = heapq.heappop(heap)
+                self.wait_stats[entry.priority]._add(monotonic() - entry.enqueued_at)
+
+                task = self.owner.loop.create_task(self._send(bot, entry, slots), name=f"{bot} queued offer task")
+                self._sending.add(task)
+                task.add_done_callback(self._sending.discard)
+        finally:
+            if self._workers.get(bot) is asyncio.current_task():
+                del self._workers[bot]
+            if not heap:
+                self._heaps.pop(bot, None)
+
+    async def _send(self, bot: _B, entry: _QueueEntry[_B], slots: asyncio.Semaphore) -> None:
+        result = SendResult(entry.offer)
+        try:
+            await self.owner._send_offer(bot, result, self.owner.send_retries, self.owner.send_retry_delay)
+        except asyncio.CancelledError:
+            entry.future.cancel()
+            raise
+        finally:
+            slots.release()
+        self._resolve(entry, result=result)
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)}>"
+
+
+from . import bot, manager
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from time import monotonic
+from typing import Generic, TypeVar, TypeAlias
+
+from steam import User, Type
+from steam.utils import make_id64
+
+from .utils import bind_user
+
+__all__ = ("PartnerCache", "PartnerCacheStats", "BotPartnerViews")
+
+_log = logging.getLogger(__name__)
+_B = TypeVar("_B", bound="bot.ManagerBot")
+_M = TypeVar("_M", bound="manager.TradeOfferManager")
+Intable: TypeAlias = "int | str"
+
+
+@dataclass
+class PartnerCacheStats:
+    hits: int = 0
+    misses: int = 0
+    fetches: int = 0  # amount of requests to steam
+    fetched: int = 0  # amount of users received
+    fetch_time: float = 0.0  # total seconds spent in requests
+    max_fetch_time: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def mean_fetch_time(self) -> float:
+        return self.fetch_time / self.fetches if self.fetches else 0.0
+
+
+class PartnerCache(Generic[_M, _B]):
+    """
+    Manager wide cache of partners `steam.User` shared across bots.
+    Concurrent lookups of missing users are collected during `window`
+    and fetched with one multi-user request.
+    Cache is LRU-bounded by `maxsize`, least recently used users are evicted first.
+    :param owner: manager
+    :param ttl: time to keep user in cache
+    :param maxsize: max amount of cached users
+    :param window: seconds to collect lookups before fetching
+    :param max_batch: max amount of users in one request
+    """
+
+    def __init__(
+        self,
+        owner: _M,
+        ttl: timedelta = timedelta(minutes=30),
+        maxsize: int = 10000,
+        window: float = 0.01,
+        max_batch: int = 100,
+    ):
+        self.owner = owner
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = PartnerCacheStats()
+
+        self._cache: OrderedDict[int, tuple[float, User]] = OrderedDict()  # id64 to (expires at, user)
+        self._futures: dict[int, asyncio.Future] = {}  # queued and in-flight lookups
+        self._queue: list[int] = []
+        self._queue_bot: _B | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    def get(self, id: Intable) -> User | None:
+        """Get cached user if it is not expired"""
+        id64 = make_id64(id, type=Type.Individual)
+        if (entry := self._cache.get(id64)) is not None:
+            if entry[0] > monotonic():
+                self._cache.move_to_end(id64)
+                return entry[1]
+            del self._cache[id64]
+
+    def put(self, user: User) -> None:
+        self._cache[user.id64] = (monotonic() + self.ttl.total_seconds(), user)
+        self._cache.move_to_end(user.id64)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, id: "Intable | None" = None) -> None:
+        """
+        Remove user from cache or clear whole cache if `id` is `None`.
+        Views of removed users bound to manager bots are dropped too, as they share attributes with them.
+        """
+        id64 = None if id is None else make_id64(id, type=Type.Individual)
+        if id64 is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id64, None)
+        for bot in self.owner:
+            bot.partner_views.invalidate(id64)
+
+    async def fetch(self, id: Intable, bot: _B | None = None) -> User | None:
+        """
+        Get user from cache or fetch it.
+        :param id: user id
+        :param bot: preferable bot to make request, any ready manager bot will be used otherwise
+        :return: `steam.User` or `None` if user not found
+        """
+        id64 = make_id64(id, type=Type.Individual)
+        if (user := self.get(id64)) is not None:
+            self.stats.hits += 1
+            return user
+        if bot is not None and (user := bot.get_user(id64)) is not None:
+            self.stats.hits += 1
+            self.put(user)
+            return user
+
+        self.stats.misses += 1
+        if (future := self._futures.get(id64)) is None:
+            future = self._futures[id64] = self.owner.loop.create_future()
+            self._enqueue(id64, bot)
+
+        return await asyncio.shield(future)
+
+    def _enqueue(self, id64: int, bot: _B | None) -> None:
+        self._queue.append(id64)
+        self._queue_bot = self._queue_bot or bot
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self.owner.loop.call_later(self.window, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        ids, bot = self._queue, self._queue_bot
+        self._queue, self._queue_bot = [], None
+        if ids:
+            self.owner.loop.create_task(self._fetch_batch(ids, bot), name="partners fetch task")
+
+    async def _fetch_batch(self, ids: list[int], bot: _B | None) -> None:
+        try:
+            if bot is None or not bot.is_ready():
+                bot = self.owner.select_bot()
+            if not bot.is_ready():
+                await bot.call_threadsafe(bot.activate())
+
+            started = monotonic()
+            users = await bot.call_threadsafe(bot.fetch_users(*ids))
+            elapsed = monotonic() - started
+        except Exception as e:
+            for id64 in ids:
+                if not (future := self._futures.pop(id64)).done():
+                    future.set_exception(e)
+            return
+
+        self.stats.fetches += 1
+        self.stats.fetch_time += elapsed
+        self.stats.max_fetch_time = max(self.stats.max_fetch_time, elapsed)
+
+        found = {user.id64: user for user in users if user is not None}
+        self.stats.fetched += len(found)
+        for id64 in ids:
+            if (user := found.get(id64)) is not None:
+                self.put(user)
+            if not (future := self._futures.pop(id64)).done():
+                future.set_result(user)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, id: Intable) -> bool:
+        return self.get(id) is not None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)} maxsize={self.maxsize}>"
+
+
+class BotPartnerViews(Generic[_B]):
+    """
+    LRU-bounded cache of partners bound to bot client state.
+    Views are shallow copies of user snapshots (e.g. from `PartnerCache`) that share attributes with them.
+    Views are registered in client users cache, which holds them weakly,
+    so evicted views are released once offers referencing them are gone.
+    Views can be bound from manager loop, client users cache is changed on bot loop only.
+    :param owner: bot
+    :param maxsize: max amount of views kept alive by this cache
+    """
+
+    __slots__ = ("owner", "maxsize", "_views", "_lock")
+
+    def __init__(self, owner: _B, maxsize: int = 1024):
+        self.owner = owner
+        self.maxsize = maxsize
+        self._views: OrderedDict[int, tuple[User, User]] = OrderedDict()  # id64 to (snapshot, view)
+        self._lock = threading.Lock()
+
+    def bind(self, user: User) -> User:
+        """Get user bound to owner state"""
+        state = self.owner._connection
+        if user._state is state:
+            return user
+
+        id64 = user.id64
+        with self._lock:
+            if (entry := self._views.get(id64)) is not None and entry[0] is user:
+                self._views.move_to_end(id64)
+                return entry[1]
+
+            view = bind_user(user, state)
+            self._views[id64] = (user, view)
+            self._views.move_to_end(id64)
+            if len(self._views) > self.maxsize:
+                self._views.popitem(last=False)
+
+        self.owner._threadsafe(state._users.__setitem__, id64, view)
+        return view
+
+    def invalidate(self, id64: int | None = None) -> None:
+        """Drop view of user, or all views if `id64` is `None`, also from client users cache"""
+        with self._lock:
+            ids = list(self._views) if id64 is None else (id64,)
+            views = [(id64, entry[1]) for id64 in ids if (entry := self._views.pop(id64, None)) is not None]
+        if views:
+            self.owner._threadsafe(self._unregister, views)
+
+    def _unregister(self, views: list[tuple[int, User]]) -> None:
+        users = self.owner._connection._users
+        for id64, view in views:
+            if users.get(id64) is view:
+                del users[id64]
+
+    def clear(self) -> None:
+        self._views.clear()
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def __contains__(self, id64: int) -> bool:
+        return id64 in self._views
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)} maxsize={self.maxsize}>"
+
+
+from . import bot, manager
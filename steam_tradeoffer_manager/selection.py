@@ -0,0 +1,159 @@
+import heapq
+import itertools
+from abc import ABCMeta, abstractmethod
+from typing import Generic, TypeVar, Callable
+
+__all__ = ("BotSelector", "LeastActiveOffers", "MostFreeSlots", "WeightedRoundRobin")
+
+_B = TypeVar("_B", bound="bot.ManagerBot")
+
+
+class BotSelector(Generic[_B], metaclass=ABCMeta):
+    """
+    Base class of bot selection strategies for `TradeOfferManager`.
+    Keeps bots in heap ordered by `key`, lowest key wins.
+    Bots report load changes with `update`, stale heap entries are skipped lazily,
+    so both update and select are O(log n) over the pool.
+    Not ready bots met by default selection are parked out of heap until their next `update`,
+    manager updates bots on every state change.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, _B]] = []
+        self._keys: dict[_B, tuple[float, int]] = {}
+        self._parked: dict[_B, float] = {}  # not ready bots with their keys
+        self._counter = itertools.count()
+
+    @abstractmethod
+    def key(self, bot: _B) -> float:
+        """Bot load value, must be cheap to compute"""
+
+    def update(self, bot: _B) -> None:
+        """Recalculate bot key. Call it when bot load or state changes"""
+        self._parked.pop(bot, None)
+        self._push(bot, self.key(bot))
+
+    def remove(self, bot: _B) -> None:
+        self._keys.pop(bot, None)
+        self._parked.pop(bot, None)
+
+    def select(self, predicate: Callable[[_B], bool] | None = None) -> _B | None:
+        """
+        Get bot with the lowest key.
+        :param predicate: callback to filter bots, parked bots are checked too. Defaults - only ready bots
+        :return: bot or `None` if there is no suitable bot
+        """
+        if predicate is None:
+            return self._select_ready()
+
+        skipped = []
+        try:
+            while self._heap:
+                key, seq, bot = self._heap[0]
+                if self._keys.get(bot) != (key, seq):  # stale entry
+                    heapq.heappop(self._heap)
+                    continue
+                if not predicate(bot):
+                    skipped.append(heapq.heappop(self._heap))
+                    continue
+
+                self._picked(bot)
+                return bot
+        finally:
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+
+        parked = [(key, bot) for bot, key in self._parked.items() if predicate(bot)]
+        if parked:
+            bot = min(parked, key=lambda entry: entry[0])[1]
+            self.update(bot)
+            self._picked(bot)
+            return bot
+
+    def _select_ready(self) -> _B | None:
+        while self._heap:
+            key, seq, bot = self._heap[0]
+            if self._keys.get(bot) != (key, seq):  # stale entry
+                heapq.heappop(self._heap)
+                continue
+            if not bot.is_ready():  # park bot, so it isn't checked by every selection
+                heapq.heappop(self._heap)
+                del self._keys[bot]
+                self._parked[bot] = key
+                continue
+
+            self._picked(bot)
+            return bot
+
+    def _picked(self, bot: _B) -> None:
+        """Called when bot has been selected"""
+
+    def _push(self, bot: _B, key: float) -> None:
+        current = self._keys.get(bot)
+        if current is not None and current[0] == key:
+            return
+
+        entry = (key, next(self._counter), bot)
+        self._keys[bot] = entry[:2]
+        heapq.heappush(self._heap, entry)
+
+        if len(self._heap) > 2 * len(self._keys) + 64:  # too many stale entries
+            self._heap = [(k, s, b) for b, (k, s) in self._keys.items()]
+            heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._parked)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} len={len(self)}>"
+
+
+class LeastActiveOffers(BotSelector[_B]):
+    """Select bot with the least amount of active offers"""
+
+    def key(self, bot: _B) -> float:
+        return len(bot.manager_trades)
+
+
+class MostFreeSlots(BotSelector[_B]):
+    """
+    Select bot with the most free inventory slots.
+    :param slots: inventory size limit
+    """
+
+    def __init__(self, slots: int = 1000):
+        super().__init__()
+        self.slots = slots
+
+    def key(self, bot: _B) -> float:
+        return len(bot.inventory) - self.slots  # negative amount of free slots
+
+
+class WeightedRoundRobin(BotSelector[_B]):
+    """
+    Select bots in turn proportionally to their weights.
+    Every selection moves bot forward in virtual time by `1 / weight`.
+    :param weights: mapping of bot id to weight, missing bots have `default_weight`
+    """
+
+    def __init__(self, weights: dict[int, float] | None = None, default_weight: float = 1.0):
+        super().__init__()
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self._vtime: dict[_B, float] = {}
+
+    def key(self, bot: _B) -> float:
+        if bot not in self._vtime:  # new bots start from current virtual time instead of zero
+            self._vtime[bot] = self._heap[0][0] if self._heap else 0.0
+        return self._vtime[bot]
+
+    def remove(self, bot: _B) -> None:
+        super().remove(bot)
+        self._vtime.pop(bot, None)
+
+    def _picked(self, bot: _B) -> None:
+        self._vtime[bot] += 1 / self.weights.get(bot.id, self.default_weight)
+        self._push(bot, self._vtime[bot])
+
+
+from . import bot
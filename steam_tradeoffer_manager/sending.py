@@ -0,0 +1,68 @@
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Generic, TypeVar
+
+import steam
+from aiohttp import ClientConnectorError
+
+from .offer import ManagerTradeOffer
+
+__all__ = ("SendResult", "SendStats", "is_transient_error")
+
+_B = TypeVar("_B", bound="bot.ManagerBot")
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Check if sending might succeed when retried and offer surely wasn't created.
+    Sending isn't idempotent: after timeouts, dropped connections or 5xx steam might have created offer,
+    so only rate limits and failed connections are retried
+    """
+    if isinstance(error, steam.HTTPException):
+        return error.status == 429
+    return isinstance(error, ClientConnectorError)
+
+
+@dataclass(eq=False)
+class SendResult(Generic[_B]):
+    """Result of sending one offer with `TradeOfferManager.send_offers`"""
+
+    offer: ManagerTradeOffer[_B]
+    error: Exception | None = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SendStats:
+    """Cumulative stats of `TradeOfferManager.send_offers` calls"""
+
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    busy_time: float = 0.0  # seconds spent inside send_offers calls
+
+    _active_calls: int = field(default=0, repr=False)
+    _busy_since: float = field(default=0.0, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Sent offers per second of busy time"""
+        busy = self.busy_time + (monotonic() - self._busy_since if self._active_calls else 0.0)
+        return self.sent / busy if busy else 0.0
+
+    def _enter(self) -> None:
+        if not self._active_calls:
+            self._busy_since = monotonic()
+        self._active_calls += 1
+
+    def _exit(self) -> None:
+        self._active_calls -= 1
+        if not self._active_calls:
+            self.busy_time += monotonic() - self._busy_since
+
+
+from . import bot
@@ -0,0 +1,455 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import socket
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from itertools import count
+from typing import Any, Generic, TypeVar, NamedTuple, Iterator, Iterable
+
+from steam.trade import Asset, BaseInventory, StatefulGame
+
+from .base import BotState
+from .bot import ManagerBot
+from .loader import BotLoader, Record
+from .manager import TradeOfferManager
+from .mixins import ManagerDispatchMixin
+from .offer import ManagerTradeOffer
+from .utils import parse_trade_url
+
+__all__ = ("ShardedManager", "ShardWorker", "ShardChannel", "OfferInfo", "ItemRef")
+
+_log = logging.getLogger(__name__)
+_M = TypeVar("_M", bound=TradeOfferManager)
+_B = TypeVar("_B", bound=ManagerBot)
+
+
+@dataclass(frozen=True, slots=True)
+class OfferInfo:
+    """Picklable snapshot of `ManagerTradeOffer` passed from shards"""
+
+    id: int | None
+    bot_id: int
+    partner_id64: int | None
+    state: str  # `TradeOfferState` name, steam enums can't be unpickled
+    items_to_send: tuple[int, ...]  # asset ids
+    items_to_receive: tuple[int, ...]
+
+    @classmethod
+    def from_offer(cls, offer: ManagerTradeOffer) -> "OfferInfo":
+        return cls(
+            id=offer.id,
+            bot_id=offer.owner.id,
+            partner_id64=offer.partner.id64 if offer.partner is not None else None,
+            state=offer.state.name,
+            items_to_send=tuple(item.asset_id for item in offer.items_to_send),
+            items_to_receive=tuple(item.asset_id for item in offer.items_to_receive),
+        )
+
+
+class ItemRef(NamedTuple):
+    """Partner item to receive, shards can't share `steam.Item` models"""
+
+    app_id: int
+    asset_id: int
+    context_id: int = 2
+    amount: int = 1
+
+    def to_asset(self, owner) -> Asset:
+        asset = Asset(
+            {"assetid": self.asset_id, "amount": self.amount, "instanceid": 0, "classid": 0, "appid": self.app_id},
+            owner,
+        )
+        asset._game_cs = StatefulGame(owner._state, id=self.app_id, context_id=self.context_id)
+        return asset
+
+
+def _to_wire(value: Any) -> Any:
+    """Convert values to picklable ones, models bound to bot state are replaced with ids or snapshots"""
+    if value is None or isinstance(value, (bool, int, float, str, bytes, Enum, timedelta, datetime, OfferInfo)):
+        return value
+    if isinstance(value, ManagerTradeOffer):
+        return OfferInfo.from_offer(value)
+    if isinstance(value, BaseInventory):
+        return value.game.id, len(value.items)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_to_wire(v) for v in value)
+    if isinstance(value, dict):
+        return {_to_wire(k): _to_wire(v) for k, v in value.items()}
+    return getattr(value, "id", None) or repr(value)
+
+
+def _portable_error(error: BaseException) -> RuntimeError:
+    """Replace exception that can't be sent to coordinator with record of its type, message and http status"""
+    status = getattr(error, "status", None)
+    return RuntimeError(f"{type(error).__name__}{f' (status {status})' if status else ''}: {error}")
+
+
+class ShardChannel:
+    """Duplex channel of length prefixed pickle frames over stream socket"""
+
+    HEADER = struct.Struct(">I")
+
+    __slots__ = ("_reader", "_writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, sock: socket.socket) -> "ShardChannel":
+        return cls(*await asyncio.open_connection(sock=sock))
+
+    def send(self, message: tuple) -> None:
+        """Write message to buffer, raises before writing anything if message can't be pickled"""
+        data = pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+        self._writer.write(self.HEADER.pack(len(data)) + data)
+
+    async def drain(self) -> None:
+        await self._writer.drain()
+
+    async def recv(self) -> tuple:
+        """
+        :raises asyncio.IncompleteReadError when other side is closed
+        """
+        (size,) = self.HEADER.unpack(await self._reader.readexactly(self.HEADER.size))
+        return pickle.loads(await self._reader.readexactly(size))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class ShardWorker(Generic[_M, _B]):
+    """
+    Serves coordinator requests with own manager in shard process.
+    Manager events listed in `forward_events` are sent to coordinator with picklable arguments.
+    :param index: shard number
+    :param channel: channel to coordinator
+    :param manager: shard manager
+    :param bot_class: class of created bots
+    :param forward_events: manager events sent to coordinator
+    """
+
+    def __init__(
+        self, index: int, channel: ShardChannel, manager: _M, bot_class: type[_B], forward_events: Iterable[str]
+    ):
+        self.index = index
+        self.channel = channel
+        self.manager = manager
+        self.bot_class = bot_class
+        self.forward_events = frozenset(forward_events)
+
+    def _dispatch(self, dispatch):
+        def forward(bot: _B, event: str, *args, **kwargs) -> None:
+            dispatch(bot, event, *args, **kwargs)
+            if event in self.forward_events:
+                self.channel.send(("event", bot.id, event, _to_wire(args)))
+
+        return forward
+
+    async def serve(self) -> None:
+        """Handle requests until coordinator stops shard or closes channel"""
+        self.manager.dispatch = self._dispatch(self.manager.dispatch)
+        while True:
+            try:
+                kind, request_id, *payload = await self.channel.recv()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                _log.warning(f"Shard {self.index} lost coordinator")
+                await self.manager.shutdown()
+                break
+
+            if kind == "stop":
+                await self._handle(request_id, self.manager.shutdown)
+                break
+            self.manager.loop.create_task(
+                self._handle(request_id, getattr(self, f"_on_{kind}"), *payload), name=f"shard {kind} task"
+            )
+
+        self.channel.close()
+
+    async def _handle(self, request_id: int, handler, *payload) -> None:
+        try:
+            result = await handler(*payload)
+        except Exception as e:
+            self._reply(request_id, False, e)
+        else:
+            self._reply(request_id, True, _to_wire(result))
+        await self.channel.drain()
+
+    def _reply(self, request_id: int, ok: bool, value: Any) -> None:
+        # value is pickled apart from frame, so coordinator can fail request if it can't restore the value
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            if not ok:  # exceptions with custom __init__ (as steam.HTTPException) pickle, but don't unpickle
+                pickle.loads(data)
+        except Exception as e:
+            error = _portable_error(value) if not ok else RuntimeError(f"Unpicklable result {value!r}: {e}")
+            ok, data = False, pickle.dumps(error, pickle.HIGHEST_PROTOCOL)
+        self.channel.send(("result", request_id, ok, data))
+
+    async def _on_add(self, kwargs: Record) -> BotState:
+        bot = self.bot_class(**kwargs)
+        self.manager.add(bot)
+        return bot.state
+
+    async def _on_remove(self, id: int) -> None:
+        bot = self.manager.pop(id)
+        if not bot.is_closed():
+            await bot.stop()
+        bot._release_constraints()
+
+    async def _on_startup(self) -> None:
+        if len(self.manager):  # pool can't wait for start of no bots
+            await self.manager.startup()
+
+    async def _on_call(self, id: int | None, method: str, args: tuple, kwargs: dict) -> Any:
+        result = getattr(self.manager if id is None else self.manager[id], method)(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def _on_send_offer(
+        self,
+        id: int | None,
+        trade_url: str,
+        message: str | None,
+        send_items: tuple[int, ...],
+        receive_items: tuple[ItemRef, ...],
+    ) -> ManagerTradeOffer:
+        items = [self.manager.items[asset_id] for asset_id in send_items]
+        bot = self.manager[id] if id is not None else self.manager._get_owner(items)
+        partner_id32, token = parse_trade_url(trade_url)
+        partner = await self.manager.partners.fetch(partner_id32, bot)
+
+        offer = self.manager._create_offer(
+            bot, partner, token, message, items or None, [ref.to_asset(partner) for ref in receive_items] or None
+        )
+        return await self.manager.send_offer(offer)
+
+
+async def _serve_shard(index: int, sock: socket.socket, manager_class, bot_class, forward_events) -> None:
+    channel = await ShardChannel.open(sock)
+    await ShardWorker(index, channel, manager_class(), bot_class, forward_events).serve()
+
+
+def _run_shard(index: int, sock: socket.socket, manager_class, bot_class, forward_events) -> None:
+    """Entrypoint of shard process"""
+    try:
+        asyncio.run(_serve_shard(index, sock, manager_class, bot_class, forward_events))
+    except KeyboardInterrupt:  # coordinator handles it
+        pass
+
+
+class ShardedManager(ManagerDispatchMixin, Generic[_M, _B]):
+    """
+    Coordinator of bots partitioned across `shards` worker processes.
+    Every shard runs own `manager_class` instance with own event loop,
+    so json parsing and models wrapping of many bots are spread over cores.
+    Bot is owned by shard `bot id % shards` and all requests to it are routed there.
+    Steam models can't cross process boundary, so bots are added by account records,
+    offers are described by trade url, asset ids and `ItemRef`, and results are returned as picklable snapshots.
+    Events listed in `forward_events` are dispatched to coordinator handlers with bot id instead of bot instance.
+    `manager_class` and `bot_class` must be importable by shard processes.
+    """
+
+    shards: int = os.cpu_count() or 1
+    manager_class: type[_M] = TradeOfferManager
+    bot_class: type[_B] = ManagerBot
+    forward_events: frozenset[str] = frozenset(
+        {"ready", "bot_state_change", "manager_trade_send", "close_trade_offer", "inventory_update"}
+    )
+    call_timeout: float | None = 120.0  # seconds to wait for shard response, `None` - forever
+
+    def __init__(self):
+        self.loop = asyncio.get_event_loop_policy().get_event_loop()
+        self._channels: list[ShardChannel | None] = [None] * self.shards
+        self._processes: list[multiprocessing.Process] = []
+        self._readers: list[asyncio.Task] = []
+        self._pending: dict[int, tuple[int, asyncio.Future]] = {}  # request id to shard number and future
+        self._request_ids = count()
+        self._bots: dict[int, BotState] = {}  # bot id to last known state
+        self._cursor = 0
+
+    def shard_of(self, id: int) -> int:
+        return id % self.shards
+
+    async def start(self) -> None:
+        """Spawn shard processes and connect to them"""
+        context = multiprocessing.get_context("spawn")
+        for index in range(self.shards):
+            sock, shard_sock = socket.socketpair()
+            process = context.Process(
+                target=_run_shard,
+                args=(index, shard_sock, self.manager_class, self.bot_class, self.forward_events),
+                name=f"shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            shard_sock.close()
+            self._processes.append(process)
+            await self._connect(index, sock)
+
+    async def _connect(self, index: int, sock: socket.socket) -> None:
+        channel = self._channels[index] = await ShardChannel.open(sock)
+        self._readers.append(self.loop.create_task(self._read(index, channel), name=f"shard {index} reader task"))
+
+    async def _read(self, index: int, channel: ShardChannel) -> None:
+        while True:
+            try:
+                kind, *payload = await channel.recv()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception:  # frame is read whole, so channel stays usable
+                _log.exception(f"Can't unpickle message of shard {index}")
+                continue
+
+            if kind == "result":
+                request_id, ok, data = payload
+                _, future = self._pending.pop(request_id, (index, None))
+                if future is None or future.done():  # timed out
+                    continue
+                try:
+                    value = pickle.loads(data)
+                except Exception as e:
+                    _log.exception(f"Can't unpickle result of shard {index}")
+                    future.set_exception(RuntimeError(f"Can't unpickle result of shard {index}: {e!r}"))
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            else:  # event
+                id, event, args = payload
+                if event == "bot_state_change":
+                    self._bots[id] = args[1]
+                self.dispatch(id, event, *args)
+
+        self._channels[index] = None
+        for request_id, (shard, future) in list(self._pending.items()):
+            if shard == index:
+                del self._pending[request_id]
+                if not future.done():
+                    future.set_exception(ConnectionError(f"Shard {index} is closed"))
+
+    async def _request(self, index: int, kind: str, *payload) -> Any:
+        if (channel := self._channels[index]) is None:
+            raise ConnectionError(f"Shard {index} is not connected")
+
+        request_id = next(self._request_ids)
+        future = self._pending[request_id] = (index, self.loop.create_future())
+        try:
+            channel.send((kind, request_id, *payload))
+            await channel.drain()
+            return await asyncio.wait_for(future[1], self.call_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def add(self, record: Record) -> int:
+        """
+        Create bot from account record in its shard, record is validated with `BotLoader.validate`
+        :return: bot id
+        :raises AccountError, ConstraintException
+        """
+        kwargs = BotLoader.validate(record)
+        id = kwargs["id"]
+        if id in self._bots:
+            raise ValueError(f"Bot with id {id} already in manager")
+
+        self._bots[id] = await self._request(self.shard_of(id), "add", kwargs)
+        return id
+
+    async def remove(self, id: int) -> None:
+        await self._request(self.shard_of(id), "remove", id)
+        del self._bots[id]
+
+    async def startup(self) -> None:
+        """Start bots of all shards"""
+        await asyncio.gather(*(self._request(index, "startup") for index in self._connected()))
+
+    async def call(self, id: int, method: str, *args, **kwargs) -> Any:
+        """Call bot method (sync or async) in its shard, steam models in result are replaced by ids"""
+        return await self._request(self.shard_of(id), "call", id, method, args, kwargs)
+
+    async def call_all(self, method: str, *args, **kwargs) -> list[Any]:
+        """Call manager method in every shard"""
+        return await asyncio.gather(*(self._request(i, "call", None, method, args, kwargs) for i in self._connected()))
+
+    async def send_offer(
+        self,
+        trade_url: str,
+        message: str | None = None,
+        send_items: Iterable[int] = (),
+        receive_items: Iterable[ItemRef] = (),
+        *,
+        bot_id: int | None = None,
+    ) -> OfferInfo:
+        """
+        Create and send offer in shard that owns bot.
+        Without `bot_id` offer is sent by bot selected in next shard that has active bots.
+        :param send_items: asset ids of bot items, requires `bot_id`
+        :param receive_items: partner items
+        :raises ValueError if items are passed without `bot_id`
+                ReadyRequired - if there is no ready bot to select
+        """
+        send_items = tuple(send_items)
+        if bot_id is None and send_items:
+            raise ValueError("Bot id is required to route offer with items to send")
+
+        index = self.shard_of(bot_id) if bot_id is not None else self._select_shard()
+        return await self._request(index, "send_offer", bot_id, trade_url, message, send_items, tuple(receive_items))
+
+    def _select_shard(self) -> int:
+        """Round-robin over shards with active bots"""
+        active = {self.shard_of(id) for id, state in self._bots.items() if state is BotState.Active}
+        for _ in range(self.shards):
+            index = self._cursor
+            self._cursor = (self._cursor + 1) % self.shards
+            if index in active:
+                return index
+        return index  # shard will raise ReadyRequired or activate lazy bot
+
+    def get_state(self, id: int) -> BotState:
+        return self._bots[id]
+
+    def state_counts(self) -> dict[BotState, int]:
+        """Amount of bots in every state, tracked by forwarded `bot_state_change` events"""
+        counts = dict.fromkeys(BotState, 0)
+        for state in self._bots.values():
+            counts[state] += 1
+        return counts
+
+    def _connected(self) -> list[int]:
+        return [index for index, channel in enumerate(self._channels) if channel is not None]
+
+    async def shutdown(self) -> None:
+        """Stop bots of all shards and wait for shard processes exit"""
+        await asyncio.gather(*(self._request(index, "stop") for index in self._connected()), return_exceptions=True)
+        for channel in self._channels:
+            if channel is not None:
+                channel.close()
+        if self._readers:
+            await asyncio.wait(self._readers)
+        self._readers.clear()
+
+        for process in self._processes:
+            await self.loop.run_in_executor(None, process.join, 10)
+            if process.is_alive():
+                _log.warning(f"Shard process {process.name} didn't exit, terminating")
+                process.terminate()
+        self._processes.clear()
+
+    def __len__(self) -> int:
+        return len(self._bots)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._bots
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._bots)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} shards={self.shards} len={len(self)}>"
@@ -0,0 +1,252 @@
+import asyncio
+import inspect
+import logging
+import threading
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import monotonic
+from typing import Any, Awaitable, Callable, Generic, Iterable, TypeVar
+
+from steam import Item, User
+
+from .base import LoopThread
+from .bot import ManagerBot
+from .item import BotItem
+from .manager import TradeOfferManager
+from .offer import ManagerTradeOffer
+from .outgoing import OfferPriority
+from .sending import SendResult
+
+__all__ = ("SyncManager", "OfferRequest", "CrossingStats")
+
+_log = logging.getLogger(__name__)
+_M = TypeVar("_M", bound=TradeOfferManager)
+_B = TypeVar("_B", bound=ManagerBot)
+_T = TypeVar("_T")
+
+
+@dataclass
+class CrossingStats:
+    """Latency of crossing between caller threads and manager loop thread"""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def _add(self, latency: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += latency
+            self.max = max(self.max, latency)
+
+
+@dataclass
+class OfferRequest:
+    """Offer created from trade url on manager loop and queued within `SyncManager.submit_offers` batch"""
+
+    trade_url: str
+    message: str | None = None
+    send_items: list[BotItem] | None = None
+    receive_items: list[Item] | None = None
+
+
+class SyncManager(Generic[_M, _B]):
+    """
+    Thread-safe synchronous facade of `TradeOfferManager` for threaded applications (WSGI workers, etc.).
+    Manager runs on dedicated loop thread, calls from other threads are scheduled there
+    and block until result or return `concurrent.futures.Future`.
+    Models returned by facade belong to manager loop: read them, but act on them through facade.
+    :param manager: manager with bots, that is not started yet
+    :param timeout: default seconds to wait for blocking calls, `None` - forever
+    """
+
+    def __init__(self, manager: _M, *, timeout: float | None = 120.0):
+        self.manager = manager
+        self.timeout = timeout
+        self.to_loop = CrossingStats()  # from submission to start on manager loop
+        self.from_loop = CrossingStats()  # from result on manager loop to caller wake up, blocking calls only
+
+        self._thread = LoopThread(f"{manager.__class__.__name__} loop")
+        self._outstanding: set[Future] = set()  # futures of `submit_offers` without result
+        self._outstanding_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._thread.loop
+
+    def start(self, *, startup: bool = True) -> None:
+        """
+        Start loop thread and move manager to it.
+        :param startup: start manager bots
+        """
+        self._thread.start()
+        self.manager.loop = self._thread.loop
+        self.call(self._rebind)
+        if startup:
+            self.call(self.manager.startup)
+
+    def _rebind(self) -> None:
+        for bot in self.manager:
+            bot._connection.loop = bot.loop  # steam client state binds loop on creation
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Shutdown manager and stop loop thread. Futures of `submit_offers` without result fail"""
+        try:
+            if self._thread.is_running():
+                try:
+                    self.call(self.manager.shutdown)
+                finally:
+                    self._thread.stop(timeout)
+        finally:
+            self._fail_outstanding()
+
+    def _fail_outstanding(self) -> None:
+        with self._outstanding_lock:
+            futures, self._outstanding = self._outstanding, set()
+        for future in futures:
+            try:
+                future.set_exception(RuntimeError("Manager is stopped"))
+            except InvalidStateError:  # done meanwhile
+                pass
+
+    def _track(self, future: Future) -> None:
+        with self._outstanding_lock:
+            self._outstanding.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future: Future) -> None:
+        with self._outstanding_lock:
+            self._outstanding.discard(future)
+
+    async def _run(self, submitted: float, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        self.to_loop._add(monotonic() - submitted)
+        result = fn(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def _run_timed(self, submitted: float, fn: Callable, args: tuple, kwargs: dict) -> tuple[Any, float]:
+        return await self._run(submitted, fn, args, kwargs), monotonic()
+
+    def submit(self, fn: Callable[..., _T | Awaitable[_T]], *args, **kwargs) -> "Future[_T]":
+        """Schedule call of function or coroutine function on manager loop from any thread"""
+        return self._thread.submit(self._run(monotonic(), fn, args, kwargs))
+
+    def call(self, fn: Callable[..., _T | Awaitable[_T]], *args, **kwargs) -> _T:
+        """
+        Call function or coroutine function on manager loop and wait for result.
+        :raises RuntimeError if called from manager loop thread, as it would block loop forever
+                TimeoutError - if `timeout` has passed, call is cancelled
+        """
+        if self._thread.is_current():
+            raise RuntimeError("Blocking call from manager loop thread")
+
+        future = self._thread.submit(self._run_timed(monotonic(), fn, args, kwargs))
+        try:
+            result, done_at = future.result(self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        self.from_loop._add(monotonic() - done_at)
+        return result
+
+    def create_offer(
+        self,
+        partner: User,
+        token: str | None = None,
+        message: str | None = None,
+        send_items: list[BotItem] | None = None,
+        receive_items: list[Item] | None = None,
+    ) -> ManagerTradeOffer[_B]:
+        """Blocking `TradeOfferManager.create_offer`"""
+        return self.call(self.manager.create_offer, partner, token, message, send_items, receive_items)
+
+    def create_offer_from_url(
+        self,
+        trade_url: str,
+        message: str | None = None,
+        send_items: list[BotItem] | None = None,
+        receive_items: list[Item] | None = None,
+    ) -> ManagerTradeOffer[_B]:
+        """Blocking `TradeOfferManager.create_offer_from_url`"""
+        return self.call(self.manager.create_offer_from_url, trade_url, message, send_items, receive_items)
+
+    def send_offer(self, offer: ManagerTradeOffer[_B]) -> ManagerTradeOffer[_B]:
+        """Blocking `TradeOfferManager.send_offer`"""
+        return self.call(self.manager.send_offer, offer)
+
+    def send_offers(self, offers: Iterable[ManagerTradeOffer[_B]], **kwargs) -> list[SendResult[_B]]:
+        """Blocking `TradeOfferManager.send_offers`"""
+        return self.call(self.manager.send_offers, list(offers), **kwargs)
+
+    def submit_offers(
+        self,
+        requests: Iterable[OfferRequest | ManagerTradeOffer[_B]],
+        *,
+        priority: OfferPriority = OfferPriority.Normal,
+        deadline: timedelta | None = None,
+    ) -> list["Future[SendResult[_B]]"]:
+        """
+        Put many offers in manager queue with one thread crossing, offers from requests are created on manager loop.
+        Cancelled futures are skipped if their offers aren't queued yet.
+        :return: futures in order of requests. Future raises if offer can't be created
+        """
+        requests = list(requests)
+        futures: list[Future[SendResult[_B]]] = [Future() for _ in requests]
+        for future in futures:
+            self._track(future)
+        self._thread.call_soon(self._queue_offers, monotonic(), requests, futures, priority, deadline)
+        return futures
+
+    def _queue_offers(
+        self,
+        submitted: float,
+        requests: list[OfferRequest | ManagerTradeOffer[_B]],
+        futures: list["Future[SendResult[_B]]"],
+        priority: OfferPriority,
+        deadline: timedelta | None,
+    ) -> None:
+        self.to_loop._add(monotonic() - submitted)
+        for request, future in zip(requests, futures):
+            if future.set_running_or_notify_cancel():
+                self.loop.create_task(self._queue_offer(request, future, priority, deadline), name="sync offer task")
+
+    async def _queue_offer(
+        self,
+        request: OfferRequest | ManagerTradeOffer[_B],
+        future: "Future[SendResult[_B]]",
+        priority: OfferPriority,
+        deadline: timedelta | None,
+    ) -> None:
+        try:
+            if isinstance(request, OfferRequest):
+                offer = await self.manager.create_offer_from_url(
+                    request.trade_url, request.message, request.send_items, request.receive_items
+                )
+            else:
+                offer = request
+            result = await self.manager.queue.put(offer, priority, deadline)
+        except asyncio.CancelledError as e:  # manager loop is stopped
+            future.set_exception(e)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def __enter__(self) -> "SyncManager[_M, _B]":
+        self.start()
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} manager={self.manager!r} running={self._thread.is_running()}>"
@@ -1,3 +1,4 @@
+import threading
 from typing import TypeVar, Iterator, Generic, TypeAlias
 from collections.abc import MutableMapping
 from weakref import WeakValueDictionary
@@ -6,7 +7,6 @@ from steam import TradeOffer
 
 from .offer import ManagerTradeOffer
 
-
 __all__ = ("ManagerBotTrades", "ManagerTrades")
 
 _B = TypeVar("_B", bound="bot.ManagerBot")
@@ -19,13 +19,49 @@ ItemAlias: TypeAlias = "int | ManagerTradeOffer | TradeOffer"
 class ManagerBotTrades(MutableMapping[TradeOfferId, ManagerTradeOffer[_B]], Generic[_B]):
     """
     ManagerTradeOffer's storage for ManagerBot.
+    Storage is changed on owner loop and read from manager loop, so changes and aggregated reads are locked.
     """
 
-    __slots__ = ("owner", "_storage")
+    __slots__ = ("owner", "_storage", "_partners", "_reserved", "_lock")
 
     def __init__(self, owner: _B):
         self.owner = owner
         self._storage: dict[TradeOfferId, ManagerTradeOffer] = {}
+        self._partners: dict[int, int] = {}  # partner id64 to amount of stored offers
+        self._reserved: dict[int, int] = {}  # partner id64 to amount of offers being sent
+        self._lock = threading.Lock()
+
+    def partner_offers(self, partner_id64: int) -> int:
+        """Amount of stored offers sent to partner"""
+        return self._partners.get(partner_id64, 0)
+
+    def reserved(self, partner_id64: int | None = None) -> int:
+        """Amount of offers (to partner) that are being sent and not stored yet"""
+        if partner_id64 is None:
+            with self._lock:
+                return sum(self._reserved.values())
+        return self._reserved.get(partner_id64, 0)
+
+    def reserve(self, partner_id64: int) -> None:
+        """Count offer being sent in active offers limits, must be released after sending"""
+        with self._lock:
+            self._count(self._reserved, partner_id64, 1)
+
+    def release(self, partner_id64: int) -> None:
+        with self._lock:
+            self._count(self._reserved, partner_id64, -1)
+
+    def _track(self, offer: ManagerTradeOffer, delta: int) -> None:
+        if offer.partner is not None:
+            self._count(self._partners, offer.partner.id64, delta)
+
+    @staticmethod
+    def _count(counts: dict[int, int], partner_id64: int, delta: int) -> None:
+        count = counts.get(partner_id64, 0) + delta
+        if count > 0:
+            counts[partner_id64] = count
+        else:
+            counts.pop(partner_id64, None)
 
     def add(self, offer: ManagerTradeOffer):
         if not offer.id:
@@ -57,12 +93,19 @@ class ManagerBotTrades(MutableMapping[TradeOfferId, ManagerTradeOffer[_B]], Gene
             raise ValueError("Only sent offers can be stored")
         if k != v.id:
             raise ValueError("Key and offer id must be the same")
-        self._storage[k] = v
+        with self._lock:
+            if (old := self._storage.get(k)) is not None:
+                self._track(old, -1)
+            self._storage[k] = v
+            self._track(v, 1)
 
     def __delitem__(self, v: TradeOfferId) -> None:
-        if self[v].is_active:
+        offer = self[v]
+        if offer.is_active:
             raise TypeError("You can't delete active offer!")
-        del self._storage[v]
+        with self._lock:
+            del self._storage[v]
+            self._track(offer, -1)
 
     def __getitem__(self, k: TradeOfferId) -> ManagerTradeOffer:
         return self._storage[k]
@@ -71,7 +114,8 @@ class ManagerBotTrades(MutableMapping[TradeOfferId, ManagerTradeOffer[_B]], Gene
         return len(self._storage)
 
     def __iter__(self) -> Iterator[ManagerTradeOffer]:
-        return iter(self._storage.values())
+        with self._lock:
+            return iter(list(self._storage.values()))
 
     def __contains__(self, item: ItemAlias) -> bool:
         return item in self._storage if isinstance(item, int) else item.id in self._storage
@@ -85,5 +129,12 @@ class ManagerTrades(ManagerBotTrades[_M]):
         super().__init__(owner)
         self._storage: WeakValueDictionary[TradeOfferId, ManagerTradeOffer] = WeakValueDictionary()
 
+    def partner_offers(self, partner_id64: int) -> int:
+        """Amount of active offers sent to partner by all manager bots"""
+        return sum(bot.manager_trades.partner_offers(partner_id64) for bot in self.owner)
+
+    def _track(self, offer: ManagerTradeOffer, delta: int) -> None:
+        pass  # weak storage can't track removals, counts are taken from bots storages
+
 
 from . import bot, manager
@@ -1,3 +1,4 @@
+import copy
 import urllib.parse
 from functools import wraps
 from typing import Protocol, Sequence
@@ -6,7 +7,14 @@ import steam.state
 
 from .base import ReadyRequired
 
-__all__ = ("ready_required", "parse_trade_url", "join_multiple_in_string", "copy_user")
+__all__ = (
+    "ready_required",
+    "available_required",
+    "parse_trade_url",
+    "join_multiple_in_string",
+    "copy_user",
+    "bind_user",
+)
 
 
 class _HasIsReadyProtocol(Protocol):
@@ -25,6 +33,24 @@ def ready_required(func):
     return wrapper
 
 
+class _HasIsAvailableProtocol(Protocol):
+    def is_available(self) -> bool:
+        ...
+
+
+def available_required(func):
+    """Like `ready_required`, but allows lazy bots that can be started on demand"""
+
+    @wraps(func)
+    def wrapper(self: _HasIsAvailableProtocol, *args, **kwargs):
+        if self.is_available():
+            return func(self, *args, **kwargs)
+        else:
+            raise ReadyRequired("Client is not ready or bot is closed/stopped!")
+
+    return wrapper
+
+
 # def ready_required(exc: Exception):
 #     def inner(func):
 #         @wraps(func)
@@ -52,40 +78,19 @@ class _HasConnectionState(Protocol):
     _connection: steam.state.ConnectionState
 
 
+def bind_user(user: steam.User, state: steam.state.ConnectionState) -> steam.User:
+    """
+    Shallow copy of `steam.User` bound to other client state.
+    Copy shares all attributes with original user, so it is cheap to create and don't duplicate profile data.
+    """
+    view = copy.copy(user)
+    view._state = state
+    return view
+
+
 def copy_user(bot: _HasConnectionState, user: steam.User) -> steam.User:
-    """Deepcopy `steam.User` and cache it in client"""
-    user_data = {
-        "steamid": user.id64,
-        "personaname": user.name,
-        "profileurl": user.community_url,
-        "realname": user.real_name,
-        "communityvisibilitystate": user.privacy_state.value if user.privacy_state else 0,
-        "profilestate": user._setup_profile,
-        "commentpermission": user._is_commentable,
-        "personastate": user.state.value if user.state else 0,
-        "personastateflags": user.flags.value if user.flags else 0,
-        "avatar": "",
-        "avatarmedium": "",
-        "avatarfull": user.avatar_url,
-        "avatarhash": "",
-        "loccountrycode": user.country,
-        "locstatecode": 0,
-        "loccityid": 0,
-    }
-    if user.primary_clan:
-        user_data |= {"primaryclanid": user.primary_clan.id64}
-    if user.created_at:
-        user_data |= {"timecreated": user.created_at.timestamp()}
-    if user.last_logoff:
-        user_data |= {"lastlogoff": user.last_logoff.timestamp()}
-    if user.last_logon:
-        user_data |= {"last_logon": user.last_logon.timestamp()}
-    if user.last_seen_online:
-        user_data |= {"last_seen_online": user.last_seen_online.timestamp()}
-    if user.game:
-        user_data |= {"gameextrainfo": user.game.name, "gameid": user.game.id}
-
-    new_user = steam.User(state=bot._connection, data=user_data)
+    """Bind `steam.User` to bot state and cache it in client"""
+    new_user = bind_user(user, bot._connection)
     bot._connection._users[user.id64] = new_user
 
     return new_user
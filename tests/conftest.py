@@ -29,4 +29,4 @@ async def bot(event_loop):
     if not bot_instance.is_closed():
         await bot_instance.close()
 
-    bot_instance.__del__()
+    bot_instance._release_constraints()
@@ -68,6 +68,10 @@ async def fetch_user(self: steam.Client, id: steam.utils.Intable):
     return steam.User(self._connection, {**user_dict(), "steamid": id64})
 
 
+async def fetch_users(self: steam.Client, *ids: steam.utils.Intable):
+    return [await fetch_user(self, id) for id in ids]
+
+
 async def close(self: steam.Client) -> None:
     if self.is_closed():
         return
@@ -89,6 +93,7 @@ def mock_client(session_mocker: MockerFixture):
     session_mocker.patch.object(steam.Client, "close", close)
     session_mocker.patch.object(steam.Client, "trade_url", AsyncMock(return_value=bot_trade_url()))
     session_mocker.patch.object(steam.Client, "fetch_user", fetch_user)
+    session_mocker.patch.object(steam.Client, "fetch_users", fetch_users)
 
 
 async def inventory(self: steam.ClientUser, game: steam.Game):
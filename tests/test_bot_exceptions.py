@@ -26,7 +26,7 @@ class TestBotExceptions:
 
         if not bot_instance.is_closed():
             await bot_instance.close()
-        bot_instance.__del__()
+        bot_instance._release_constraints()
 
     @pytest.mark.asyncio
     async def test_timeout(self, bot, mocker: MockerFixture):
@@ -0,0 +1,71 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot
+from steam_tradeoffer_manager.base import ConnectorPool
+
+from data import *
+
+
+@pytest.fixture
+async def server():
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    async with TestServer(app) as server_instance:
+        yield server_instance
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TradeOfferManager()
+    manager_instance.loop = event_loop
+    manager_instance.share_connectors = True
+
+    yield manager_instance
+
+    await manager_instance.shutdown()  # closes shared connectors
+
+
+@pytest.fixture
+def bot():
+    bot_instance = ManagerBot(BOT_USERNAME + "conn", BOT_PASSWORD, SHARED_SECRET, IDENTITY_SECRET, id=BOT_ID)
+
+    yield bot_instance
+
+    if bot_instance.pool is not None:
+        bot_instance.pool.remove(bot_instance)
+    bot_instance._release_constraints()
+
+
+@pytest.mark.asyncio
+async def test_shared_connector(server: TestServer):
+    pool = ConnectorPool(limit=10)
+    for _ in range(2):
+        session = aiohttp.ClientSession(
+            connector=pool.get("direct"), connector_owner=False, trace_configs=[pool.trace_config("direct")]
+        )
+        async with session.get(server.make_url("/")) as r:
+            await r.read()
+        await session.close()
+
+    connector = pool.get("direct")
+    assert not connector.closed and len(pool) == 1
+    assert pool.stats["direct"].created == 1 and pool.stats["direct"].reused == 1
+    assert pool.stats["direct"].acquired == 3
+
+    await pool.close()
+    assert connector.closed and not pool
+
+
+@pytest.mark.asyncio
+async def test_bot_session_options(manager, bot):
+    assert "connector" not in bot.http_session_options()
+
+    manager.add(bot)
+    options = bot.http_session_options()
+    assert options["connector"] is manager.connectors.get(bot.proxy_key) and not options["connector_owner"]
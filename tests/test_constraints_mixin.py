@@ -1,3 +1,5 @@
+import gc
+
 import pytest
 
 from steam_tradeoffer_manager.base import ConstraintsMixin
@@ -36,5 +38,16 @@ def test_mixin_constraint_work(get_c):
 
 def test_mixin_constraint_hash_clearing(get_c):
     c = get_c("1", "2", arg3="3")
-    c.__del__()
+    c._release_constraints()
+    c1 = get_c("1", "2", arg3="3")
+    c._release_constraints()  # released once, don't touch hashes of c1
+    with pytest.raises(ConstraintException):
+        get_c("1", "2", arg3="3")
+
+
+def test_mixin_constraint_gc_clearing(get_c):
     c = get_c("1", "2", arg3="3")
+    c.self_ref = c  # reference cycle
+    del c
+    gc.collect()
+    assert get_c("1", "2", arg3="3")
@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+import steam
+from aiohttp.test_utils import TestClient, TestServer
+
+from steam_tradeoffer_manager import ManagerBot, TradeOfferManager, ControlServer, ItemRef
+
+from data import *
+
+TOKEN = "control token"
+
+
+def test_item_ref():
+    partner = steam.User(ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} item ref"})._connection, user_dict())
+    asset = ItemRef(ITEMS_GAME.id, 1, context_id=6).to_asset(partner)
+    assert asset.to_dict() == {"assetid": "1", "amount": 1, "appid": str(ITEMS_GAME.id), "contextid": "6"}
+
+
+class TestControlServer:
+    @pytest.fixture(scope="class")
+    async def manager(self, event_loop):
+        manager_instance = TradeOfferManager()
+        manager_instance.loop = event_loop
+        manager_instance.randomizer = None
+        manager_instance.offer_cancel_delay = None
+        manager_instance.prefetch_games = (ITEMS_GAME,)
+        manager_instance.add(ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} control", "id": BOT_ID + 600}))
+        await manager_instance.startup()
+        await asyncio.sleep(0.01)  # inventory update events
+
+        yield manager_instance
+
+        await manager_instance.shutdown()
+        for bot in list(manager_instance):
+            manager_instance.remove(bot)
+            bot._release_constraints()
+
+    @pytest.fixture(scope="class")
+    async def client(self, manager):
+        server = ControlServer(manager, token=TOKEN)
+        server._hook()
+        client_instance = TestClient(TestServer(server.app), headers={"Authorization": f"Bearer {TOKEN}"})
+        await client_instance.start_server()
+
+        yield client_instance
+
+        await server.stop()
+        await client_instance.close()
+
+    @pytest.mark.asyncio
+    async def test_auth(self, client):
+        resp = await client.get("/bots", headers={"Authorization": "Bearer wrong"})
+        assert resp.status == 401
+
+    @pytest.mark.asyncio
+    async def test_bots(self, client):
+        data = await (await client.get("/bots")).json()
+        assert data["bots"][0]["id"] == BOT_ID + 600 and data["bots"][0]["ready"]
+        assert data["states"]["Active"] == 1
+
+    @pytest.mark.asyncio
+    async def test_inventory(self, client, manager):
+        bot: ManagerBot = manager[BOT_ID + 600]
+        asset_ids = [item.asset_id for item in bot.inventory.items[:2]]
+
+        data = await (await client.get("/inventory", params={"asset_id": ",".join(map(str, asset_ids))})).json()
+        assert [item["asset_id"] for item in data["items"]] == asset_ids
+
+        resp = await client.get("/inventory")
+        assert resp.status == 400
+
+        resp = await client.get("/inventory", params={"bot": "1"})
+        assert resp.status == 404 and "Unknown bot" in (await resp.json())["error"]
+
+    @pytest.mark.asyncio
+    async def test_offers_and_events(self, client, manager):
+        bot: ManagerBot = manager[BOT_ID + 600]
+        events = await client.get("/events", params={"events": "manager_trade_send"})
+        await asyncio.sleep(0.01)  # stream is registered
+
+        offers = [
+            {"trade_url": USER_TRADE_URL, "message": TRADE_MSG, "send_items": [bot.inventory.items[-1].asset_id]},
+            {"trade_url": USER_TRADE_URL, "receive_items": [{"app_id": ITEMS_GAME.id, "asset_id": 1}]},
+            {"trade_url": "invalid"},
+        ]
+        data = await (await client.post("/offers", json={"offers": offers, "priority": "High"})).json()
+        results = data["results"]
+
+        assert [result["ok"] for result in results] == [True, True, False]
+        assert results[0]["offer"]["bot_id"] == BOT_ID + 600 and "partner" in results[2]["error"]
+
+        line = await asyncio.wait_for(events.content.readline(), 1)
+        assert line == b"event: manager_trade_send\n"
+        events.close()
+
+        trades = (await (await client.get("/trades", params={"partner": USER_ID, "state": "Active"})).json())["trades"]
+        assert sorted(trade["id"] for trade in trades) == sorted(result["offer"]["id"] for result in results[:2])
+
+    @pytest.mark.asyncio
+    async def test_offers_no_wait(self, client, manager, caplog):
+        bot: ManagerBot = manager[BOT_ID + 600]
+        offers = [{"trade_url": USER_TRADE_URL, "send_items": [bot.inventory.items[0].asset_id]}]
+        resp = await client.post("/offers", json={"offers": offers, "wait": False, "deadline": 0})
+        assert resp.status == 202 and len((await resp.json())["queued"]) == 1
+
+        await asyncio.sleep(0.01)  # expired in queue, result is logged
+        assert "Queued offer" in caplog.text and "TimeoutError" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_bad_requests(self, client):
+        bodies = [
+            [],
+            {"offers": [{"message": TRADE_MSG}]},
+            {"offers": [{"trade_url": USER_TRADE_URL, "send_items": ["asset"]}]},
+            {"offers": [{"trade_url": USER_TRADE_URL, "receive_items": [{"asset_id": 1}]}]},
+            {"offers": [], "priority": "Urgent"},
+            {"offers": [], "deadline": "soon"},
+        ]
+        for body in bodies:
+            resp = await client.post("/offers", json=body)
+            assert resp.status == 400 and (await resp.json())["error"]
+
+        assert (await client.get("/trades", params={"state": "Unknown"})).status == 400
+        assert (await client.get("/inventory", params={"asset_id": "1,x"})).status == 400
+
+    @pytest.mark.asyncio
+    async def test_stop(self, manager):
+        dispatch = manager.dispatch
+        server = ControlServer(manager, queue_size=1)
+        server._hook()
+        queue = asyncio.Queue(server.queue_size)
+        server._streams.add(queue)
+        manager.dispatch(manager[BOT_ID + 600], "control_test")  # fills stream queue
+
+        await server.stop()
+        assert queue.get_nowait() is None and manager.dispatch == dispatch
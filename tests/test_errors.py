@@ -0,0 +1,51 @@
+import pytest
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot
+from steam_tradeoffer_manager.base import ErrorLog
+
+from data import *
+
+
+def test_ring_buffer():
+    log = ErrorLog(maxlen=2)
+    errors = [ValueError(i) for i in range(3)]
+    for error in errors:
+        log.record(error, "on_trade_receive")
+
+    assert len(log) == 2 and log.total == 3 and errors[0] not in log and list(log) == errors[1:]
+
+    stats = log.stats[("ValueError", "on_trade_receive")]
+    assert stats.count == 3 and stats.first_seen <= stats.last_seen and stats.last_message == "2"
+
+    log.clear()
+    assert not log and log.last is None and log.total == 3
+
+
+def test_traceback_dropped():
+    log = ErrorLog()
+    try:
+        raise ValueError("v")
+    except ValueError as e:
+        log.record(e, "start")
+
+    assert log.last.error.__traceback__ is None and "raise ValueError" in log.last.traceback
+
+
+@pytest.mark.asyncio
+async def test_error_summary():
+    manager = TradeOfferManager()
+    bots = [
+        ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} errors {i}", "id": BOT_ID + 800 + i}) for i in (0, 1)
+    ]
+    for bot in bots:
+        manager.add(bot)
+        bot.errors.record(TimeoutError(), "start")
+    await manager.on_error("on_ready", KeyError("k"))
+
+    summary = manager.error_summary()
+    assert summary[("TimeoutError", "start")].count == 2 and summary[("KeyError", "on_ready")].count == 1
+    assert bots[0].errors.stats[("TimeoutError", "start")].count == 1  # bot counters stay untouched
+
+    for bot in bots:
+        manager.remove(bot)
+        bot._release_constraints()
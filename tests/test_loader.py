@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from steam_tradeoffer_manager import TradeOfferManager, BotLoader
+
+from data import *
+
+
+def account(index: int, **overrides) -> dict:
+    return {
+        "username": f"{BOT_USERNAME} loaded {index}",
+        "password": BOT_PASSWORD,
+        "shared_secret": SHARED_SECRET,
+        "identity_secret": IDENTITY_SECRET,
+        "id": BOT_ID + 100 + index,
+        **overrides,
+    }
+
+
+def write_jsonl(path, *records):
+    path.write_text("\n".join(json.dumps(record) for record in records))
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TradeOfferManager()
+    manager_instance.loop = event_loop
+
+    yield manager_instance
+
+    for bot in list(manager_instance):
+        manager_instance.remove(bot)
+        bot._release_constraints()
+
+
+def test_validate():
+    kwargs = BotLoader.validate(account(1, prefetch_games="730;440:3", offer_cancel_delay="60"))
+    assert [(g.id, g.context_id) for g in kwargs["prefetch_games"]] == [(730, 2), (440, 3)]
+    assert kwargs["offer_cancel_delay"].total_seconds() == 60
+
+
+def test_load_csv(manager, tmp_path):
+    path = tmp_path / "accounts.csv"
+    fields = ("username", "password", "shared_secret", "identity_secret", "id", "proxy")
+    rows = [",".join(fields)]
+    rows += [",".join(str(account(i, proxy="http://proxy:80").get(f, "")) for f in fields) for i in range(3)]
+    rows.append(",".join(str(account(0).get(f, "")) for f in fields))  # duplicate
+    rows.append("user,,,,1,")  # invalid
+    path.write_text("\n".join(rows))
+
+    report = BotLoader(manager).load(path)
+
+    assert len(report.added) == len(manager) == 3 and [n for n, _ in report.errors] == [4, 5]
+    assert manager[account(1)["id"]].http.proxy == "http://proxy:80"
+
+
+@pytest.mark.asyncio
+async def test_reload(manager, tmp_path):
+    path = tmp_path / "accounts.jsonl"
+    write_jsonl(path, account(1), account(2), account(3))
+    loader = BotLoader(manager)
+    loader.load(path)
+    bot2 = manager[account(2)["id"]]
+
+    write_jsonl(path, account(2, offer_cancel_delay=30), account(3, password="new"), account(4))
+    report = await loader.reload(path)
+
+    assert report.added == [account(4)["id"]] and report.removed == [account(1)["id"]]
+    assert report.updated == [account(2)["id"], account(3)["id"]]
+    assert manager[account(2)["id"]] is bot2 and bot2.offer_cancel_delay.total_seconds() == 30
+    assert manager[account(3)["id"]].password == "new" and len(manager) == len(loader) == 3
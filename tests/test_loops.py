@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from datetime import timedelta
+
+import pytest
+import steam
+
+from steam_tradeoffer_manager import ManagerBot, TradeOfferManager, ManagerBotState
+from steam_tradeoffer_manager.base import LoopThread, run_in_loop, running_loop
+
+from data import *
+
+
+@pytest.mark.asyncio
+async def test_run_in_loop():
+    thread = LoopThread("test loop")
+    thread.start()
+
+    async def whoami():
+        return threading.get_ident()
+
+    assert await run_in_loop(thread.loop, whoami()) != threading.get_ident()
+    assert await run_in_loop(asyncio.get_running_loop(), whoami()) == threading.get_ident()
+    assert running_loop() is asyncio.get_running_loop()
+    assert await asyncio.to_thread(running_loop) is None
+
+    thread.stop(1)
+    assert not thread.is_running() and thread.loop.is_closed()
+
+
+class TestLoopGroups:
+    @pytest.fixture(scope="class")
+    async def manager(self, event_loop):
+        manager_instance = TradeOfferManager()
+        manager_instance.loop = event_loop
+        manager_instance.loop_groups = 2
+        manager_instance.randomizer = None
+        manager_instance.offer_cancel_delay = None
+        for i in range(2):
+            manager_instance.add(
+                ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} grouped {i}", "id": BOT_ID + 400 + i})
+            )
+        manager_instance.add(
+            ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} grouped slow", "id": BOT_ID + 402}), group="slow"
+        )
+
+        yield manager_instance
+
+        await manager_instance.shutdown()
+        for bot in list(manager_instance):
+            manager_instance.remove(bot)
+            bot._release_constraints()
+
+    @pytest.mark.asyncio
+    async def test_startup(self, manager):
+        threads = []
+
+        async def on_ready(_):
+            threads.append(threading.get_ident())
+
+        manager.on_ready = on_ready
+        await manager.startup()
+        await asyncio.sleep(0.05)  # state changes and events are delivered to manager loop
+
+        assert len({bot.loop for bot in manager} | {manager.loop}) == 4
+        assert all(bot.is_ready() for bot in manager) and len(manager.by_state(ManagerBotState.Active)) == 3
+        assert threads == [threading.get_ident()] * 3
+
+    @pytest.mark.asyncio
+    async def test_send_offer(self, manager):
+        bot: ManagerBot = manager[BOT_ID + 402]
+        partner = steam.User(bot._connection, user_dict())
+        offer = await manager.send_offer(bot.create_offer(partner, USER_TOKEN))
+        await asyncio.sleep(0.05)
+
+        assert offer.id in bot.manager_trades and offer in manager.trades
+
+    @pytest.mark.asyncio
+    async def test_wait_closed(self, manager):
+        bot: ManagerBot = manager[BOT_ID + 402]
+        offer = bot.create_offer(steam.User(bot._connection, user_dict()), USER_TOKEN)
+        await offer.send()  # sent on bot loop
+        waiter = asyncio.ensure_future(offer.wait_closed(1))
+
+        async def close():
+            offer._steam_offer.state = steam.TradeOfferState.Accepted
+            bot._close_trade_offer(offer._steam_offer)
+
+        await bot.call_threadsafe(close())
+        assert await waiter is offer and offer.is_closed
+        assert await bot.call_threadsafe(offer.wait_closed(1)) is offer  # awaited from bot loop
+
+    @pytest.mark.asyncio
+    async def test_shutdown(self, manager):
+        threads = [bot._loop_thread for bot in manager]
+        await manager.shutdown()
+
+        assert all(bot.is_closed() for bot in manager) and not any(thread.is_running() for thread in threads)
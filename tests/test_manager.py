@@ -1,10 +1,40 @@
 import asyncio
 
+import aiohttp
 import pytest
+import steam
+from pytest_mock import MockerFixture
 
 from data import *
-from steam_tradeoffer_manager import ManagerBot, TradeOfferManager
-from steam_tradeoffer_manager.base.exceptions import ConstraintException
+from steam_tradeoffer_manager import (
+    ManagerBot,
+    TradeOfferManager,
+    OfferPriority,
+    ManagerBotState,
+    PartnerCache,
+    is_transient_error,
+)
+from steam_tradeoffer_manager.base.exceptions import ConstraintException, OffersLimitExceeded
+
+
+def test_transient_errors(mocker: MockerFixture):
+    assert is_transient_error(steam.HTTPException(mocker.Mock(status=429), None))
+    assert is_transient_error(aiohttp.ClientConnectorError(mocker.Mock(), ConnectionRefusedError()))
+    # steam might have created offer already
+    assert not is_transient_error(steam.HTTPException(mocker.Mock(status=502), None))
+    assert not is_transient_error(asyncio.TimeoutError())
+    assert not is_transient_error(aiohttp.ServerDisconnectedError())
+
+
+def test_partner_cache_size(mocker: MockerFixture):
+    cache = PartnerCache(TradeOfferManager(), maxsize=2)
+    users = [mocker.Mock(id64=USER_ID + i) for i in range(3)]
+    cache.put(users[0])
+    cache.put(users[1])
+    assert cache.get(users[0].id64) is users[0]  # recently used
+
+    cache.put(users[2])
+    assert len(cache) == 2 and users[1].id64 not in cache and users[0].id64 in cache
 
 
 class TestManager:
@@ -58,6 +88,22 @@ class TestManager:
         bot: ManagerBot = next(iter(manager))
         assert bot.is_ready()
 
+    def test_state_indexes(self, manager):
+        assert set(manager.by_state(ManagerBotState.Active)) == set(manager)
+        assert manager.state_counts()[ManagerBotState.Stopped] == 0
+
+        bot: ManagerBot = next(iter(manager))
+        assert bot.uptime > 0 and bot.state_time(ManagerBotState.Waiting) > 0
+
+    @pytest.mark.asyncio
+    async def test_items(self, manager):
+        bot: ManagerBot = next(iter(manager))
+        await manager.on_inventory_update(bot, bot.inventory)
+
+        assert bot.inventory.items and all(manager.items[item.asset_id] is item for item in bot.inventory.items)
+        with pytest.raises(ValueError):
+            manager.items[bot.inventory.items[0].asset_id + 1] = bot.inventory.items[0]
+
     @pytest.mark.asyncio
     async def test_offer_create(self, manager):
         bot: ManagerBot = next(iter(manager))
@@ -120,8 +166,207 @@ class TestManager:
         )
         assert len(offers) == len(manager)
 
+    @pytest.mark.asyncio
+    async def test_partners_cache(self, manager):
+        manager.partners.invalidate()
+        fetches = manager.partners.stats.fetches
+
+        offers = await asyncio.gather(
+            *(manager.create_offer_from_url(url) for url in (TRADE_URL, USER_TRADE_URL, TRADE_URL))
+        )
+        assert manager.partners.stats.fetches == fetches + 1
+        assert offers[0].partner.id64 == offers[2].partner.id64 != offers[1].partner.id64
+
+        await manager.create_offer_from_url(USER_TRADE_URL)
+        assert manager.partners.stats.fetches == fetches + 1 and manager.partners.stats.hit_rate > 0
+
+    @pytest.mark.asyncio
+    async def test_partner_views(self, manager):
+        bot, other = list(manager)[:2]
+        user = await other.fetch_user(USER_ID)
+        bot.partner_views.maxsize = 1
+
+        offer = manager.create_offer(user, USER_TOKEN, send_items=[bot.inventory.items[0]])
+        assert offer.partner._state is bot._connection and offer.partner.name == user.name
+        assert bot.partner_views.bind(user) is offer.partner
+
+        bot.partner_views.bind(await other.fetch_user(USER_ID + 1))
+        assert USER_ID not in bot.partner_views and len(bot.partner_views) == 1
+
+        manager.partners.invalidate(USER_ID + 1)  # views share attributes with invalidated snapshot
+        assert not bot.partner_views and bot.get_user(USER_ID + 1) is None
+
+    @pytest.mark.asyncio
+    async def test_receive_only_offer(self, manager, mocker: MockerFixture):
+        bots = list(manager)
+        user = await bots[0].fetch_user(USER_ID)
+        expected = bots[-1]
+        checks = [mocker.patch.object(bot, "is_ready", return_value=False) for bot in bots[:-1]]
+
+        offer = manager.create_offer(user, USER_TOKEN, TRADE_MSG)
+        assert offer.owner is expected and manager.selector._parked
+        calls = [check.call_count for check in checks]
+        assert manager.create_offer(user, USER_TOKEN, TRADE_MSG).owner is expected
+        assert [check.call_count for check in checks] == calls  # parked bots aren't checked again
+
+        mocker.stopall()
+        for bot in bots:
+            manager.selector.update(bot)
+        offer = manager.create_offer(user, USER_TOKEN, TRADE_MSG)
+        assert not manager.selector._parked
+        assert len(offer.owner.manager_trades) == min(len(bot.manager_trades) for bot in manager)
+
+    @pytest.mark.asyncio
+    async def test_offers_limit(self, manager):
+        bot: ManagerBot = next(iter(manager))
+        user = await bot.fetch_user(USER_ID)
+        bot.max_partner_offers = 0
+
+        with pytest.raises(OffersLimitExceeded):
+            await manager.send_offer(bot.create_offer(user, USER_TOKEN, send_items=[bot.inventory.items[0]]))
+
+        original = bot.create_offer(user, USER_TOKEN)
+        waiter = asyncio.ensure_future(original.wait_closed())
+        offer = await manager.send_offer(original)
+        bot.max_partner_offers = None
+
+        assert offer is original and offer.owner is not bot and offer in offer.owner.manager_trades
+
+        offer._steam_offer.state = steam.TradeOfferState.Accepted
+        offer.owner._close_trade_offer(offer._steam_offer)
+        assert await asyncio.wait_for(waiter, 1) is original  # waiters of rerouted offer are resolved
+
+    @pytest.mark.asyncio
+    async def test_offer_headroom_reserved(self, manager, mocker: MockerFixture):
+        bot: ManagerBot = next(iter(manager))
+        user = await bot.fetch_user(USER_ID)
+        bot.max_partner_offers = bot.manager_trades.partner_offers(USER_ID) + 1
+
+        async def send(*_, **__):
+            await asyncio.sleep(0.01)
+            raise steam.HTTPException(mocker.Mock(status=500), None)
+
+        mocker.patch.object(steam.User, "send", send)
+        offers = [bot.create_offer(user, USER_TOKEN) for _ in range(2)]
+        results = await asyncio.gather(*(bot.send_offer(offer) for offer in offers), return_exceptions=True)
+        bot.max_partner_offers = None
+
+        assert isinstance(results[0], steam.HTTPException) and isinstance(results[1], OffersLimitExceeded)
+        assert bot.manager_trades.reserved() == 0  # released after failed send
+
+    @pytest.mark.asyncio
+    async def test_send_offers(self, manager, mocker: MockerFixture):
+        offers = await manager.create_offers_from_url(
+            TRADE_URL,
+            TRADE_MSG,
+            [bot.inventory.items[0] for bot in manager],
+        )
+        failing = offers[0]
+        error = steam.HTTPException(mocker.Mock(status=429), None)
+        mocker.patch.object(failing.owner, "send_offer", mocker.AsyncMock(side_effect=[error, None]))
+
+        results = await manager.send_offers(offers, retry_delay=0)
+
+        assert [result.offer for result in results] == offers
+        assert all(result.ok for result in results)
+        assert results[0].attempts == 2
+        assert manager.send_stats.sent == len(offers) and manager.send_stats.retries == 1
+        assert manager.send_stats.throughput > 0
+
+    @pytest.mark.asyncio
+    async def test_queue(self, manager):
+        bot: ManagerBot = next(iter(manager))
+        low, high, expired = [
+            await bot.create_offer_from_trade_url(TRADE_URL, TRADE_MSG, [bot.inventory.items[0]]) for _ in range(3)
+        ]
+
+        futures = [
+            manager.queue.put(low, OfferPriority.Low),
+            manager.queue.put(high, OfferPriority.High),
+            manager.queue.put(expired, OfferPriority.High, deadline=timedelta()),
+        ]
+        low_result, high_result, expired_result = await asyncio.gather(*futures)
+
+        assert low_result.ok and high_result.ok and high.id < low.id
+        assert isinstance(expired_result.error, asyncio.TimeoutError)
+        assert manager.queue.wait_stats[OfferPriority.Low].count == 1
+        assert not manager.queue
+
+    @pytest.mark.asyncio
+    async def test_queue_hold(self, manager, mocker: MockerFixture):
+        bot: ManagerBot = next(iter(manager))
+        offers = [
+            await bot.create_offer_from_trade_url(TRADE_URL, TRADE_MSG, [bot.inventory.items[0]]) for _ in range(2)
+        ]
+        mocker.patch.object(manager.queue, "hold_interval", 0.01)
+        mocker.patch.object(bot, "is_ready", return_value=False)
+        mocker.patch.object(bot, "wait_until_ready", side_effect=asyncio.Event().wait)
+
+        held = manager.queue.put(offers[0])
+        await asyncio.sleep(0.02)
+        expired = manager.queue.put(offers[1], deadline=timedelta(seconds=0.02))  # shorter than running wait
+        assert isinstance((await asyncio.wait_for(expired, 1)).error, asyncio.TimeoutError)
+
+        bot._set_state(ManagerBotState.InvalidCredentials)  # failed while offers are held
+        try:
+            result = await asyncio.wait_for(held, 1)
+        finally:
+            bot._set_state(ManagerBotState.Active)
+        assert isinstance(result.error, ValueError) and not manager.queue
+
     def test_remove(self, manager):
         bot: ManagerBot = next(iter(manager))
         manager.remove(bot)
 
         assert not bot.manager
+
+
+class TestLazyManager:
+    @pytest.fixture(scope="class")
+    async def manager(self, event_loop):
+        manager_instance = TradeOfferManager()
+        manager_instance.loop = event_loop
+        manager_instance.lazy = True
+        manager_instance.randomizer = None
+        manager_instance.offer_cancel_delay = None
+        manager_instance.hibernate_after = timedelta(seconds=0.2)
+        manager_instance.add(ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} lazy"}))
+
+        yield manager_instance
+
+        await manager_instance.shutdown()
+        for bot in list(manager_instance):
+            manager_instance.remove(bot)
+            bot._release_constraints()
+
+    @pytest.mark.asyncio
+    async def test_activation(self, manager):
+        await manager.startup()
+        bot: ManagerBot = next(iter(manager))
+        assert not bot.is_ready() and bot.is_available()
+
+        partner = steam.User(bot._connection, user_dict())
+        offer = await manager.send_offer(manager.create_offer(partner, USER_TOKEN))
+
+        assert bot.is_ready() and offer.id in bot.manager_trades
+        await offer.cancel()
+        bot._close_trade_offer(offer._steam_offer)
+
+    @pytest.mark.asyncio
+    async def test_hibernation(self, manager):
+        bot: ManagerBot = next(iter(manager))
+        await asyncio.wait_for(bot._running_task, 2)  # hibernated while idle
+
+        assert bot.state is ManagerBotState.Hibernated and bot.is_available()
+        await bot.activate(timeout=1)
+        assert bot.is_ready()
+
+    @pytest.mark.asyncio
+    async def test_hibernate_once(self, manager, mocker: MockerFixture):
+        bot: ManagerBot = next(iter(manager))
+        await bot.activate(timeout=1)
+        stop = mocker.spy(bot, "stop")
+
+        await asyncio.gather(bot.hibernate(), bot.hibernate())
+        await asyncio.wait_for(bot._running_task, 2)
+        assert stop.call_count == 1 and bot.state is ManagerBotState.Hibernated
@@ -1,7 +1,9 @@
 import asyncio
+from unittest.mock import AsyncMock
 
 import pytest
 import steam
+from steam.guard import Confirmation
 from pytest_mock import MockerFixture
 
 from data import *
@@ -55,6 +57,70 @@ class TestBot:
 
         assert offer._cancel_delay_timer.cancelled()
 
+    @pytest.mark.asyncio
+    async def test_wait_closed(self, bot):
+        offer: ManagerTradeOffer = await bot.create_offer_from_trade_url(TRADE_URL, message=TRADE_MSG)
+        await offer.send()
+        closed = []
+        offer.add_done_callback(closed.append)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await offer.wait_closed(timeout=0.01)
+
+        await offer.cancel()
+        bot._close_trade_offer(offer._steam_offer)
+
+        assert await offer.wait_closed(timeout=1) is offer
+        await asyncio.sleep(0)  # callbacks are scheduled with call_soon
+        assert offer.is_closed and closed == [offer]
+
+    @pytest.mark.asyncio
+    async def test_batched_confirmations(self, bot, mocker: MockerFixture):
+        offers = [await bot.create_offer_from_trade_url(TRADE_URL) for _ in range(3)]
+        for offer in offers:
+            offer.cancel_delay = timedelta(minutes=1)
+            await offer.send()
+
+        # last offer has no confirmation
+        confirmations = {o.id: Confirmation(bot._connection, str(o.id), o.id, "key", o.id) for o in offers[:2]}
+        fetch = mocker.patch.object(bot._connection, "_fetch_confirmations", AsyncMock(return_value=confirmations))
+        post = mocker.patch.object(bot.http, "post", AsyncMock(return_value={"success": True}))
+        mocker.patch.object(Confirmation, "_confirm_params", return_value={})
+
+        results = await asyncio.gather(*(o.confirm() for o in offers), return_exceptions=True)
+
+        assert results[:2] == [None, None] and isinstance(results[2], steam.ConfirmationError)
+        assert fetch.await_count == post.await_count == 1
+        assert bot.confirmations.batches == 1 and bot.confirmations.confirmed == 2
+
+        for offer in offers:
+            await offer.cancel()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_share_confirmation(self, bot, mocker: MockerFixture):
+        async def send(user: steam.User, content=None, *, trade: steam.TradeOffer | None = None, image=None):
+            trade._update_from_send(user._state, trade_data(), user, active=False)  # needs mobile confirmation
+            trade._has_been_sent = True
+            await trade.confirm()
+            trade.state = steam.TradeOfferState.Active
+
+        class Confirmations(dict):
+            def get(self, trade_id: int, default=None) -> Confirmation:
+                return Confirmation(bot._connection, str(trade_id), trade_id, "key", trade_id)
+
+        mocker.patch.object(steam.User, "send", send)
+        mocker.patch.object(bot._connection, "_fetch_confirmations", AsyncMock(return_value=Confirmations()))
+        mocker.patch.object(bot.http, "post", AsyncMock(return_value={"success": True}))
+        mocker.patch.object(Confirmation, "_confirm_params", return_value={})
+        batches, confirmed = bot.confirmations.batches, bot.confirmations.confirmed
+
+        offers = [await bot.create_offer_from_trade_url(TRADE_URL) for _ in range(4)]
+        await asyncio.gather(*(bot.send_offer(offer) for offer in offers))
+
+        # offers sent at once are confirmed together
+        assert bot.confirmations.confirmed - confirmed == 4 and bot.confirmations.batches - batches < 4
+        assert bot.confirmations.largest > 1
+
     @pytest.mark.asyncio
     async def test_bot_close(self, bot):
         await bot.close()
@@ -72,6 +138,36 @@ class TestBot:
         assert bot.is_ready()
 
 
+class TestWarmRestart:
+    @pytest.mark.asyncio
+    async def test_warm_restart(self, bot, mocker: MockerFixture):
+        bot.randomizer = None
+        await bot.start()
+        inv = await bot.inventory.fetch_game_inventory(ITEMS_GAME)
+        offer: ManagerTradeOffer = await bot.create_offer_from_trade_url(TRADE_URL)
+        offer.cancel_delay = timedelta(minutes=1)
+        await offer.send()
+        deadline = offer._cancel_deadline
+
+        head = {"total_inventory_count": len(inv.items), "assets": [{"assetid": str(inv.items[0].asset_id)}]}
+        get = mocker.patch.object(bot.http, "get", AsyncMock(return_value=head))
+        update = mocker.spy(steam.trade.BaseInventory, "update")
+
+        await bot.restart(warm=True)
+        await asyncio.sleep(0.01)  # wait for on_ready
+
+        assert get.await_count == 1 and update.call_count == 0
+        assert bot.inventory.get_game_inventory(ITEMS_GAME) is inv
+        assert not offer._cancel_delay_timer.done() and offer._cancel_deadline == deadline
+
+        head["total_inventory_count"] += 1  # inventory changed
+        await bot.restart(warm=True)
+        await asyncio.sleep(0.01)
+        assert update.call_count == 1
+
+        await offer.cancel()
+
+
 class TestBotDeletion:
     @pytest.mark.asyncio
     async def test_del(self, bot):
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from steam import TradeOfferState
+
+from steam_tradeoffer_manager import ManagerBot, TradeOfferManager
+from steam_tradeoffer_manager.base import Counter, Histogram
+from steam_tradeoffer_manager.base.metrics import render
+
+from data import *
+
+
+def test_render():
+    counter = Counter("requests", "Requests", ("path",))
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    assert render([counter.collect(), histogram.collect()]).splitlines() == [
+        "# HELP requests Requests",
+        "# TYPE requests counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 0.55",
+        "latency_seconds_count 2",
+    ]
+
+
+class MetricsManager(TradeOfferManager):
+    collect_metrics = True
+
+
+@pytest.mark.asyncio
+async def test_manager_metrics(event_loop):
+    manager = MetricsManager()
+    manager.loop = event_loop
+    manager.randomizer = None
+    manager.offer_cancel_delay = None
+    manager.prefetch_games = (ITEMS_GAME,)
+    bot = ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} metrics", "id": BOT_ID + 700})
+    manager.add(bot)
+    await manager.startup()
+    await asyncio.sleep(0.01)
+
+    assert TradeOfferManager().metrics is None
+    metrics = manager.metrics
+    try:
+        offer = await manager.send_offer(bot.create_offer(await bot.fetch_user(USER_ID), USER_TOKEN))
+        assert metrics.offers_sent.get(bot.id) == 1 and metrics.send_seconds.count == 1
+
+        offer._steam_offer.state = TradeOfferState.Accepted
+        bot._close_trade_offer(offer._steam_offer)
+        assert metrics.offers_closed.get(bot.id, "Accepted") == 1
+
+        text = metrics.render()
+        assert 'steam_bots{state="Active"} 1' in text
+        assert f'steam_bot_active_offers{{bot="{bot.id}"}} 0' in text
+        assert f'steam_bot_inventory_items{{bot="{bot.id}",app_id="{ITEMS_GAME.id}"}}' in text
+        assert "steam_login_seconds_count 1" in text and "steam_inventory_fetch_seconds_count 1" in text
+    finally:
+        await manager.shutdown()
+        manager.remove(bot)
+        bot._release_constraints()
+
+
+@pytest.mark.asyncio
+async def test_group_loop_tasks(event_loop):
+    manager = MetricsManager()
+    manager.loop = event_loop
+    thread = manager.loop_thread(0)
+    try:
+        manager.metrics.render()  # group loop counts its tasks in own thread
+        await asyncio.sleep(0.01)
+
+        text = manager.metrics.render()
+        assert 'steam_loop_pending_tasks{loop="0"} 0' in text and 'steam_loop_pending_tasks{loop="pool"}' in text
+    finally:
+        thread.stop(1)
@@ -0,0 +1,97 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from pytest_mock import MockerFixture
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot
+from steam_tradeoffer_manager.base import ProxyPool
+
+from data import *
+
+PROXIES = ("http://proxy1:80", "http://proxy2:80")
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TradeOfferManager()
+    manager_instance.loop = event_loop
+    manager_instance.proxies = ProxyPool(PROXIES)
+
+    yield manager_instance
+
+    await manager_instance.shutdown()
+
+
+@pytest.fixture
+def bots():
+    bots_list = [
+        ManagerBot(BOT_USERNAME + "proxy", BOT_PASSWORD, SHARED_SECRET, IDENTITY_SECRET, id=BOT_ID),
+        ManagerBot(
+            BOT_USERNAME + "own", BOT_PASSWORD, SHARED_SECRET, IDENTITY_SECRET, id=BOT_ID + 1, proxy="http://own"
+        ),
+    ]
+
+    yield bots_list
+
+    for bot in bots_list:
+        if bot.pool is not None:
+            bot.pool.remove(bot)
+        bot._release_constraints()
+
+
+def test_assign_balances_bots():
+    pool = ProxyPool(PROXIES)
+    assert {pool.assign(1), pool.assign(2)} == set(PROXIES)
+    assert pool.assign(1) == pool.get(1)  # keeps healthy proxy
+
+
+def test_reassign_unhealthy():
+    pool = ProxyPool(PROXIES, alpha=1)
+    proxy = pool.assign(1)
+    pool.health[proxy]._record(0.1, True, pool.alpha)
+
+    assert not pool.is_healthy(proxy)
+    assert pool.assign(1) != proxy and pool.health[proxy].bots == 0
+
+
+def test_unhealthy_recovers(mocker: MockerFixture):
+    pool = ProxyPool(PROXIES, alpha=1, half_life=60)
+    pool.health[PROXIES[0]]._record(0.1, True, pool.alpha, pool.half_life)
+    assert not pool.is_healthy(PROXIES[0])
+
+    monotonic = mocker.patch("steam_tradeoffer_manager.base.proxies.monotonic")
+    monotonic.return_value = pool.health[PROXIES[0]].updated + 120  # two half-lives without traffic
+    assert pool.is_healthy(PROXIES[0]) and pool.health[PROXIES[0]].error_rate == pytest.approx(0.25)
+
+
+@pytest.mark.asyncio
+async def test_trace_config():
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    pool = ProxyPool(PROXIES, alpha=1)
+    async with TestServer(app) as server:
+        async with aiohttp.ClientSession(trace_configs=[pool.trace_config(PROXIES[0])]) as session:
+            async with session.get(server.make_url("/")):
+                pass
+
+    health = pool.health[PROXIES[0]]
+    assert health.requests == health.errors == 1 and not pool.is_healthy(PROXIES[0])
+
+
+@pytest.mark.asyncio
+async def test_bot_proxy_assignment(manager, bots):
+    bot, own = bots
+    manager.add(bot)
+    manager.add(own)
+
+    bot._assign_proxy()
+    own._assign_proxy()
+    assert bot.http.proxy in PROXIES and own.http.proxy == "http://own"
+
+    manager.remove(bot)
+    manager.remove(own)
+    assert manager.proxies.get(bot.id) is None
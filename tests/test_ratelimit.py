@@ -0,0 +1,77 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot
+from steam_tradeoffer_manager.base import TokenBucket, RateLimitRegistry
+
+from data import *
+
+
+@pytest.fixture
+async def server():
+    statuses = iter((503, 200, 200))
+
+    async def handler(_: web.Request) -> web.Response:
+        return web.Response(status=next(statuses))
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    async with TestServer(app) as server_instance:
+        yield server_instance
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TradeOfferManager()
+    manager_instance.loop = event_loop
+    manager_instance.proxy_rate = 10
+
+    yield manager_instance
+
+    await manager_instance.shutdown()
+
+
+@pytest.fixture
+def bot():
+    bot_instance = ManagerBot(
+        BOT_USERNAME + "rate", BOT_PASSWORD, SHARED_SECRET, IDENTITY_SECRET, id=BOT_ID, proxy="http://p:1"
+    )
+
+    yield bot_instance
+
+    if bot_instance.pool is not None:
+        bot_instance.pool.remove(bot_instance)
+    bot_instance._release_constraints()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket():
+    bucket = TokenBucket(100, 1)
+    assert bucket.try_acquire() and not bucket.try_acquire()
+
+    await bucket.acquire()
+    assert bucket.delay() > 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_rate_limit(server: TestServer):
+    registry = RateLimitRegistry(100)
+    async with aiohttp.ClientSession(trace_configs=[registry.trace_config("direct")]) as session:
+        for _ in range(3):
+            async with session.get(server.make_url("/")):
+                pass
+
+    bucket = registry.get("direct")
+    stats = registry.stats["direct"]
+    assert stats.requests == 3 and stats.throttled == 1
+    assert bucket.min_rate < bucket.rate < bucket.max_rate
+
+
+@pytest.mark.asyncio
+async def test_bot_trace_configs(manager, bot):
+    assert not bot.http_trace_configs()
+
+    manager.add(bot)
+    assert len(bot.http_trace_configs()) == 1 and "http://p:1" in manager.rate_limits
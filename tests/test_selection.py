@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from steam_tradeoffer_manager import BotSelector, LeastActiveOffers, WeightedRoundRobin
+
+
+@dataclass(eq=False)
+class BotStub:
+    id: int
+    manager_trades: list = field(default_factory=list)
+    ready: bool = True
+
+    def is_ready(self) -> bool:
+        return self.ready
+
+
+def test_least_active_offers():
+    bots = [BotStub(i, [None] * (3 - i)) for i in range(3)]
+    selector = LeastActiveOffers()
+    for bot in bots:
+        selector.update(bot)
+
+    assert selector.select() is bots[2]
+
+    bots[2].ready = False
+    assert selector.select() is bots[1]
+
+    bots[0].manager_trades.clear()
+    selector.update(bots[0])
+    assert selector.select() is bots[0]
+
+
+def test_weighted_round_robin():
+    bots = [BotStub(i) for i in range(2)]
+    selector = WeightedRoundRobin({0: 3.0})
+    for bot in bots:
+        selector.update(bot)
+
+    picks = [selector.select().id for _ in range(8)]
+    assert picks.count(0) == 6 and picks.count(1) == 2
+
+
+def test_selector_remove():
+    bot = BotStub(1)
+    selector = LeastActiveOffers()
+    selector.update(bot)
+    selector.remove(bot)
+
+    assert selector.select() is None and not selector
+
+
+def test_parked_bots():
+    bots = [BotStub(i, [None] * i) for i in range(2)]
+    selector = LeastActiveOffers()
+    for bot in bots:
+        selector.update(bot)
+
+    bots[0].ready = False
+    assert selector.select() is bots[1] and list(selector._parked) == [bots[0]] and len(selector) == 2
+
+    bots[0].ready = True
+    selector.update(bots[0])
+    assert not selector._parked and selector.select() is bots[0]
+
+    bots[0].ready = False
+    selector.select()
+    assert selector.select(lambda b: b.id == 0) is bots[0]  # custom predicates see parked bots
+
+
+def test_selector_is_abstract():
+    with pytest.raises(TypeError):
+        BotSelector()
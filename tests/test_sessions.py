@@ -0,0 +1,73 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import steam
+from pytest_mock import MockerFixture
+from steam.models import URL
+
+from steam_tradeoffer_manager import ManagerBot
+from steam_tradeoffer_manager.base import SessionStorage, SessionData
+
+from data import *
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SessionStorage(tmp_path, SessionStorage.generate_key())
+
+
+@pytest.fixture
+async def bot(event_loop):
+    bot_instance = ManagerBot(**bot_data())
+    bot_instance.loop = event_loop
+
+    yield bot_instance
+
+    if not bot_instance.is_closed():
+        await bot_instance.close()
+    bot_instance._release_constraints()
+
+
+def session_data() -> SessionData:
+    return SessionData(BOT_ID, {"steamcommunity.com": {"sessionid": "123"}}, "API_KEY", "TOKEN")
+
+
+def test_storage(storage, tmp_path):
+    data = session_data()
+    storage.save(BOT_USERNAME, data)
+    assert BOT_USERNAME in storage and storage.load(BOT_USERNAME) == data
+    assert BOT_USERNAME.encode() not in next(tmp_path.iterdir()).read_bytes()
+
+    other = SessionStorage(tmp_path, SessionStorage.generate_key())  # wrong key
+    assert other.load(BOT_USERNAME) is None and BOT_USERNAME not in storage
+
+
+@pytest.mark.asyncio
+async def test_resume_session(storage, bot, mocker: MockerFixture):
+    storage.save(BOT_USERNAME, session_data())
+    bot.session_storage = storage
+    get = mocker.patch.object(bot.http, "get", AsyncMock(return_value={"logged_in": True, "token": "token"}))
+    user_data = client_user_dict()
+    mocker.patch.object(bot.http, "get_user", AsyncMock(return_value=user_data))
+    mocker.patch.object(bot._connection, "__ainit__", AsyncMock())
+
+    await bot.login(BOT_USERNAME, BOT_PASSWORD, shared_secret=SHARED_SECRET)
+
+    assert bot.http.logged_in and bot.user.id64 == int(user_data["steamid"])
+    assert bot.http.api_key == "API_KEY" and bot._trade_url_token == "TOKEN"
+    assert bot.http._session.cookie_jar.filter_cookies(URL.COMMUNITY)["sessionid"].value == "123"
+    get.assert_awaited_once()
+
+    # session isn't removed when steam is unavailable
+    get.side_effect = steam.HTTPException(mocker.Mock(status=502), None)
+    await bot.http._session.close()  # as on bot restart, login replaces it
+    bot.http.logged_in = False
+    assert not await bot._resume_session() and BOT_USERNAME in storage
+    get.side_effect = None
+
+    # expired session falls back to full login, which saves new session
+    get.return_value = {"logged_in": False}
+    bot.http.logged_in = False
+    await bot.login(BOT_USERNAME, BOT_PASSWORD, shared_secret=SHARED_SECRET)
+    assert bot.user.name == BOT_USER_NAME  # user from mocked login
+    assert storage.load(BOT_USERNAME).steam_id == bot.user.id64 != BOT_ID
@@ -0,0 +1,111 @@
+import asyncio
+import socket
+
+import pytest
+import steam
+
+from steam_tradeoffer_manager import ShardedManager, ManagerBot, TradeOfferManager, ManagerBotState, AccountError
+from steam_tradeoffer_manager.sharding import _serve_shard
+
+from data import *
+
+
+def account(index: int) -> dict:
+    return {**bot_data(), "username": f"{BOT_USERNAME} sharded {index}", "id": BOT_ID + 300 + index}
+
+
+class TwoShards(ShardedManager):
+    shards = 2
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TwoShards()
+    manager_instance.loop = event_loop
+    workers = []
+    for index in range(manager_instance.shards):  # shards served in this process to use mocked steam
+        sock, shard_sock = socket.socketpair()
+        args = (index, shard_sock, TradeOfferManager, ManagerBot, manager_instance.forward_events)
+        workers.append(event_loop.create_task(_serve_shard(*args)))
+        await manager_instance._connect(index, sock)
+
+    yield manager_instance
+
+    await manager_instance.shutdown()
+    await asyncio.wait(workers)
+
+
+@pytest.mark.asyncio
+async def test_routing(manager):
+    events = []
+
+    async def on_ready(bot_id):
+        events.append(bot_id)
+
+    manager.on_ready = on_ready
+
+    ids = [await manager.add(account(i)) for i in range(2)]
+    assert {manager.shard_of(id) for id in ids} == {0, 1}
+    assert manager.state_counts()[ManagerBotState.Stopped] == 2
+
+    await manager.startup()
+    await asyncio.sleep(0.05)  # forwarded events
+
+    assert sorted(events) == ids and manager.state_counts()[ManagerBotState.Active] == 2
+    assert await manager.call(ids[1], "is_ready") is True
+    assert sorted(await manager.call_all("__len__")) == [1, 1]
+
+    with pytest.raises(KeyError):
+        await manager.call(ids[0] + 2, "is_ready")  # same shard, unknown bot
+
+    await manager.remove(ids[0])
+    assert ids[0] not in manager and len(manager) == 1
+
+
+@pytest.mark.asyncio
+async def test_add_errors(manager):
+    with pytest.raises(AccountError):
+        await manager.add({"username": "user"})
+
+    await manager.add(account(2))
+    with pytest.raises(ValueError):
+        await manager.add(account(2))
+
+
+@pytest.mark.asyncio
+async def test_send_offer_requires_bot(manager):
+    with pytest.raises(ValueError):
+        await manager.send_offer(USER_TRADE_URL, send_items=[1])
+
+
+@pytest.mark.asyncio
+async def test_send_offer_round_trip(manager):
+    bot_id = await manager.add(account(3))
+    await manager.startup()
+    await asyncio.sleep(0.05)  # forwarded events
+
+    info = await manager.send_offer(USER_TRADE_URL, "message", bot_id=bot_id)  # result is unpickled from shard
+    assert info.bot_id == bot_id and info.id is not None and info.state == "Active"
+
+
+def _fail_restore():
+    raise TypeError("can't restore")
+
+
+class Unrestorable:
+    def __reduce__(self):
+        return _fail_restore, ()
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_errors(manager, mocker):
+    bot_id = await manager.add(account(4))
+    error = steam.HTTPException(mocker.Mock(status=429, reason="Too Many Requests"), None)
+    mocker.patch.object(ManagerBot, "is_ready", side_effect=error)
+    with pytest.raises(RuntimeError, match="HTTPException \\(status 429\\)"):
+        await asyncio.wait_for(manager.call(bot_id, "is_ready"), 1)
+
+    mocker.patch.object(ManagerBot, "is_ready", return_value=Unrestorable())
+    mocker.patch("steam_tradeoffer_manager.sharding._to_wire", lambda value: value)
+    with pytest.raises(RuntimeError, match="Can't unpickle result"):  # future fails instead of timing out
+        await asyncio.wait_for(manager.call(bot_id, "is_ready"), 1)
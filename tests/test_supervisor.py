@@ -0,0 +1,70 @@
+import asyncio
+from itertools import count
+
+import pytest
+import steam
+from pytest_mock import MockerFixture
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot, ManagerBotState
+from steam_tradeoffer_manager.base import BotSupervisor
+
+from data import *
+
+_usernames = (f"{BOT_USERNAME} supervised {i}" for i in count())
+
+
+@pytest.fixture
+async def manager(event_loop):
+    manager_instance = TradeOfferManager()
+    manager_instance.loop = event_loop
+    manager_instance.supervise = True
+    manager_instance.supervisor_options = {"base_delay": 0.01, "flap_threshold": 3}
+    manager_instance.add(ManagerBot(**{**bot_data(), "username": next(_usernames)}))
+
+    yield manager_instance
+
+    await manager_instance.shutdown()  # cancels scheduled and running restarts
+    for bot in list(manager_instance):
+        manager_instance.remove(bot)
+        bot._release_constraints()
+
+
+def test_delay_backoff():
+    supervisor = BotSupervisor(None, base_delay=1, max_delay=10)
+    assert 0.5 <= supervisor.delay(0) <= 1
+    assert 4 <= supervisor.delay(3) <= 8
+    assert 5 <= supervisor.delay(10) <= 10
+
+
+@pytest.mark.asyncio
+async def test_quarantine_flapping(manager, mocker: MockerFixture):
+    mocker.patch.object(steam.Client, "login", side_effect=steam.LoginError("L"))
+    bot: ManagerBot = manager[BOT_ID]
+    states, transitions = [], []
+
+    async def on_bot_state_change(_, old, new):
+        states.append(new)
+        transitions.append((old, new))
+
+    manager.on_bot_state_change = on_bot_state_change
+
+    await bot.start(timeout=0.2)
+    await asyncio.sleep(0.1)  # retries
+
+    assert bot.state is ManagerBotState.Quarantined and manager.supervisor.is_scheduled(bot)
+    assert states.count(ManagerBotState.UnknownError) == 3 and len(bot.errors) == 3
+    # quarantine is dispatched after failure that caused it
+    assert all(new is next_old for (_, new), (next_old, _) in zip(transitions, transitions[1:]))
+    assert manager.state_counts()[ManagerBotState.Quarantined] == 1
+
+
+@pytest.mark.asyncio
+async def test_no_retry_invalid_credentials(manager, mocker: MockerFixture):
+    mocker.patch.object(steam.Client, "login", side_effect=steam.InvalidCredentials("I"))
+    bot: ManagerBot = manager[BOT_ID]
+
+    await bot.start(timeout=0.05)
+    await asyncio.sleep(0.05)
+
+    assert bot.state is ManagerBotState.InvalidCredentials and not manager.supervisor.is_scheduled(bot)
+    assert len(bot.errors) == 1
@@ -0,0 +1,82 @@
+from time import sleep
+
+import pytest
+from pytest_mock import MockerFixture
+
+from steam_tradeoffer_manager import ManagerBot, TradeOfferManager, SyncManager, OfferRequest
+
+from data import *
+
+
+@pytest.fixture(scope="module")
+def facade():
+    manager = TradeOfferManager()
+    manager.randomizer = None
+    manager.offer_cancel_delay = None
+    manager.add(ManagerBot(**{**bot_data(), "username": f"{BOT_USERNAME} sync", "id": BOT_ID + 500}))
+    facade_instance = SyncManager(manager, timeout=5)
+    facade_instance.start()
+
+    yield facade_instance
+
+    facade_instance.stop(5)
+    for bot in list(manager):
+        manager.remove(bot)
+        bot._release_constraints()
+
+
+def test_start(facade):
+    assert facade.call(lambda: all(bot.is_ready() for bot in facade.manager))
+    assert facade.manager.loop is facade.loop and facade.to_loop.count == facade.from_loop.count >= 3
+
+
+def test_send_offer(facade):
+    offer = facade.send_offer(facade.create_offer_from_url(USER_TRADE_URL, TRADE_MSG))
+    assert offer.id and offer in facade.manager.trades
+
+
+def test_submit_offers(facade):
+    crossings = facade.to_loop.count
+    futures = facade.submit_offers([OfferRequest(USER_TRADE_URL) for _ in range(3)] + [OfferRequest("invalid")])
+
+    results = [future.result(5) for future in futures[:3]]
+    assert all(result.ok and result.offer.id for result in results)
+    with pytest.raises(KeyError):  # no partner in trade url
+        futures[3].result(5)
+    assert facade.to_loop.count == crossings + 1  # whole batch in one crossing
+
+
+def test_call_from_loop(facade):
+    with pytest.raises(RuntimeError):
+        facade.call(facade.call, len, ())
+
+
+def test_stop(facade):
+    facade.stop(5)
+    assert not facade._thread.is_running()
+
+
+@pytest.fixture
+def idle_facade():
+    facade_instance = SyncManager(TradeOfferManager(), timeout=1)
+    facade_instance.start(startup=False)
+    yield facade_instance
+    facade_instance.stop(1)
+
+
+def test_stop_fails_submitted(idle_facade):
+    idle_facade.submit(sleep, 0.1)  # keeps loop busy
+    idle_facade.loop.call_soon_threadsafe(idle_facade.loop.stop)  # loop stops before offers are queued
+    futures = idle_facade.submit_offers([OfferRequest(USER_TRADE_URL)])
+    idle_facade._thread._thread.join(1)
+
+    idle_facade.stop(1)
+    with pytest.raises(RuntimeError):
+        futures[0].result(0)
+
+
+def test_stop_on_shutdown_error(idle_facade, mocker: MockerFixture):
+    mocker.patch.object(idle_facade.manager, "shutdown", side_effect=ValueError)
+    with pytest.raises(ValueError):
+        idle_facade.stop(1)
+    assert not idle_facade._thread.is_running()
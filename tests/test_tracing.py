@@ -0,0 +1,69 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yarl import URL
+
+from steam_tradeoffer_manager import TradeOfferManager, ManagerBot
+from steam_tradeoffer_manager.base import RequestTracer, EndpointStats
+from steam_tradeoffer_manager.base.tracing import endpoint_of
+
+from data import *
+
+
+def test_endpoint_of():
+    url = URL("https://steamcommunity.com/inventory/76561198000000000/730/2?count=1")
+    assert endpoint_of(url) == "steamcommunity.com/inventory/{id}/{id}/{id}"
+    assert (
+        endpoint_of(URL("https://steamcommunity.com/tradeoffer/new/send")) == "steamcommunity.com/tradeoffer/new/send"
+    )
+
+
+@pytest.mark.asyncio
+async def test_trace_config():
+    statuses = iter((200, 429))
+
+    async def handler(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(status=next(statuses), body=b"x" * 10)
+
+    app = web.Application()
+    app.router.add_post("/offer/{id}", handler)
+    tracer = RequestTracer()
+    async with TestServer(app) as server:
+        async with aiohttp.ClientSession(trace_configs=[tracer.trace_config(BOT_ID, "direct")]) as session:
+            for id in (1, 2):
+                async with session.post(server.make_url(f"/offer/{id}"), data=b"body") as resp:
+                    await resp.read()
+
+    ((key, stats),) = tracer.stats.items()
+    assert key == (BOT_ID, "direct", "POST", f"{server.host}/offer/{{id}}")
+    assert stats.requests == 2 and stats.rate_limited == 1 and stats.statuses == {200: 1, 429: 1}
+    assert stats.bytes_sent == 8 and stats.bytes_received == 20 and stats.latency.count == 2
+    assert tracer.by_endpoint()[("POST", f"{server.host}/offer/{{id}}")].requests == 2
+
+    families = {family.name: family for family in tracer.collect()}
+    assert families["steam_http_rate_limited"].samples[0][2] == 1
+
+
+def test_sample_rate():
+    with pytest.raises(ValueError):
+        RequestTracer(0)
+
+    tracer = RequestTracer(0.25)
+    tracer.stats[(BOT_ID, "direct", "GET", "steamcommunity.com/")] = EndpointStats(requests=2, statuses={200: 2})
+    families = {family.name: family for family in tracer.collect()}
+    assert families["steam_http_responses"].samples[0][2] == 8  # estimated from sampled requests
+    assert families["steam_http_trace_sample_rate"].samples[0][2] == 0.25
+
+
+def test_bot_trace_configs():
+    manager = TradeOfferManager()
+    manager.trace_requests = True
+    manager.share_connectors = False
+    bot = ManagerBot(BOT_USERNAME + "trace", BOT_PASSWORD, SHARED_SECRET, IDENTITY_SECRET, id=BOT_ID)
+    manager.add(bot)
+
+    assert len(bot.http_trace_configs()) == 1 and manager.tracer.sample_rate == 1
+    manager.remove(bot)
+    bot._release_constraints()